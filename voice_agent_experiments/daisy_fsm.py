@@ -1,7 +1,10 @@
 from livekit.agents import llm
-from config import FIELDS, FIELD_ORDER, NUM_FIELDS, WAKE_WORDS
-from utils import clean_user_text, is_repeat_request, is_off_topic
-from daisy_prompts import WELCOME_MESSAGE, ASK_MESSAGE, CONFIRM_MESSAGE, REPEAT_MESSAGE, OFF_TOPIC_MESSAGE, PERMISSION_MESSAGE
+from config import FIELDS, FIELD_ORDER, NUM_FIELDS
+from utils import (
+    AFFIRM, CORRECTION, DENY, SPECS_BY_KEY, classify_confirmation, clean_user_text, extract_correction,
+    intent_matcher, is_wake_phrase
+)
+from daisy_prompts import WELCOME_MESSAGE, ASK_MESSAGE, CONFIRM_MESSAGE, CORRECTION_CONFIRM_MESSAGE, REPEAT_MESSAGE, OFF_TOPIC_MESSAGE, PERMISSION_MESSAGE
 from daisy_assistant_fnc import DaisyAssistantFnc
 import time
 import logging
@@ -59,11 +62,13 @@ class ConversationStateMachine:
             return
         user_text = msg.content
         user_text_lower = user_text.lower()
+        # Repetición y fuera de tema salen de una sola pasada del matcher
+        intents = intent_matcher.intents(user_text)
         # Maneja solicitudes de repetición
-        if is_repeat_request(user_text_lower):
+        if "repeat_requests" in intents:
             await self.handle_repeat()
         # Maneja respuestas fuera de tema
-        elif is_off_topic(user_text_lower):
+        elif "off_topic_triggers" in intents:
             await self.handle_off_topic()
         # Maneja los diferentes estados de la conversación
         elif self.state["state"] == "waiting_wake":
@@ -73,7 +78,7 @@ class ConversationStateMachine:
         elif self.state["state"] == "asking":
             await self.handle_asking(msg.content)
         elif self.state["state"] == "confirm":
-            await self.handle_confirm(user_text_lower)
+            await self.handle_confirm(user_text)
         end_time = time.time()
         latency_ms = (end_time - start_time) * 1000
         logger.debug(f"Latencia del LLM ({self.state['state']}): {latency_ms:.2f} ms")
@@ -102,7 +107,7 @@ class ConversationStateMachine:
 
     async def handle_waiting_wake(self, user_text_lower: str):
         logger.debug(f"FSM: Estado actual -> {self.state['state']}")
-        if any(user_text_lower.startswith(w) for w in WAKE_WORDS):
+        if is_wake_phrase(user_text_lower):
             logger.debug(f"FSM: Transición a waiting_permission")
             self.state["state"] = "waiting_permission"
             permission_request = "¡Hola, qué tal! Soy Daisy, necesito unos datos para tu registro. ¿Puedo hacerte unas preguntas?"
@@ -158,18 +163,7 @@ class ConversationStateMachine:
             logger.debug(f"FSM: Procesando dato para {current_field}: {cleaned}")
             # Invoca la función correspondiente de DaisyAssistantFnc
             try:
-                if current_field == "nombre_operador":
-                    await self.assistant_fnc.set_driver_name(cleaned)
-                elif current_field == "numero_tractor":
-                    await self.assistant_fnc.set_tractor_number(cleaned)
-                elif current_field == "placas_tractor":
-                    await self.assistant_fnc.set_tractor_plates(cleaned)
-                elif current_field == "numero_trailer":
-                    await self.assistant_fnc.set_trailer_number(cleaned)
-                elif current_field == "placas_trailer":
-                    await self.assistant_fnc.set_trailer_plates(cleaned)
-                elif current_field == "eta":
-                    await self.assistant_fnc.set_eta(cleaned)
+                await self.store_field(current_field, cleaned)
             except Exception as e:
                 logger.error(f"Error al invocar función de DaisyAssistantFnc para {current_field}: {str(e)}")
                 # Repite la pregunta si falla
@@ -188,7 +182,7 @@ class ConversationStateMachine:
             # Confirmación con formato más claro para placas
             confirm_message = CONFIRM_MESSAGE.format(
                 field_name=FIELDS[self.state["idx"]][1],
-                value=" ".join(cleaned) if current_field in ("placas_tractor", "placas_trailer") else cleaned
+                value=SPECS_BY_KEY[current_field].format(cleaned)
             )
             self.session.conversation.item.create(
                 llm.ChatMessage(
@@ -214,11 +208,51 @@ class ConversationStateMachine:
             )
             self.session.response.create()
 
-    async def handle_confirm(self, user_text_lower: str):
+    async def store_field(self, current_field: str, value: str):
+        # Invoca la función correspondiente de DaisyAssistantFnc (FieldSpec.setter)
+        setter = SPECS_BY_KEY[current_field].setter
+        if setter is not None:
+            await getattr(self.assistant_fnc, setter)(value)
+
+    async def handle_correction(self, current_field: str, user_text: str, remainder: str) -> bool:
+        """
+        "No, es 1556", "no, la última letra es D": corrige el dato que se estaba
+        confirmando y pide confirmar solo el cambio. False si no se pudo leer.
+        """
+        current_value = self.state["fields"][current_field] or ""
+        correction = extract_correction(SPECS_BY_KEY[current_field].kind, current_value, user_text, remainder)
+        if correction is None:
+            return False
+        try:
+            await self.store_field(current_field, correction.value)
+        except Exception as e:
+            logger.error(f"Error al guardar la corrección de {current_field}: {str(e)}")
+            return False
+        logger.debug(f"FSM: Corrección en línea para {current_field}: {current_value} -> {correction.value}")
+        self.state["fields"][current_field] = correction.value
+        if correction.position is not None:
+            change = f"{correction.new} en lugar de {correction.old}"
+        else:
+            change = SPECS_BY_KEY[current_field].format(correction.value)
+        self.session.conversation.item.create(
+            llm.ChatMessage(
+                role="assistant",
+                content=CORRECTION_CONFIRM_MESSAGE.format(field_name=FIELDS[self.state["idx"]][1], change=change)
+            )
+        )
+        self.session.response.create()
+        return True
+
+    async def handle_confirm(self, user_text: str):
         logger.debug(f"FSM: Estado actual -> {self.state['state']}")
         current_field = FIELD_ORDER[self.state["idx"]]
         self.state["confirmation_attempts"] += 1
-        if user_text_lower in {"sí", "si", "correcto", "sí está bien", "está bien"}:
+        reply = classify_confirmation(user_text)
+        if (reply.label == CORRECTION and self.state["confirmation_attempts"] < 3
+                and await self.handle_correction(current_field, user_text, reply.remainder)):
+            # Sigue en confirm, ahora con el dato corregido
+            return
+        if reply.label == AFFIRM:
             self.state["idx"] += 1
             self.state["confirmation_attempts"] = 0
             if self.state["idx"] >= NUM_FIELDS:
@@ -249,7 +283,7 @@ class ConversationStateMachine:
                 )
             )
             self.session.response.create()
-        elif user_text_lower in {"no", "incorrecto", "no está bien"} or self.state["confirmation_attempts"] >= 3:
+        elif reply.label in (DENY, CORRECTION) or self.state["confirmation_attempts"] >= 3:
             logger.debug(f"FSM: Dato rechazado o demasiados intentos, repitiendo pregunta para {current_field}")
             self.state["fields"][current_field] = None
             self.state["state"] = "asking"
@@ -268,7 +302,7 @@ class ConversationStateMachine:
             logger.debug(f"FSM: Respuesta ambigua, pidiendo confirmación de nuevo para {current_field}")
             confirm_message = CONFIRM_MESSAGE.format(
                 field_name=FIELDS[self.state["idx"]][1],
-                value=" ".join(self.state["fields"][current_field]) if current_field in ("placas_tractor", "placas_trailer") else self.state["fields"][current_field]
+                value=SPECS_BY_KEY[current_field].format(self.state["fields"][current_field])
             )
             self.session.conversation.item.create(
                 llm.ChatMessage(
@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Lo que voice_agent_experiments usa de voice_agent_v2/agents: el motor de normalizacion,
+# el parser de numeros, el automata de frases, el clasificador de confirmaciones, las
+# correcciones y el registro de campos. Es el unico modulo que toca sys.path: agrega
+# voice_agent_v2 al final (los modulos de aqui, como config o main, siguen ganando) o
+# el directorio de VOICE_AGENT_V2_DIR.
+
+V2_DIR = os.getenv(
+    "VOICE_AGENT_V2_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "voice_agent_v2"),
+)
+if not os.path.isdir(os.path.join(V2_DIR, "agents")):
+    raise ImportError(f"voice_agent_experiments necesita voice_agent_v2 (no se encontro {V2_DIR}/agents)")
+if V2_DIR not in sys.path:
+    sys.path.append(V2_DIR)
+
+from agents.normalization import normalizer
+from agents.spoken_numbers import words_to_digits
+from agents.intents import IntentMatcher
+from agents.confirmation_classifier import AFFIRM, CORRECTION, DENY, classify_confirmation
+from agents.corrections import extract_correction
+from agents.fields import SPECS_BY_KEY
+
+__all__ = [
+    "AFFIRM", "CORRECTION", "DENY", "IntentMatcher", "SPECS_BY_KEY", "classify_confirmation",
+    "extract_correction", "normalizer", "words_to_digits",
+]
@@ -1,40 +1,262 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+import aiohttp
 import requests
+from . import metrics
+
+logger = logging.getLogger("asi1")
+
+ASI1_URL = os.getenv("ASI1_API_URL", "https://api.asi1.ai/v1/chat/completions")
+
+# Pool de conexiones keep-alive compartido por todo el proceso del worker.
+# aiohttp ata la sesion a un event loop, asi que se recrea si el loop cambia.
+_http_session: aiohttp.ClientSession | None = None
+_http_loop: asyncio.AbstractEventLoop | None = None
+POOL_LIMIT = int(os.getenv("ASI1_POOL_LIMIT", "32"))
+KEEPALIVE_TIMEOUT = 60
+
+# Presupuesto por turno: si ASI1 no contesta (o no da el primer token) en este
+# tiempo el agente dice el texto de respaldo. La peticion duplicada (hedge) se
+# lanza cuando la primera tarda mas que el percentil HEDGE_PERCENTILE observado.
+TURN_BUDGET = float(os.getenv("ASI1_TURN_BUDGET", "2.5"))
+HEDGE_PERCENTILE = float(os.getenv("ASI1_HEDGE_PERCENTILE", "95"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("ASI1_HEDGE_DELAY", "1.2"))
+HEDGE_MIN_DELAY = 0.15
+# Ya con el primer token: si ASI1 se queda este tiempo sin mandar el siguiente fragmento
+# el stream se corta ahi y el turno sigue con lo que ya se dijo
+STREAM_CHUNK_TIMEOUT = float(os.getenv("ASI1_STREAM_CHUNK_TIMEOUT", "2.0"))
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Devuelve la sesion HTTP compartida del proceso, creandola si hace falta."""
+    global _http_session, _http_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_loop is not loop:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=POOL_LIMIT,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ),
+        )
+        _http_loop = loop
+    return _http_session
+
+
+async def close_http_session():
+    """Cierra el pool compartido (main.py lo registra como shutdown callback del job)."""
+    global _http_session, _http_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_loop = None
+
+
+def hedge_delay(metric: str) -> float:
+    """Segundos antes de duplicar la peticion, segun el percentil observado de `metric`."""
+    observed = metrics.percentile(metric, HEDGE_PERCENTILE)
+    if observed is None:
+        return HEDGE_DEFAULT_DELAY
+    return max(HEDGE_MIN_DELAY, observed / 1000)
+
+
+async def _hedged(
+        attempt: Callable[[], Awaitable],
+        budget: float,
+        hedge_after: float,
+        discard: Callable[[Any], Awaitable] | None = None
+    ):
+    """
+    Ejecuta `attempt` y, si no termina en `hedge_after` segundos (o falla antes),
+    lanza una segunda copia; devuelve el primer resultado que no sea None dentro
+    de `budget` segundos, o None si se acaba el tiempo.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    first = asyncio.create_task(attempt())
+    pending = {first}
+    hedged = False
+    winner = None
+    try:
+        while pending:
+            elapsed = loop.time() - start
+            if elapsed >= budget:
+                break
+            timeout = budget - elapsed
+            if not hedged:
+                timeout = min(timeout, max(0.0, hedge_after - elapsed))
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = None if task.exception() else task.result()
+                if result is None:
+                    continue
+                if winner is None:
+                    winner = result
+                    if task is not first:
+                        metrics.incr("asi1_hedge_wins")
+                elif discard is not None:
+                    await discard(result)
+            if winner is not None:
+                return winner
+            if not hedged and (loop.time() - start >= hedge_after or not pending):
+                hedged = True
+                metrics.incr("asi1_hedges_fired")
+                pending.add(asyncio.create_task(attempt()))
+        metrics.incr("asi1_deadline_expired")
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
 
 # Inicializa el LLM con restricciones para longitud y coherencia
 class ASI1RequestWrapper:
     def __init__(
-            self, 
-            api_key, 
-            temperature=0.3
+            self,
+            api_key,
+            temperature=0.3,
+            url=ASI1_URL,
+            model="asi1-fast"
         ):
         self.api_key = api_key
         self.temperature = temperature
-        self.url = "https://api.asi1.ai/v1/chat/completions"
+        self.url = url
+        self.model = model
 
-    def generate(self, messages):
+    def _payload(self, messages, stream=False):
         user_prompt = messages
-        payload = {
-            "model": "asi1-fast",
+        return {
+            "model": self.model,
             "messages": [{"role": "user", "content": user_prompt}],
             "temperature": self.temperature,
-            "stream": False,  # Cambiado a False para evitar streaming
+            "stream": stream,  # Solo astream pide streaming
             "max_tokens": 500  # Límite razonable de tokens
         }
-        headers = {
+
+    def _headers(self):
+        return {
             'Content-Type': 'application/json',
             'Accept': 'application/json',
             'Authorization': f'Bearer {self.api_key}'
         }
+
+    def generate(self, messages):
+        """Version bloqueante. No usar dentro del event loop del agente, ver agenerate."""
         try:
             response = requests.post(
-                self.url, 
-                headers=headers, 
-                json=payload
+                self.url,
+                headers=self._headers(),
+                json=self._payload(messages)
             )
             response.raise_for_status()  # Verifica errores HTTP
             data = response.json()
-            print(data["choices"][0]["message"]["content"].strip())
-            return data["choices"][0]["message"]["content"].strip()
+            content = data["choices"][0]["message"]["content"].strip()
+            logger.debug("ASI1 response: %s", content)
+            return content
+        except Exception as e:
+            logger.error("Error en la solicitud a ASI1: %s", e)
+            return None
+
+    async def agenerate(self, messages):
+        """Igual que generate pero sin bloquear el event loop, sobre el pool compartido."""
+        start = time.perf_counter()
+        try:
+            async with get_http_session().post(
+                self.url,
+                headers=self._headers(),
+                json=self._payload(messages)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+            content = data["choices"][0]["message"]["content"].strip()
+            metrics.observe("asi1_completion_ms", (time.perf_counter() - start) * 1000)
+            logger.debug("ASI1 response: %s", content)
+            return content
+        except Exception as e:
+            logger.error("Error en la solicitud a ASI1: %s", e)
+            return None
+
+    async def astream(self, messages) -> AsyncIterator[str]:
+        """
+        Genera la respuesta en streaming (SSE) y va entregando los fragmentos de texto.
+        En caso de error deja de producir texto en lugar de lanzar la excepcion.
+        """
+        start = time.perf_counter()
+        try:
+            async with get_http_session().post(
+                self.url,
+                headers=self._headers(),
+                json=self._payload(messages, stream=True)
+            ) as response:
+                response.raise_for_status()
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = line[len("data:"):].strip()
+                    if chunk == "[DONE]":
+                        metrics.observe("asi1_completion_ms", (time.perf_counter() - start) * 1000)
+                        break
+                    choices = json.loads(chunk).get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
         except Exception as e:
-            print(f"Error en la solicitud a ASI1: {e}")
-            return None
\ No newline at end of file
+            logger.error("Error en el streaming de ASI1: %s", e)
+
+    async def agenerate_within(self, messages, budget=TURN_BUDGET, hedge_after=None):
+        """agenerate con presupuesto de tiempo y peticion duplicada; None si no alcanza."""
+        if hedge_after is None:
+            hedge_after = hedge_delay("asi1_completion_ms")
+        return await _hedged(lambda: self.agenerate(messages), budget, hedge_after)
+
+    async def astream_within(
+            self,
+            messages,
+            budget=TURN_BUDGET,
+            hedge_after=None,
+            chunk_timeout=STREAM_CHUNK_TIMEOUT
+        ) -> AsyncIterator[str] | None:
+        """
+        astream con presupuesto para el primer token y peticion duplicada. Devuelve
+        el stream que respondio primero (el otro se cancela), o None si ninguno
+        produjo texto a tiempo. Despues, cada fragmento tiene `chunk_timeout` segundos.
+        """
+        if hedge_after is None:
+            hedge_after = hedge_delay("asi1_first_token_ms")
+
+        async def open_stream():
+            stream = self.astream(messages)
+            try:
+                return await stream.__anext__(), stream
+            except StopAsyncIteration:
+                return None
+
+        async def close_stream(opened):
+            await opened[1].aclose()
+
+        opened = await _hedged(open_stream, budget, hedge_after, discard=close_stream)
+        if opened is None:
+            return None
+        first_delta, stream = opened
+
+        async def chained():
+            yield first_delta
+            try:
+                while True:
+                    try:
+                        delta = await asyncio.wait_for(stream.__anext__(), chunk_timeout)
+                    except StopAsyncIteration:
+                        return
+                    except asyncio.TimeoutError:
+                        metrics.incr("asi1_stream_stalled")
+                        logger.warning("ASI1 dejo de mandar fragmentos por %.1fs; se corta el stream", chunk_timeout)
+                        return
+                    yield delta
+            finally:
+                await stream.aclose()
+
+        return chained()
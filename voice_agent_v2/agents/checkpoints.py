@@ -0,0 +1,119 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Any
+from models.driver_model import DataField, DriverData
+from . import metrics
+from .registrations import normalize_phone
+
+logger = logging.getLogger("checkpoints")
+
+# Estado de VoiceAgent guardado despues de cada paso confirmado y al terminar el job sin
+# registro guardado: si la llamada se cae o se reprograma (reschedule_call ->
+# services/retry_call.py), el job siguiente con la misma dial_info lo carga y sigue en el
+# mismo campo o el mismo caracter de la placa.
+# Un archivo por llamada: cabecera + JSON comprimido con zlib (unos cientos de bytes).
+
+CHECKPOINT_DIR = os.getenv("SESSION_CHECKPOINT_DIR", "checkpoints")
+# Un checkpoint mas viejo que esto ya no se retoma (el transportista empieza de nuevo)
+CHECKPOINT_TTL_S = float(os.getenv("SESSION_CHECKPOINT_TTL_S", str(24 * 3600)))
+MAGIC = b"DSY1"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, DataField):
+        return {"__field__": value.name}
+    if isinstance(value, DriverData):
+        return {"__data__": dataclasses.asdict(value)}
+    raise TypeError(f"No se puede guardar {type(value).__name__} en el checkpoint")
+
+
+def _decode_value(obj: dict) -> Any:
+    if "__field__" in obj:
+        return DataField[obj["__field__"]]
+    if "__data__" in obj:
+        return DriverData(**obj["__data__"])
+    return obj
+
+
+def encode(state: dict[str, Any]) -> bytes:
+    payload = json.dumps(state, default=_encode_value, separators=(",", ":"), ensure_ascii=False)
+    return MAGIC + zlib.compress(payload.encode("utf-8"), 9)
+
+
+def decode(blob: bytes) -> dict[str, Any] | None:
+    if not blob.startswith(MAGIC):
+        return None
+    try:
+        return json.loads(zlib.decompress(blob[len(MAGIC):]).decode("utf-8"), object_hook=_decode_value)
+    except (zlib.error, ValueError, KeyError, TypeError):
+        return None
+
+
+class CheckpointStore:
+    """
+    Checkpoints por llamada en un directorio local. La llave es el telefono mas un hash de
+    la dial_info completa: cualquier job con la misma dial_info dentro del TTL lo encuentra
+    (el reintento de retry_call, pero tambien otra llamada despachada con los mismos datos).
+    """
+
+    def __init__(self, directory: str = CHECKPOINT_DIR, ttl: float = CHECKPOINT_TTL_S):
+        self.directory = directory
+        self.ttl = ttl
+
+    @staticmethod
+    def key(dial_info: dict[str, Any]) -> str | None:
+        phone = normalize_phone(dial_info.get("phone_number"))
+        if phone is None:
+            return None
+        digest = hashlib.sha1(json.dumps(dial_info, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return f"{phone[1:]}_{digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.ckpt")
+
+    def save(self, key: str, state: dict[str, Any]):
+        start = time.perf_counter()
+        blob = encode(state)
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            # Reemplazo atomico: una caida a media escritura deja el checkpoint anterior
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error("No se pudo guardar el checkpoint %s: %s", key, e)
+            return
+        metrics.observe("checkpoint_write_ms", (time.perf_counter() - start) * 1000)
+        metrics.observe("checkpoint_bytes", len(blob))
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                self.delete(key)
+                return None
+            with open(path, "rb") as f:
+                state = decode(f.read())
+        except OSError:
+            return None
+        if state is None:
+            logger.warning("Checkpoint ilegible, se ignora: %s", key)
+        return state
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("No se pudo borrar el checkpoint %s: %s", key, e)
+
+
+checkpoint_store = CheckpointStore()
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import string
+from typing import AsyncIterator
+from livekit import rtc
+from livekit.agents import tts as agents_tts
+
+logger = logging.getLogger("clip-library")
+
+# Frases fijas de la captura de placas. La llave es la que usa VoiceAgent al
+# ensamblar un prompt; el texto debe coincidir con lo que se manda como transcript.
+CARRIER_PHRASES = {
+    "start_plate": "Let's do it letter by letter. Tell me the first letter of the plate.",
+    "is_the_letter": "Is the letter",
+    "next_letter": "Give me the next letter.",
+    "next_number": "Give me the next number.",
+    "move_to_numbers": "Now let's move to the numbers. Tell me the first number.",
+    "repeat_letter": "I didn't catch that letter. Can you repeat it, please?",
+    "say_again": "Okay, tell me that letter or number again.",
+    "restart_plate": "Hmm, I didn't quite get the full plate. Let's start over from the beginning. Tell me the first letter.",
+    "i_have": "I have",
+    "is_that_right": "Is that right?",
+}
+
+SYMBOLS = string.ascii_uppercase + string.digits
+
+# Amplitud (int16) bajo la cual se considera silencio al recortar cada clip
+SILENCE_THRESHOLD = 300
+FRAME_MS = 20
+# Rondas de sintesis para los clips que fallaron, con espera exponencial entre rondas
+BUILD_ATTEMPTS = 3
+RETRY_BACKOFF_S = 1.0
+
+
+class PlateClipLibrary:
+    """
+    Biblioteca de clips PCM para los prompts de placas: frases fijas mas un clip
+    por letra A-Z y digito 0-9, sintetizados una sola vez por proceso con la voz
+    configurada. Un prompt como "Is the letter B?" se arma empalmando frames, sin
+    ninguna peticion al TTS durante la llamada.
+    """
+
+    def __init__(self, gap_ms: int = 90, concurrency: int = 6):
+        self.gap_ms = gap_ms
+        self.concurrency = concurrency
+        self._clips: dict[str, rtc.AudioFrame] = {}
+        self._lock = asyncio.Lock()
+        self.ready = False
+
+    async def _synthesize(self, tts: agents_tts.TTS, text: str) -> rtc.AudioFrame:
+        frames = []
+        async with tts.synthesize(text) as stream:
+            async for audio in stream:
+                frames.append(audio.frame)
+        return _trim_silence(rtc.combine_audio_frames(frames))
+
+    async def ensure_built(self, tts: agents_tts.TTS):
+        """
+        Sintetiza los clips que faltan; los que ya salieron se conservan. Lo que falla se
+        reintenta hasta BUILD_ATTEMPTS rondas con espera exponencial, y lo que siga
+        faltando lo intenta el siguiente job. Con la biblioteca completa no hace nada.
+        """
+        async with self._lock:
+            if self.ready:
+                return
+            texts = {key: text for key, text in CARRIER_PHRASES.items()}
+            texts.update({symbol: symbol for symbol in SYMBOLS})
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def build(key: str, text: str):
+                async with semaphore:
+                    try:
+                        self._clips[key] = await self._synthesize(tts, text)
+                    except Exception as e:
+                        logger.error("No se pudo sintetizar el clip %r: %s", key, e)
+
+            for attempt in range(BUILD_ATTEMPTS):
+                missing = {k: t for k, t in texts.items() if k not in self._clips}
+                if not missing:
+                    break
+                if attempt:
+                    await asyncio.sleep(RETRY_BACKOFF_S * 2 ** (attempt - 1))
+                await asyncio.gather(*(build(k, t) for k, t in missing.items()))
+            self.ready = len(self._clips) == len(texts)
+            logger.info("Clip library: %d/%d clips listos", len(self._clips), len(texts))
+
+    def has(self, *keys: str) -> bool:
+        return all(key in self._clips for key in keys)
+
+    async def frames(self, *keys: str) -> AsyncIterator[rtc.AudioFrame]:
+        """Empalma los clips indicados con un silencio corto entre cada uno."""
+        for i, key in enumerate(keys):
+            clip = self._clips[key]
+            if i:
+                yield _silence(self.gap_ms, clip.sample_rate, clip.num_channels)
+            for frame in _split(clip):
+                yield frame
+
+
+def _trim_silence(frame: rtc.AudioFrame) -> rtc.AudioFrame:
+    samples = frame.data
+    channels = frame.num_channels
+    first = next((i for i in range(len(samples)) if abs(samples[i]) > SILENCE_THRESHOLD), None)
+    if first is None:
+        return frame
+    last = next(i for i in range(len(samples) - 1, -1, -1) if abs(samples[i]) > SILENCE_THRESHOLD)
+    start = first // channels
+    end = last // channels + 1
+    data = samples[start * channels:end * channels].tobytes()
+    return rtc.AudioFrame(
+        data=data,
+        sample_rate=frame.sample_rate,
+        num_channels=channels,
+        samples_per_channel=end - start,
+    )
+
+
+def _split(frame: rtc.AudioFrame) -> list[rtc.AudioFrame]:
+    per_frame = frame.sample_rate * FRAME_MS // 1000
+    channels = frame.num_channels
+    samples = frame.data
+    chunks = []
+    for start in range(0, frame.samples_per_channel, per_frame):
+        end = min(start + per_frame, frame.samples_per_channel)
+        chunks.append(rtc.AudioFrame(
+            data=samples[start * channels:end * channels].tobytes(),
+            sample_rate=frame.sample_rate,
+            num_channels=channels,
+            samples_per_channel=end - start,
+        ))
+    return chunks
+
+
+def _silence(ms: int, sample_rate: int, num_channels: int) -> rtc.AudioFrame:
+    samples_per_channel = sample_rate * ms // 1000
+    return rtc.AudioFrame(
+        data=bytes(samples_per_channel * num_channels * 2),
+        sample_rate=sample_rate,
+        num_channels=num_channels,
+        samples_per_channel=samples_per_channel,
+    )
+
+
+# Una biblioteca por proceso del worker; main.py la construye al arrancar
+clip_library = PlateClipLibrary()
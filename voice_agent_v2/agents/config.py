@@ -29,6 +29,26 @@ OFF_TOPIC_TRIGGERS = {
     "que es esto", "quien te hizo esto", "para que llamas"
 }
 
+# Frases fuera del guion de registro: ese turno lo contesta el LLM de la sesión con sus
+# herramientas (reschedule_call, log_complaint, end_call) en lugar de VoiceAgent. Solo
+# frases completas: "goodbye", "queja" o "reschedule" sueltas aparecen en respuestas normales
+OFF_SCRIPT_TRIGGERS = {
+    "call me back", "call me later", "call back later", "not a good time", "busy right now",
+    "reschedule the call", "reschedule this call",
+    "llámame después", "llámame más tarde", "márcame más tarde", "no puedo hablar", "ahorita no puedo",
+    "i want to complain", "i have a complaint", "file a complaint", "tengo una queja", "quiero poner una queja",
+    "quiero quejarme",
+    "end the call", "end this call", "you can hang up", "please hang up", "i'm not interested", "no me interesa",
+    "ya no quiero seguir",
+}
+
+# "No tengo correo": antes de leer la respuesta como un correo dictado ("idonthaveemail")
+NO_EMAIL_PHRASES = {
+    "no tengo correo", "no tengo email", "no tengo mail", "no tengo", "no cuento con correo", "no uso correo",
+    "sin correo", "i don't have", "i do not have", "i don't use email", "i have no email", "no email",
+    "haven't got one",
+}
+
 # Palabras clave para activar el inicio de la conversación
 #WAKE_WORDS = {"hola", "bueno", "quién es", "quien es", "daisy"}
 
@@ -52,7 +72,7 @@ LETTER_MAP = {
     "o": ("O", "Oso"), "ó": ("O", "Oso"),
     "pe": ("P", "Perro"), "p": ("P", "Perro"),
     "cu": ("Q", "Queso"), "q": ("Q", "Queso"),
-    "erre": ("R", "Rana"), "r": ("R", "Rana"),
+    "erre": ("R", "Rana"), "ere": ("R", "Rana"), "r": ("R", "Rana"),
     "ese": ("S", "Sol"), "s": ("S", "Sol"),
     "te": ("T", "Tigre"), "t": ("T", "Tigre"),
     "u": ("U", "Uva"), "ú": ("U", "Uva"),
@@ -102,4 +122,13 @@ LETTER_MAP_EN = {
     "mx": ("mx", "Mx"),
     "org": ("org", "Org"),
     "net": ("net", "Net")
-}
\ No newline at end of file
+}
+
+# Dominios que se completan al dictar un correo ("arroba gmail" -> gmail.com), en orden
+# de preferencia cuando un prefijo es ambiguo ("hotmail" -> hotmail.com antes que .com.mx).
+# Los dominios de empresa se agregan con COMPANY_EMAIL_DOMAINS="fr8technologies.com,..."
+EMAIL_DOMAINS = [
+    "gmail.com", "hotmail.com", "outlook.com", "yahoo.com", "icloud.com", "live.com",
+    "hotmail.com.mx", "yahoo.com.mx", "outlook.es", "live.com.mx", "prodigy.net.mx",
+    "msn.com", "aol.com", "protonmail.com"
+]
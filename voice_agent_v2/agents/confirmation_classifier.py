@@ -0,0 +1,161 @@
+import re
+from dataclasses import dataclass
+from typing import Callable
+from unidecode import unidecode
+from .intents import IntentMatcher
+
+# Clasificador local de la respuesta a "¿es correcto?": si / no / correccion / no se sabe.
+# Las frases se buscan con el mismo automata de intents.py (sin acentos ni puntuacion,
+# palabras completas) y lo que no casa se compara con el lexico tolerando una edicion
+# ("corecto", "exactto"). Como intents.py, no depende del resto de agents/.
+
+AFFIRM = "affirm"
+DENY = "deny"
+CORRECTION = "correction"
+UNKNOWN = "unknown"
+
+LEXICON = {
+    AFFIRM: {
+        # es
+        "si", "sip", "simon", "claro", "claro que si", "correcto", "correcta", "correctos", "correctas",
+        "exacto", "exacta", "asi es", "esta bien", "estan bien", "todo bien", "ok", "okay", "okey",
+        "vale", "de acuerdo", "perfecto", "afirmativo", "andale", "eso es", "efectivamente", "aja",
+        "es correcto", "estaria",
+        # en
+        "yes", "yeah", "yep", "yup", "sure", "right", "that's right", "correct", "exactly",
+        "it's good", "go ahead", "affirmative", "uh huh", "mhm", "sounds good", "looks good",
+        "perfect", "absolutely", "all good", "alright", "all right",
+        # "no ..." que es un si: la frase mas larga le gana al "no" del principio
+        "no problem", "no worries", "no doubt", "no question", "no hay problema",
+        "no hay bronca", "no hay pedo", "no te preocupes", "sin problema", "ningun problema",
+    },
+    DENY: {
+        # es
+        "no", "nop", "nel", "negativo", "incorrecto", "incorrecta", "mal", "esta mal", "estan mal",
+        "no esta bien", "no estan bien", "no es correcto", "no es asi", "equivocado", "equivocada",
+        "para nada",
+        # en
+        "nope", "nah", "wrong", "incorrect", "not right", "that's not right", "not correct",
+        "fix it", "negative", "not quite",
+    },
+    # Lo que anuncia el valor corregido ("en vez de la F va la S", "the last letter is D")
+    CORRECTION: {
+        # es
+        "en vez de", "en lugar de", "mas bien", "sino", "quise decir", "falta", "faltan", "sobra",
+        "cambia", "cambialo", "corrige", "pero", "la ultima", "el ultimo", "la primera", "el primero",
+        # en
+        "instead of", "i meant", "actually", "but", "change", "the last", "the first", "missing",
+        "should be",
+    },
+}
+# Palabras que no son ni respuesta ni contenido ("No, sería la letra T" -> contenido "letra T")
+FILLERS = {
+    "es", "era", "seria", "sera", "fue", "son", "it", "s", "its", "is", "was", "be", "are", "the",
+    "el", "la", "lo", "los", "las", "y", "and", "este", "um", "umm", "eh", "mmm", "o", "sea",
+    "pues", "bueno", "well", "oh", "so", "entonces", "ahora", "now", "tambien", "also", "se",
+    "que", "mi", "my", "me", "that", "sigue", "siguen", "estando", "todavia", "aun", "still",
+}
+FUZZY_SCORE = 0.8
+MIXED_SCORE = 0.5        # "no, esta bien": si y no a la vez, mejor que decida el LLM
+MIN_FUZZY_LEN = 5        # "mal"/"mas" o "si"/"sin" no se corrigen
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class ConfirmationReply:
+    label: str
+    score: float
+    # Lo que se dijo despues del "no" en una correccion ("no, es 1556" -> "es 1556")
+    remainder: str = ""
+
+
+@dataclass(frozen=True)
+class _Hit:
+    label: str
+    start: int
+    end: int
+    score: float
+
+
+def _deletions(word: str) -> set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class ConfirmationClassifier:
+    def __init__(self, lexicon: dict[str, set[str]] = LEXICON):
+        self.matcher = IntentMatcher(lexicon)
+        # Borrado simetrico: una palabra y sus variantes con una letra menos -> etiqueta
+        self.fuzzy: dict[str, str] = {}
+        for label, phrases in lexicon.items():
+            for phrase in phrases:
+                word = unidecode(phrase).lower()
+                if " " in word or "'" in word or len(word) < MIN_FUZZY_LEN:
+                    continue
+                for variant in _deletions(word) | {word}:
+                    self.fuzzy.setdefault(variant, label)
+
+    def _fuzzy_label(self, word: str) -> str | None:
+        if len(word) < MIN_FUZZY_LEN - 1:
+            return None
+        if word in self.fuzzy:
+            return self.fuzzy[word]
+        return next((self.fuzzy[v] for v in _deletions(word) if v in self.fuzzy), None)
+
+    def _hits(self, text: str) -> list[_Hit]:
+        matches = sorted(self.matcher.match(text), key=lambda m: (m.start, -(m.end - m.start)))
+        hits: list[_Hit] = []
+        for m in matches:
+            # "no esta bien" contiene "esta bien": gana la frase mas larga
+            if hits and m.start >= hits[-1].start and m.end <= hits[-1].end:
+                continue
+            hits.append(_Hit(m.intent, m.start, m.end, 1.0))
+        return hits
+
+    def classify(self, text: str, corrects: Callable[[str], bool] | None = None) -> ConfirmationReply:
+        """
+        `corrects` dice si lo dicho despues de un si trae otro valor para el campo que se
+        confirma ("yes, it is 1556"); sin el, lo que sigue al si no se mira.
+        """
+        hits = self._hits(text)
+        content: list[int] = []
+        for word in WORD_RE.finditer(text):
+            if any(h.start <= word.start() < h.end for h in hits):
+                continue
+            folded = unidecode(word.group()).lower()
+            if folded in FILLERS:
+                continue
+            label = self._fuzzy_label(folded)
+            if label is not None:
+                hits.append(_Hit(label, word.start(), word.end(), FUZZY_SCORE))
+            else:
+                content.append(word.start())
+        hits.sort(key=lambda h: h.start)
+
+        negative = [h for h in hits if h.label in (DENY, CORRECTION)]
+        affirm = [h for h in hits if h.label == AFFIRM]
+        if negative:
+            first = negative[0]
+            if any(pos >= first.end for pos in content):
+                # "no, diecisiete cuarenta y cinco", "en vez de la F va la S"
+                return ConfirmationReply(CORRECTION, first.score, text[first.end:].strip(" ,.;:!?¿¡"))
+            if affirm:
+                return ConfirmationReply(UNKNOWN, MIXED_SCORE)
+            # "corrige" sin valor nuevo es un no
+            return ConfirmationReply(DENY, min(h.score for h in negative))
+        if affirm:
+            # "la unica letra que esta bien es la A" no es un si
+            if content and content[0] < affirm[0].start:
+                return ConfirmationReply(UNKNOWN, MIXED_SCORE)
+            # "yes, it is 1556" confirmando 1555: el si trae la correccion
+            remainder = text[affirm[-1].end:].strip(" ,.;:!?¿¡")
+            if corrects is not None and any(pos >= affirm[-1].end for pos in content) and corrects(remainder):
+                return ConfirmationReply(CORRECTION, min(h.score for h in affirm), remainder)
+            return ConfirmationReply(AFFIRM, min(h.score for h in affirm))
+        return ConfirmationReply(UNKNOWN, 0.0)
+
+
+confirmation_classifier = ConfirmationClassifier()
+
+
+def classify_confirmation(text: str, corrects: Callable[[str], bool] | None = None) -> ConfirmationReply:
+    return confirmation_classifier.classify(text, corrects)
@@ -0,0 +1,60 @@
+import os
+from . import metrics
+from .fields import FIELD_SPECS
+from models.driver_model import DataField
+
+# Confianza minima del STT para aceptar un valor valido sin preguntar "¿es correcto?"
+# (FieldSpec.confirm_threshold). None: el campo siempre se confirma (nombres y correos
+# son texto libre que el validador no puede comprobar). Se sobreescriben por campo con
+# variables de entorno:
+#   CONFIRM_THRESHOLD_ETA=0.8   CONFIRM_THRESHOLD_NAME=off
+DEFAULT_THRESHOLDS: dict[DataField, float | None] = {
+    field: spec.confirm_threshold for field, spec in FIELD_SPECS.items()
+}
+
+
+def _env_threshold(field: DataField, default: float | None) -> float | None:
+    raw = os.getenv(f"CONFIRM_THRESHOLD_{field.name}")
+    if raw is None:
+        return default
+    if raw.strip().lower() in ("", "off", "none"):
+        return None
+    return float(raw)
+
+
+class ConfirmationPolicy:
+    """
+    Decide si un valor recien capturado necesita el turno de confirmacion explicito
+    (CONFIRM_MESSAGE + "si/no" del usuario) o basta una confirmacion implicita
+    ("Got it, 17:45.") seguida de la siguiente pregunta. Solo se salta cuando el
+    validador del campo acepta el valor y tanto el STT como el parser local estan
+    por encima del umbral del campo; lo saltado se repasa en el resumen final.
+    Con `summary_only` todo valor valido se salta y solo se confirma en el resumen.
+    """
+
+    def __init__(
+            self,
+            thresholds: dict[DataField, float | None] | None = None,
+            enabled: bool = True,
+            summary_only: bool = False
+        ):
+        thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.thresholds = {field: _env_threshold(field, value) for field, value in thresholds.items()}
+        self.enabled = enabled
+        self.summary_only = summary_only
+
+    def should_skip(
+            self,
+            field: DataField,
+            valid: bool,
+            stt_confidence: float | None,
+            parse_confidence: float = 1.0
+        ) -> bool:
+        threshold = self.thresholds.get(field)
+        # 0.0 es lo que guarda LiveKit cuando el STT no reporto confianza
+        skip = (
+            self.enabled and valid and threshold is not None
+            and bool(stt_confidence) and min(stt_confidence, parse_confidence) >= threshold
+        ) or (self.summary_only and valid)
+        metrics.incr("confirmations_implicit" if skip else "confirmations_explicit")
+        return skip
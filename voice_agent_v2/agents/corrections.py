@@ -0,0 +1,176 @@
+import re
+from dataclasses import dataclass
+from unidecode import unidecode
+from .email_parser import parse_spoken_email
+from .kinds import CHAR_KINDS, EMAIL, ETA, NUMBER, PLATE, PLATE_CHUNK
+from .letter_recognizer import CHUNK_CONFIDENCE_THRESHOLD, expected_kind, letter_recognizer
+from .normalization import parse_eta
+from .plate_parser import CONFIDENCE_THRESHOLD as PLATE_CONFIDENCE_THRESHOLD, plate_parser
+from .spoken_numbers import LEXICON as NUMBER_LEXICON, parse_spoken_number
+
+# Correcciones dentro del turno de confirmacion: "no, es 1556", "no, la ultima letra es D",
+# "en vez de la F va la S". Se aplican sobre el valor que se estaba confirmando y se
+# reconfirma solo lo que cambio. Como intents.py, lo usa tambien voice_agent_experiments.
+
+ORDINALS = {
+    "primera": 0, "primero": 0, "first": 0,
+    "segunda": 1, "segundo": 1, "second": 1,
+    "tercera": 2, "tercero": 2, "third": 2,
+    "cuarta": 3, "cuarto": 3, "fourth": 3,
+    "quinta": 4, "quinto": 4, "fifth": 4,
+    "sexta": 5, "sexto": 5, "sixth": 5,
+    "septima": 6, "septimo": 6, "seventh": 6,
+    "penultima": -2, "penultimo": -2,
+    "ultima": -1, "ultimo": -1, "last": -1,
+}
+KIND_WORDS = {
+    "letra": "letter", "letter": "letter",
+    "numero": "digit", "number": "digit", "digito": "digit", "digit": "digit",
+    "caracter": None, "character": None,
+}
+# Lo que se dice antes del valor nuevo ("no, es 1556", "no, it's 1556", "seria la T")
+LEAD_WORDS = {
+    "es", "era", "seria", "it", "s", "its", "is", "would", "be", "should", "la", "el", "the",
+    "pues", "o", "sea", "mas", "bien", "no", "mejor", "entonces",
+}
+# Un numero corregido se dice solo ("no, mil quinientos cincuenta y seis"); con otras
+# palabras alrededor ("esa lapiz es diferente del cinco") no se adivina
+NUMBER_TOKENS = {word for words in NUMBER_LEXICON for word in words}
+SAID_AS = r"(?:(?:es|is|should be|seria|va|would be|it s|its|pon|put|use)\s+)+"
+POSITION_RE = re.compile(
+    r"\b(?P<ord>" + "|".join(ORDINALS) + r")"
+    r"(?:\s+(?P<kind>" + "|".join(KIND_WORDS) + r"))?"
+    r"(?:\s+que\s+\w+)?\s+" + SAID_AS + r"(?P<new>.+)$"
+)
+REPLACE_RE = re.compile(
+    r"\b(?:en vez de|en lugar de|instead of)\s+(?P<old>.+?)\s+" + SAID_AS + r"(?P<new>.+)$"
+)
+# "la letra L no va, sino mas bien es la letra G"
+NOT_BUT_RE = re.compile(r"(?P<old>.+?)\s+no va\s+sino\s+(?:mas bien\s+)?(?:es\s+)?(?P<new>.+)$")
+
+
+@dataclass
+class Correction:
+    value: str
+    # Lo que se reemplazo y por que ("E" -> "D"); en un valor nuevo completo, el valor anterior
+    old: str
+    new: str
+    # Indice del caracter cambiado, o None si se reemplazo el valor completo
+    position: int | None = None
+
+
+def _fold(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", unidecode(text).lower()))
+
+
+def _strip_lead(text: str) -> str:
+    """Quita "es", "it's", "seria la"... del inicio, conservando mayusculas del resto."""
+    words = text.strip(" ,.;:!?¿¡").split()
+    # "it's" se dobla a "it s": cuenta si todas sus partes son de relleno
+    while words and all(part in LEAD_WORDS for part in _fold(words[0]).split()):
+        words.pop(0)
+    return " ".join(words).strip(" ,.;:!?¿¡")
+
+
+def _read_char(text: str, expect: str | None) -> str | None:
+    candidates = letter_recognizer.recognize(text, expect=expect, limit=1)
+    return candidates[0].letter if candidates else None
+
+
+def _char_kind(ch: str) -> str:
+    return "letter" if ch.isalpha() else "digit"
+
+
+def _replace_at(current: str, position: int, new: str) -> Correction | None:
+    old = current[position]
+    if old.islower():
+        new = new.lower()
+    if new == old:
+        return None
+    return Correction(current[:position] + new + current[position + 1:], old, new, position)
+
+
+def _position_edit(current: str, folded: str) -> Correction | None:
+    """"la ultima letra es D", "the second number is 5"."""
+    m = POSITION_RE.search(folded)
+    if not m:
+        return None
+    kind = KIND_WORDS.get(m.group("kind"))
+    if kind == "letter":
+        slots = [i for i, ch in enumerate(current) if ch.isalpha()]
+    elif kind == "digit":
+        slots = [i for i, ch in enumerate(current) if ch.isdigit()]
+    else:
+        slots = [i for i, ch in enumerate(current) if ch.isalnum()]
+    k = ORDINALS[m.group("ord")]
+    if not -len(slots) <= k < len(slots):
+        return None
+    position = slots[k]
+    new = _read_char(m.group("new"), kind or _char_kind(current[position]))
+    return _replace_at(current, position, new) if new else None
+
+
+def _replace_edit(current: str, folded: str) -> Correction | None:
+    """"en vez de la F va la S", "instead of E it's D": el caracter viejo tiene que estar una sola vez."""
+    m = REPLACE_RE.search(folded) or NOT_BUT_RE.search(folded)
+    if not m:
+        return None
+    old = _read_char(m.group("old"), None)
+    if old is None:
+        return None
+    positions = [i for i, ch in enumerate(current) if ch.upper() == old]
+    if len(positions) != 1:
+        return None
+    new = _read_char(m.group("new"), _char_kind(old))
+    return _replace_at(current, positions[0], new) if new else None
+
+
+def _whole_value(kind: str, current: str, remainder: str, start: int) -> str | None:
+    """El valor completo dicho otra vez despues del "no"."""
+    said = _strip_lead(remainder)
+    if not said:
+        return None
+    if kind == NUMBER:
+        if not all(tok.isdigit() or tok in NUMBER_TOKENS for tok in _fold(said).split()):
+            return None
+        spoken = parse_spoken_number(said)
+        return spoken.digits if spoken else None
+    if kind == PLATE:
+        candidate = plate_parser.parse(said)
+        if candidate is None or candidate.confidence < PLATE_CONFIDENCE_THRESHOLD:
+            return None
+        return candidate.plate
+    if kind == PLATE_CHUNK:
+        # Los mismos caracteres que se estaban confirmando, en las mismas posiciones
+        chunk = letter_recognizer.recognize_sequence(said, start=start, length=start + len(current))
+        if len(chunk.chars) != len(current) or chunk.confidence < CHUNK_CONFIDENCE_THRESHOLD:
+            return None
+        return chunk.chars
+    if kind == ETA:
+        return parse_eta(said)
+    if kind == EMAIL:
+        email = parse_spoken_email(said)
+        return email.address if email is not None and email.valid else None
+    return said if any(ch.isalpha() for ch in said) else None
+
+
+def extract_correction(kind: str, current: str, text: str, remainder: str, start: int = 0) -> Correction | None:
+    """
+    Valor corregido a partir de la respuesta negativa `text` al confirmar `current`.
+    `remainder` es lo dicho despues del "no" (ver confirmation_classifier) y `start` la
+    posicion en la placa del primer caracter de `current` en modo letra por letra.
+    Devuelve None si la frase no trae una correccion que se pueda aplicar.
+    """
+    if not current:
+        return None
+    folded = _fold(text)
+    if kind in CHAR_KINDS:
+        edit = _position_edit(current, folded) or _replace_edit(current, folded)
+        if edit is not None:
+            if kind == PLATE_CHUNK and _char_kind(edit.new) != expected_kind(start + edit.position):
+                return None
+            return edit
+    value = _whole_value(kind, current, remainder, start)
+    if value is None or value == current:
+        return None
+    return Correction(value, current, value)
@@ -0,0 +1,254 @@
+import os
+import re
+from dataclasses import dataclass
+from unidecode import unidecode
+from . import config
+from .letter_recognizer import NUMBER_WORDS, edit_distance, letter_recognizer
+from .plate_parser import CONNECTORS, FILLERS, LETTER_CUES, SPOKEN_DIGITS
+from .spoken_numbers import parse_spoken_number
+
+# Palabras que se dictan en lugar del simbolo
+SYMBOL_WORDS = {
+    "arroba": "@", "at": "@",
+    "punto": ".", "dot": ".", "point": ".",
+    "guion": "-", "dash": "-", "hyphen": "-",
+}
+# "y"/"and" solo son parte de un numero entre dos palabras numericas
+NUMBER_CONNECTORS = {"y", "and"}
+# Lo que se dice alrededor de las letras y no es parte del correo
+SPELLING_NOISE = {"minuscula", "mayuscula", "lowercase", "uppercase", "capital", "numero", "number"}
+
+# Muletillas y arranques que se dicen antes del correo ("um", "sure", "it's", "este")
+LEAD_IN = (
+    r"(?:y|and|ok|okay|bueno|pues|si|yes|yeah|yep|sure|claro|so|well|o sea|"
+    r"u+m+|u+h+|e+h+|a+h+|hm+|mm+|e+ste+|it ?'?s|it is|that ?'?s|that is|es|is|seria|would be|it would be)"
+)
+# "mi correo es", "my email is", "y lo que sigue despues es": todo lo anterior al correo
+PREAMBLE_RE = re.compile(
+    rf"^\s*(?:{LEAD_IN}[\s,.]+)*"
+    r"(?:(?:lo que sigue(?: despues)?|(?:(?:mi|my|el|the|su|your)\s+)?"
+    r"(?:correo(?: electronico)?|e ?-? ?mail(?: address)?))[\s,]+)?"
+    rf"(?:{LEAD_IN}[\s,.]+)*"
+)
+# Cortesias al final ("juan at gmail dot com please")
+TRAILER_RE = re.compile(r"[\s,.]+(?:please|por favor|thanks|thank you|gracias)[\s.!]*$")
+TOKEN_RE = re.compile(r"[a-z]+|\d+|[@._-]")
+EMAIL_RE = re.compile(r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$")
+
+COMPLETED_DOMAIN_PENALTY = 0.9  # "gmail" -> gmail.com
+FUZZY_DOMAIN_PENALTY = 0.8      # "gmial.com" -> gmail.com
+GLUED_SYMBOL_PENALTY = 0.9      # "arrobagmail" pegado por el STT
+GLUED_WORD_PENALTY = 0.8        # dos palabras completas seguidas: una puede ser relleno absorbido
+UNPARSED_NUMBER_PENALTY = 0.5   # palabras numericas que no forman un numero
+MIN_FUZZY_LABEL = 4             # etiquetas mas cortas no se corrigen ("aol" vs "aoi")
+
+
+@dataclass
+class SpokenEmail:
+    local: str
+    domain: str
+    confidence: float
+
+    @property
+    def address(self) -> str:
+        return f"{self.local}@{self.domain}" if self.domain else self.local
+
+    @property
+    def valid(self) -> bool:
+        return is_valid_email(self.address)
+
+
+def is_valid_email(address: str) -> bool:
+    """Lo mismo que exige EmailStr del servidor MCP, para rechazar el correo durante la llamada."""
+    if not EMAIL_RE.match(address):
+        return False
+    local, domain = address.split("@")
+    if local.startswith(".") or local.endswith(".") or ".." in local:
+        return False
+    return all(label and not label.startswith("-") and not label.endswith("-") for label in domain.split("."))
+
+
+class DomainTrie:
+    """Trie de dominios conocidos; cada nodo guarda la mejor terminacion de su prefijo."""
+
+    def __init__(self, domains: list[str]):
+        self.root: dict = {}
+        self.domains = list(dict.fromkeys(domains))
+        for domain in reversed(self.domains):
+            # En reversa: el dominio preferido (el primero) queda al final como mejor
+            node = self.root
+            for ch in domain:
+                node = node.setdefault(ch, {})
+                node["$best"] = domain
+
+    def complete(self, prefix: str) -> str | None:
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get("$best")
+
+    def nearest(self, domain: str) -> str | None:
+        """Dominio conocido a una edicion de la etiqueta dicha ("gmial.com", "hotmal")."""
+        label, _, tld = domain.partition(".")
+        if len(label) < MIN_FUZZY_LABEL:
+            return None
+        # "gmial" esta a dos ediciones de "gmail"; en etiquetas cortas solo una
+        radius = 2 if len(label) > MIN_FUZZY_LABEL else 1
+        near = sorted(
+            (edit_distance(label, known.split(".")[0]), i, known)
+            for i, known in enumerate(self.domains)
+            if not tld or known.partition(".")[2].startswith(tld)
+        )
+        if near and near[0][0] <= radius and (len(near) == 1 or near[1][0] > near[0][0]
+                                         or near[1][2].split(".")[0] == near[0][2].split(".")[0]):
+            return near[0][2]
+        return None
+
+
+def _company_domains() -> list[str]:
+    raw = os.getenv("COMPANY_EMAIL_DOMAINS", "")
+    return [d.strip().lower() for d in raw.split(",") if d.strip()]
+
+
+class SpokenEmailParser:
+    """
+    Arma un correo a partir de lo que dicto el usuario: palabras completas
+    ("soulgamer punto negro"), letras deletreadas con o sin ancla ("jota", "be de burro",
+    "letra t minuscula", "G for Goat"), digitos dichos y las palabras de los simbolos
+    (arroba/at, punto/dot, guion/dash). El dominio se completa con los conocidos.
+    """
+
+    def __init__(self, domains: list[str]):
+        self.trie = DomainTrie(domains)
+
+    def _tokens(self, text: str) -> list[str]:
+        text = unidecode(text).lower()
+        text = text.replace("doble u", "w").replace("double u", "w")
+        text = re.sub(r"guion bajo|under ?score", "_", text)
+        text = PREAMBLE_RE.sub("", " " + text, count=1)
+        text = TRAILER_RE.sub("", text)
+        tokens = TOKEN_RE.findall(text)
+        # El punto final de la frase no es parte del correo
+        while tokens and tokens[-1] in (".", "-"):
+            tokens.pop()
+        return tokens
+
+    def _letter(self, tok: str) -> str | None:
+        if len(tok) == 1 and tok.isalpha():
+            # "ese y ge": la "y" suelta entre letras es conjuncion
+            return tok if tok not in NUMBER_CONNECTORS else None
+        if tok in letter_recognizer.names and tok not in FILLERS:
+            return letter_recognizer.names[tok].lower()
+        return None
+
+    def _read(self, tokens: list[str]) -> tuple[list[str], float]:
+        """Caracteres/palabras y simbolos en orden, y la confianza de la lectura."""
+        parts: list[str] = []
+        confidence = 1.0
+        # La parte anterior fue una palabra completa
+        after_word = False
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+            if tok in FILLERS and tok not in CONNECTORS:
+                # Relleno entre partes: no separa ni une palabras
+                i += 1
+                continue
+            is_word = False
+            if tok in ("@", ".", "_", "-"):
+                parts.append(tok)
+                i += 1
+            elif tok in SYMBOL_WORDS:
+                parts.append(SYMBOL_WORDS[tok])
+                i += 1
+            elif tok.startswith("arroba"):
+                parts.extend(["@", tok[len("arroba"):]])
+                confidence *= GLUED_SYMBOL_PENALTY
+                i += 1
+            elif tok in LETTER_CUES and nxt is not None and nxt not in SYMBOL_WORDS:
+                letter = self._letter(nxt)
+                parts.append(letter or nxt[0])
+                i += 2
+            elif tok in SPELLING_NOISE:
+                i += 1
+            elif tok.isdigit():
+                parts.append(tok)
+                i += 1
+            elif tok in SPOKEN_DIGITS or tok in NUMBER_WORDS and tok not in NUMBER_CONNECTORS:
+                j = i
+                while j < len(tokens) and (tokens[j] in SPOKEN_DIGITS or tokens[j] in NUMBER_WORDS):
+                    j += 1
+                # "cero y letra ge": la "y" del final no es parte del numero
+                while tokens[j - 1] in NUMBER_CONNECTORS:
+                    j -= 1
+                words = tokens[i:j]
+                if all(w in SPOKEN_DIGITS for w in words):
+                    parts.append("".join(SPOKEN_DIGITS[w] for w in words))
+                else:
+                    spoken = parse_spoken_number(" ".join(words))
+                    parts.append(spoken.digits if spoken else "".join(words))
+                    confidence *= spoken.confidence if spoken else UNPARSED_NUMBER_PENALTY
+                i = j
+            elif (letter := self._letter(tok)) and nxt in CONNECTORS and i + 2 < len(tokens):
+                # "be de burro", "G for Goat": el ancla decide si la conoce; si no, la letra dicha
+                anchor = tokens[i + 2]
+                parts.append(letter_recognizer.anchors.get(anchor, letter.upper()).lower())
+                i += 3
+            elif letter:
+                parts.append(letter)
+                i += 1
+            else:
+                # Palabra completa ("jorge", "gmail", "com")
+                if after_word:
+                    # "yeah juan": el correo se dicta con simbolos entre palabras
+                    confidence *= GLUED_WORD_PENALTY
+                parts.append(tok)
+                is_word = True
+                i += 1
+            after_word = is_word
+        return parts, confidence
+
+    def _complete_domain(self, domain: str) -> tuple[str, float]:
+        domain = domain.strip(".")
+        if domain in self.trie.domains:
+            return domain, 1.0
+        completed = self.trie.complete(domain)
+        if completed is not None:
+            return completed, COMPLETED_DOMAIN_PENALTY
+        nearest = self.trie.nearest(domain)
+        if nearest is not None:
+            return nearest, FUZZY_DOMAIN_PENALTY
+        return domain, 1.0
+
+    def parse(self, text: str, local: str | None = None) -> SpokenEmail | None:
+        """
+        Correo dictado en `text`. Si la frase no trae arroba, `local` es la parte de antes
+        de la arroba ya capturada en un turno anterior y `text` se lee como el dominio.
+        Devuelve None si no se entendio nada; `domain` vacio si falta lo de despues de la arroba.
+        """
+        parts, confidence = self._read(self._tokens(text))
+        if local and "@" not in parts:
+            parts = [local, "@", *parts]
+        elif local and parts and parts[0] == "@":
+            parts = [local, *parts]
+        if not parts:
+            return None
+        if "@" not in parts:
+            return SpokenEmail("".join(parts).strip("."), "", confidence)
+        at = parts.index("@")
+        user = "".join(parts[:at]).strip(".")
+        domain = "".join(p for p in parts[at + 1:] if p != "@")
+        if not domain:
+            return SpokenEmail(user, "", confidence)
+        domain, penalty = self._complete_domain(domain)
+        return SpokenEmail(user, domain, round(confidence * penalty, 3))
+
+
+email_parser = SpokenEmailParser(_company_domains() + config.EMAIL_DOMAINS)
+
+
+def parse_spoken_email(text: str, local: str | None = None) -> SpokenEmail | None:
+    return email_parser.parse(text, local=local)
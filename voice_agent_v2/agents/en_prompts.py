@@ -25,6 +25,8 @@ Instruct the user clearly to spell each letter and number individually, e.g., "S
 
 Use the save_driver_data tool to save the information in JSON.
 
+If the user asks to be called back later, use the reschedule_call tool with the delay in seconds. Use log_complaint for complaints and end_call when the user wants to end the call.
+
 BE BRIEF AND CLEAR WITH THE RESPONSE
 """
 
@@ -131,4 +133,82 @@ BE BRIEF PLEASE, ONLY SHORT RESULTS AND REMEMBER YOU ARE AN ASSISTANT
 
 SAVE_MESSAGE = """
 When all data is collected, call the save_driver_data function to store it in JSON. BE BRIEF PLEASE, ONLY SHORT RESULTS AND REMEMBER YOU ARE AN ASSISTANT
-"""
\ No newline at end of file
+"""
+
+# Plain fallbacks spoken as-is (no LLM) when ASI1 misses the turn budget
+FIELD_NAMES_EN = {
+    "nombre completo": "full name",
+    "número de tractor": "tractor number",
+    "placas de tractor": "tractor plates",
+    "número de tráiler": "trailer number",
+    "placas de tráiler": "trailer plates",
+    "ETA": "ETA",
+    "correo": "email address",
+}
+
+ASK_FALLBACK = "Alright, what's your {field_name}?"
+CONFIRM_FALLBACK = "Got it, your {field_name} is {value}. Is that correct?"
+REPEAT_FALLBACK = "Sorry, let me repeat: what's your {field_name}?"
+OFF_TOPIC_FALLBACK = "Got it, but let's finish the registration first. What's your {field_name}?"
+
+# Confidence-gated confirmation: spoken as-is, no LLM turn
+IMPLICIT_CONFIRM_MESSAGE = "Got it, {value}."
+SUMMARY_CONFIRM_MESSAGE = "Before I save, a quick check: {items}. Is everything correct?"
+SUMMARY_REOPEN_MESSAGE = "No problem, let's go over those again."
+
+# Inline correction in the confirmation turn: only the change is read back
+CORRECTED_CHAR_MESSAGE = "Got it, {new} instead of {old}. Is that right?"
+CORRECTED_VALUE_MESSAGE = "Got it, {value}. Is that right?"
+
+# Several fields in one answer: read back together, one yes/no
+SLOTS_CONFIRM_MESSAGE = "Got it: {items}. Is all of that correct?"
+
+# Repeat carrier: last registration for the same phone, only what changed is asked again
+PRIOR_REGISTRATION_MESSAGE = "Welcome back! Same as last time: {items}?"
+PRIOR_CHANGES_MESSAGE = "No problem. What changed?"
+
+# Retried call (dropped or rescheduled): resume at the step where the last one stopped
+RESUME_MESSAGE = "Welcome back! Let's pick up where we left off."
+
+# Spelled email: spoken as-is while the address is still being dictated
+EMAIL_DOMAIN_MESSAGE = "Got it, {local}. And what comes after the at sign?"
+EMAIL_REQUIRED_MESSAGE = (
+    "No problem, but I need an email address to send your registration to. "
+    "A work or family address is fine too. What email can I use?"
+)
+EMAIL_INVALID_MESSAGE = (
+    "Hmm, {value} doesn't look like a valid email address. "
+    "Please spell it again, saying 'at' for the at sign and 'dot' for the period."
+)
+
+FALLBACK_MESSAGES = {
+    ASK_MESSAGE: ASK_FALLBACK,
+    CONFIRM_MESSAGE: CONFIRM_FALLBACK,
+    REPEAT_MESSAGE: REPEAT_FALLBACK,
+    OFF_TOPIC_MESSAGE: OFF_TOPIC_FALLBACK,
+}
+
+# Structured extraction of every still-missing field from one utterance
+EXTRACT_FIELDS_MESSAGE = """
+You extract truck carrier registration data from one transcribed phone utterance. The driver may speak American English or Mexican Spanish, spell letters ("A for Apple", "A de Águila"), and use filler words ("umm", "este", "creo").
+
+Only look for these fields:
+{fields}
+
+Rules:
+- Convert spoken numbers to digits ("fifteen fifty-five" → 1555, "cuatro cinco seis" → 456).
+- Plates use the format ABC-1234 or XY-1234 (letters, dash, digits).
+- ETA uses 24-hour HH:MM ("three fifteen in the afternoon" → 15:15, "dieciséis cero cero" → 16:00).
+- Emails are lowercase; "at"/"arroba" is @ and "dot"/"punto" is .
+- Leave out any field that is not clearly present. Never guess.
+- confidence is a number from 0 to 1 for how sure you are of each value.
+
+Examples:
+- "tractor 1555, plates J K L dash four three two one" → {{"tractor_number": {{"value": "1555", "confidence": 0.95}}, "tractor_plates": {{"value": "JKL-4321", "confidence": 0.9}}}}
+- "A las tres quince de la tarde" → {{"eta": {{"value": "15:15", "confidence": 0.9}}}}
+- "Hola, cómo estás" → {{}}
+
+Return ONLY a JSON object mapping field keys to {{"value": ..., "confidence": ...}}.
+Utterance: "{utterance}"
+JSON:
+"""
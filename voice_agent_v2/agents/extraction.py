@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Iterable
+from dotenv import load_dotenv
+from models.driver_model import DataField
+from .asi1_agent import ASI1RequestWrapper
+from .en_prompts import EXTRACT_FIELDS_MESSAGE
+from .fields import FIELD_SPECS, SPECS_BY_ATTR
+
+load_dotenv()
+logger = logging.getLogger("extraction")
+
+# Llave en el JSON de ASI1 (igual al atributo de DriverData) y descripcion para el prompt
+FIELD_KEYS = {field: (spec.attr, spec.description) for field, spec in FIELD_SPECS.items()}
+KEY_FIELDS = {attr: spec.field for attr, spec in SPECS_BY_ATTR.items()}
+
+
+def _normalize(field: DataField, value: str) -> str | None:
+    """Normaliza y valida el valor devuelto por ASI1; None si no tiene el formato del campo."""
+    return FIELD_SPECS[field].normalize(value)
+
+
+@dataclass
+class ExtractedValue:
+    value: str
+    confidence: float
+
+
+_llm: ASI1RequestWrapper | None = None
+
+
+def _extractor_llm() -> ASI1RequestWrapper:
+    global _llm
+    if _llm is None:
+        _llm = ASI1RequestWrapper(api_key=os.getenv('ASI1_API_KEY'), temperature=0.0)
+    return _llm
+
+
+def parse_extraction(response: str, missing: Iterable[DataField]) -> dict[DataField, ExtractedValue]:
+    """Valida el JSON de ASI1 y se queda solo con campos pedidos y bien formados."""
+    wanted = set(missing)
+    text = response.strip()
+    # A veces el modelo envuelve el JSON en ```json ... ```
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        return {}
+    try:
+        raw = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        logger.warning("Respuesta de extraccion no es JSON: %s", response)
+        return {}
+    found = {}
+    for key, item in raw.items():
+        field = KEY_FIELDS.get(key)
+        if field not in wanted:
+            continue
+        if isinstance(item, dict):
+            value, confidence = item.get("value"), item.get("confidence", 0.5)
+        else:
+            value, confidence = item, 0.5
+        if not isinstance(value, (str, int)):
+            continue
+        normalized = _normalize(field, str(value))
+        if normalized is None:
+            continue
+        try:
+            confidence = min(1.0, max(0.0, float(confidence)))
+        except (TypeError, ValueError):
+            confidence = 0.5
+        found[field] = ExtractedValue(normalized, confidence)
+    return found
+
+
+async def extract_fields(
+        utterance: str,
+        missing: Iterable[DataField]
+    ) -> dict[DataField, ExtractedValue] | None:
+    """
+    Extrae en una sola peticion a ASI1 todos los campos faltantes que aparezcan en
+    la frase, con su confianza. Devuelve None si ASI1 no respondio.
+    """
+    missing = [field for field in FIELD_KEYS if field in set(missing)]
+    if not missing:
+        return {}
+    fields = "\n".join(f"- {FIELD_KEYS[f][0]}: {FIELD_KEYS[f][1]}" for f in missing)
+    prompt = EXTRACT_FIELDS_MESSAGE.format(fields=fields, utterance=utterance)
+    response = await _extractor_llm().agenerate_within(prompt)
+    if response is None:
+        return None
+    return parse_extraction(response, missing)
@@ -0,0 +1,205 @@
+import re
+from dataclasses import dataclass
+from typing import Callable
+from unidecode import unidecode
+from models.driver_model import DataField
+from . import kinds
+from .email_parser import is_valid_email, parse_spoken_email
+from .en_prompts import ASK_MESSAGE, CONFIRM_MESSAGE, REPEAT_MESSAGE
+from .normalization import parse_spoken_eta
+from .plate_parser import plate_parser
+from .spoken_numbers import LEXICON as NUMBER_LEXICON, parse_spoken_number
+
+# Registro de campos: todo lo que cambia de un campo a otro (como se normaliza, valida
+# y lee en voz alta, sus prompts y donde se guarda) en una tabla que se arma al importar.
+# VoiceAgent, extraction, confirmation_policy y voice_agent_experiments despachan por
+# aqui; un campo nuevo es un miembro de DataField, su atributo en DriverData y un FieldSpec.
+
+PLATE_RE = re.compile(r"^[A-Z]{2,3}-[0-9]{3,4}$")
+ETA_RE = re.compile(r"^([01][0-9]|2[0-3]):[0-5][0-9]$")
+NUMBER_RE = re.compile(r"^[0-9]{1,10}$")
+NUMBER_TOKENS = {word for words in NUMBER_LEXICON for word in words}
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    field: DataField
+    # Atributo de DriverData, llave del JSON de extraccion y de save_driver_data
+    attr: str
+    # Tipo de valor (kinds.TEXT, NUMBER, PLATE, ETA, EMAIL): como se captura y se corrige
+    kind: str
+    # Descripcion para el prompt de extraccion de ASI1
+    description: str
+    # Valor devuelto por ASI1 -> valor del campo, o None si no tiene el formato
+    normalize: Callable[[str], str | None]
+    # Valor capturado -> (el validador lo acepta, confianza del parser local)
+    validate: Callable[[str], tuple[bool, float]]
+    # Como se lee el valor en CONFIRM_MESSAGE y el resumen
+    format: Callable[[str], str]
+    # Trozo de frase -> (valor, confianza) para llenar el campo de paso (ver slot_filling); None: no se llena asi
+    extract: Callable[[str], tuple[str, float] | None] | None = None
+    # Frases que nombran el campo: lo anuncian dentro de otra respuesta ("tractor 1555",
+    # "arriving at 9:15") o lo senalan en el resumen ("the trailer number is wrong")
+    cues: tuple[str, ...] = ()
+    # Umbral de confianza para la confirmacion implicita (ver confirmation_policy); None: siempre se pregunta
+    confirm_threshold: float | None = None
+    # Se puede tomar del registro anterior del mismo telefono (ver registrations); la ETA es de cada viaje
+    reusable: bool = True
+    ask: str = ASK_MESSAGE
+    confirm: str = CONFIRM_MESSAGE
+    repeat: str = REPEAT_MESSAGE
+    # Llave y metodo de DaisyAssistantFnc en voice_agent_experiments (None si alla no se pide)
+    key: str | None = None
+    setter: str | None = None
+
+
+def is_valid_plate(plate: str) -> bool:
+    # Simple validation for plates (e.g., ABC-1234 or XY-1234)
+    parts = plate.strip().split('-')
+    if len(parts) != 2:
+        return False
+    letters, numbers = parts
+    return len(letters) in [2, 3] and letters.isalpha() and len(numbers) == 4 and numbers.isdigit()
+
+
+def is_valid_eta(eta: str) -> bool:
+    # Validate ETA format (HH:MM)
+    try:
+        hours, minutes = map(int, eta.split(':'))
+        return 0 <= hours <= 23 and 0 <= minutes <= 59
+    except (ValueError, AttributeError):
+        return False
+
+
+def _normalize_name(value: str) -> str | None:
+    value = value.strip()
+    return " ".join(p.capitalize() for p in value.split()) if any(c.isalpha() for c in value) else None
+
+
+def _normalize_number(value: str) -> str | None:
+    value = value.strip().replace(" ", "").replace("-", "")
+    return value if NUMBER_RE.match(value) else None
+
+
+def _normalize_plate(value: str) -> str | None:
+    value = value.strip().upper().replace(" ", "")
+    return value if PLATE_RE.match(value) else None
+
+
+def _normalize_eta(value: str) -> str | None:
+    value = value.strip().zfill(5)
+    return value if ETA_RE.match(value) else None
+
+
+def _normalize_email(value: str) -> str | None:
+    # ASI1 a veces devuelve el correo como se dicto ("juan at gmail dot com")
+    email = parse_spoken_email(value.strip())
+    return email.address if email is not None and email.valid else None
+
+
+def _validate_text(value: str) -> tuple[bool, float]:
+    return bool(value.strip()), 1.0
+
+
+def _validate_number(value: str) -> tuple[bool, float]:
+    # El valor ya son los digitos (VoiceAgent._collect_number); la confianza del dictado la pone la captura
+    return bool(NUMBER_RE.match(value)), 1.0
+
+
+def _validate_plate(value: str) -> tuple[bool, float]:
+    return is_valid_plate(value), 1.0
+
+
+def _validate_eta(value: str) -> tuple[bool, float]:
+    # El valor ya es HH:MM; la confianza de la lectura la pone la captura (VoiceAgent._collect_eta)
+    return is_valid_eta(value), 1.0
+
+
+def _validate_email(value: str) -> tuple[bool, float]:
+    # La confianza del dictado la pone la captura (ver VoiceAgent._collect_email)
+    return is_valid_email(value), 1.0
+
+
+def _extract_number(text: str) -> tuple[str, float] | None:
+    # Solo numero: "tractor 1555" si, "tractor rojo de 1990" no
+    tokens = re.findall(r"[a-z]+|\d+", unidecode(text).lower())
+    if not tokens or not all(tok.isdigit() or tok in NUMBER_TOKENS for tok in tokens):
+        return None
+    spoken = parse_spoken_number(text)
+    return (spoken.digits, spoken.confidence) if spoken else None
+
+
+def _extract_plate(text: str) -> tuple[str, float] | None:
+    candidate = plate_parser.parse(text)
+    if candidate is None or not is_valid_plate(candidate.plate):
+        return None
+    return candidate.plate, candidate.confidence
+
+
+def _extract_eta(text: str) -> tuple[str, float] | None:
+    spoken = parse_spoken_eta(text)
+    return (spoken.eta, spoken.confidence) if spoken is not None else None
+
+
+def _extract_email(text: str) -> tuple[str, float] | None:
+    email = parse_spoken_email(text)
+    return (email.address, email.confidence) if email is not None and email.valid else None
+
+
+def _format_plain(value: str) -> str:
+    return value
+
+
+def _format_plate(value: str) -> str:
+    return ' '.join(value).upper()
+
+
+def _format_eta(value: str) -> str:
+    return value.zfill(5)  # Ensure HH:MM format
+
+
+# Lo comun a los campos de cada tipo de valor
+_BY_KIND = {
+    kinds.TEXT: dict(normalize=_normalize_name, validate=_validate_text, format=_format_plain),
+    kinds.NUMBER: dict(
+        normalize=_normalize_number, validate=_validate_number, format=_format_plain, extract=_extract_number
+    ),
+    kinds.PLATE: dict(
+        normalize=_normalize_plate, validate=_validate_plate, format=_format_plate, extract=_extract_plate
+    ),
+    kinds.ETA: dict(normalize=_normalize_eta, validate=_validate_eta, format=_format_eta, extract=_extract_eta),
+    kinds.EMAIL: dict(
+        normalize=_normalize_email, validate=_validate_email, format=_format_plain, extract=_extract_email
+    ),
+}
+
+
+def _spec(field: DataField, attr: str, kind: str, description: str, **overrides) -> FieldSpec:
+    return FieldSpec(field=field, attr=attr, kind=kind, description=description, **{**_BY_KIND[kind], **overrides})
+
+
+# En el orden en que se piden
+FIELD_SPECS: dict[DataField, FieldSpec] = {spec.field: spec for spec in (
+    _spec(DataField.NAME, "name", kinds.TEXT, "driver's full name",
+          key="nombre_operador", setter="set_driver_name", cues=("name", "full name", "nombre")),
+    _spec(DataField.TRACTOR_NUMBER, "tractor_number", kinds.NUMBER, "tractor number, digits only",
+          confirm_threshold=0.9, key="numero_tractor", setter="set_tractor_number",
+          cues=("tractor", "tractor number", "numero de tractor", "numero del tractor", "truck", "unidad")),
+    _spec(DataField.TRACTOR_PLATES, "tractor_plates", kinds.PLATE, "tractor plates, ABC-1234 or XY-1234",
+          confirm_threshold=0.92, key="placas_tractor", setter="set_tractor_plates",
+          cues=("tractor plates", "placas del tractor", "placas de tractor", "truck plates")),
+    _spec(DataField.TRAILER_NUMBER, "trailer_number", kinds.NUMBER, "trailer number, digits only",
+          confirm_threshold=0.9, key="numero_trailer", setter="set_trailer_number",
+          cues=("trailer", "trailer number", "numero de trailer", "numero del trailer", "caja", "remolque")),
+    _spec(DataField.TRAILER_PLATES, "trailer_plates", kinds.PLATE, "trailer plates, ABC-1234 or XY-1234",
+          confirm_threshold=0.92, key="placas_trailer", setter="set_trailer_plates",
+          cues=("trailer plates", "placas del trailer", "placas de trailer", "placas de la caja")),
+    _spec(DataField.ETA, "eta", kinds.ETA, "estimated time of arrival, HH:MM 24-hour",
+          confirm_threshold=0.85, reusable=False, key="eta", setter="set_eta",
+          cues=("arriving", "arrive", "arrival", "arrival time", "eta", "be there", "hora", "hora de llegada",
+                "llego", "llegando", "llegaria", "llegada")),
+    _spec(DataField.EMAIL, "email", kinds.EMAIL, "email address", key="email",
+          cues=("email", "e mail", "correo", "mail")),
+)}
+SPECS_BY_ATTR = {spec.attr: spec for spec in FIELD_SPECS.values()}
+SPECS_BY_KEY = {spec.key: spec for spec in FIELD_SPECS.values() if spec.key}
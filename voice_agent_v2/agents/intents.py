@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Iterable
+from unidecode import unidecode
+
+# Matcher de frases disparadoras (repeticion, fuera de tema, wake words...) con un
+# automata de Aho-Corasick: una sola pasada por la frase sin importar cuantas
+# frases haya. No depende del resto de agents/ (lo usa tambien voice_agent_experiments).
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    intent: str
+    phrase: str
+    # Posiciones en el texto original
+    start: int
+    end: int
+
+
+def _fold(text: str) -> tuple[str, list[int]]:
+    """
+    Minusculas, sin acentos y con la puntuacion como un solo espacio ("¿Qué, dijiste?"
+    -> " que dijiste "). Devuelve tambien, por cada caracter, su posicion en el original.
+    """
+    chars: list[str] = [" "]
+    origin: list[int] = [0]
+    for i, ch in enumerate(text):
+        for c in (ch if ch.isascii() else unidecode(ch)).lower():
+            if not c.isalnum():
+                if chars[-1] == " ":
+                    continue
+                c = " "
+            chars.append(c)
+            origin.append(i)
+    if chars[-1] != " ":
+        chars.append(" ")
+        origin.append(len(text))
+    return "".join(chars), origin
+
+
+class IntentMatcher:
+    """
+    Automata sobre todas las frases de todos los intents. Las frases se comparan
+    dobladas (" repiteme ") con un espacio a cada lado, asi que solo casan palabras
+    completas: "si" no aparece dentro de "asi".
+    """
+
+    def __init__(self, phrase_sets: dict[str, Iterable[str]]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        # Por estado: (intent, frase original, largo doblado) que terminan ahi
+        self.output: list[list[tuple[str, str, int]]] = [[]]
+        seen = set()
+        for intent, phrases in phrase_sets.items():
+            # Orden fijo: con "quien es" y "quién es" gana siempre la misma
+            for phrase in sorted(phrases):
+                folded = _fold(phrase)[0]
+                if folded.strip() and (intent, folded) not in seen:
+                    seen.add((intent, folded))
+                    self._add(folded, (intent, phrase, len(folded)))
+        self._link()
+
+    def _add(self, key: str, value: tuple[str, str, int]):
+        state = 0
+        for ch in key:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append(value)
+
+    def _link(self):
+        # BFS: los estados de profundidad 1 fallan a la raiz
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    @classmethod
+    def from_config(cls, config) -> "IntentMatcher":
+        """Un intent por cada conjunto de frases del modulo config (REPEAT_REQUESTS -> "repeat_requests")."""
+        phrase_sets = {
+            name.lower(): value
+            for name, value in vars(config).items()
+            if name.isupper() and isinstance(value, (set, frozenset)) and all(isinstance(v, str) for v in value)
+        }
+        return cls(phrase_sets)
+
+    def match(self, text: str) -> list[IntentMatch]:
+        """Todas las frases encontradas, con su intent y su posicion en `text`."""
+        folded, origin = _fold(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        matches = []
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for intent, phrase, length in output[state]:
+                # El espacio de cada lado no es parte del span; el del final tambien
+                # abre la siguiente frase ("repite otra vez" casa las dos)
+                start, end = i - length + 2, i
+                matches.append(IntentMatch(intent, phrase, origin[start], origin[end - 1] + 1))
+        return matches
+
+    def intents(self, text: str) -> set[str]:
+        return {m.intent for m in self.match(text)}
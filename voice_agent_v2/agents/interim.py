@@ -0,0 +1,58 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from .confirmation_classifier import AFFIRM, classify_confirmation
+from .letter_recognizer import letter_recognizer
+
+# Respuestas cortas tomadas de las transcripciones parciales del STT: un "si" o un solo
+# caracter de la placa se contestan sin esperar el endpointing. Si la transcripcion final
+# dice otra cosa, el agente deshace lo hecho (ver VoiceAgent._rollback_early_commit).
+
+CONFIRM = "confirm"           # se espera si/no; "letter"/"digit" en modo letra por letra
+MIN_CHAR_SCORE = 0.9          # nombre de la letra o ancla dicha sola
+MIN_CHAR_MARGIN = 0.15        # distancia minima al segundo candidato ("be" vs "de")
+# Un parcial contestado sin transcripcion final en este tiempo se da por bueno: la sesion
+# descarto el turno y el siguiente parcial ya es de otra frase. La final que si llega, aun
+# tarde, se compara con el parcial y nunca se procesa dos veces
+MAX_PENDING_S = 3.0
+
+
+@dataclass
+class EarlyCommit:
+    expect: str
+    # Lo que se entendio del parcial: AFFIRM o el caracter
+    answer: str
+    text: str
+    # Atributos del agente antes de procesar el parcial, para el rollback
+    snapshot: dict[str, Any]
+    started: float = field(default_factory=time.perf_counter)
+    task: asyncio.Task | None = None
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() - self.started > MAX_PENDING_S
+
+
+def short_answer(text: str, expect: str) -> str | None:
+    """
+    La respuesta corta del parcial `text` si no hay duda de cual es; None si hay que
+    esperar la final. Un "no" nunca se adelanta: casi siempre sigue la correccion.
+    """
+    if expect == CONFIRM:
+        reply = classify_confirmation(text)
+        return AFFIRM if reply.label == AFFIRM and reply.score == 1.0 else None
+    candidates = letter_recognizer.recognize(text, expect=expect, limit=2)
+    if not candidates or candidates[0].score < MIN_CHAR_SCORE:
+        return None
+    if len(candidates) > 1 and candidates[0].score - candidates[1].score < MIN_CHAR_MARGIN:
+        return None
+    return candidates[0].letter
+
+
+def agrees(commit: EarlyCommit, final_text: str) -> bool:
+    """La transcripcion final confirma lo que ya se contesto con el parcial."""
+    if commit.expect == CONFIRM:
+        return classify_confirmation(final_text).label == AFFIRM
+    candidates = letter_recognizer.recognize(final_text, expect=commit.expect, limit=1)
+    return bool(candidates) and candidates[0].letter == commit.answer
@@ -0,0 +1,11 @@
+# Tipos de valor de un campo (FieldSpec.kind): como se captura, se valida y se corrige.
+# Sin dependencias para que fields y corrections los compartan sin importarse entre si.
+
+NUMBER = "number"
+PLATE = "plate"
+PLATE_CHUNK = "plate_chunk"   # caracteres de la placa en modo letra por letra
+ETA = "eta"
+EMAIL = "email"
+TEXT = "text"
+# Se corrigen caracter por caracter ("la ultima letra es D")
+CHAR_KINDS = (NUMBER, PLATE, PLATE_CHUNK, EMAIL)
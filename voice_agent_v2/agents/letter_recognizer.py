@@ -0,0 +1,328 @@
+import re
+from dataclasses import dataclass
+from unidecode import unidecode
+from . import config
+from .plate_parser import (
+    CONNECTORS,
+    DIGIT_HOMOPHONES,
+    FILLERS,
+    LETTER_CUES,
+    SPOKEN_DIGITS,
+)
+from .spoken_numbers import DIGIT, LEXICON, parse_spoken_number
+
+# Palabras numericas de mas de un digito ("fourteen", "ochenta", "mil")
+NUMBER_WORDS = {words[0] for words, (kind, _) in LEXICON.items() if len(words) == 1 and kind != DIGIT}
+
+# Puntajes base por tipo de coincidencia
+NAME_SCORE = 1.0            # "be", "bee", "jota", "b"
+ANCHOR_SCORE = 0.9          # "burro", "apple" dichos solos
+PHONETIC_SCORE = 0.85       # misma clave fonetica ("bi" para "bee"/"bi")
+FUZZY_STEP = 0.25           # se resta por cada edicion de distancia en el BK-tree
+HOMOPHONE_DIGIT_SCORE = 0.8  # "oh" -> 0 cuando se espera un numero
+# Penalizaciones multiplicativas
+AMBIGUOUS_PENALTY = 0.85    # nombres de letra que tambien son palabras ("de", "te", "you")
+ANCHOR_CONFLICT_SCORE = 0.5  # la letra dicha cuando el ancla apunta a otra ("be de vaca")
+POSITION_DECAY = 0.9        # cada palabra de contenido despues de la primera pesa menos
+# En modo letra por letra el caracter viene al principio; el resto de una frase larga no cuenta
+MAX_CONTENT_TOKENS = 4
+TOKEN_CACHE_SIZE = 4096
+# Placas de letra por letra: 3 letras y 4 digitos
+PLATE_LETTERS = 3
+PLATE_LENGTH = 7
+# Un grupo de caracteres se confirma junto solo con esta confianza; si no, uno por uno
+CHUNK_CONFIDENCE_THRESHOLD = 0.8
+# Un caracter suelto por debajo de esto no se pregunta: se pide otra vez ("okay" no es K)
+MIN_LETTER_SCORE = 0.8
+UNKNOWN_TOKEN_PENALTY = 0.7  # palabra dentro del grupo que no es ningun caracter
+
+TOKEN_RE = re.compile(r"[a-z]+|\d")
+
+# Nombres de letra en ingles que no vienen en LETTER_MAP_EN ("el" es L, no E por cercania)
+LETTER_NAMES = {"el": "L", "es": "S", "ef": "F", "zed": "Z"}
+# Lo que se dice alrededor del caracter ("the letter is m", "la letra es ele", "next one is")
+STOP_WORDS = {
+    "the", "letter", "letters", "is", "it", "its", "next", "now", "then", "this", "that", "and",
+    "la", "letra", "es", "el", "sigue", "siguiente", "ahora", "luego", "que", "esta",
+    "said", "say", "mean", "okay", "ok", "dije", "digo",
+}
+# "next one": el "one" no es un digito
+NEXT_ONE_RE = re.compile(r"\bnext one\b")
+# "I said B", "I mean D": ese "I" no es la letra
+I_SAID_RE = re.compile(r"\bi (?=(?:said|say|mean)\b)")
+
+# Reglas de la clave fonetica, en orden: espanol e ingles colapsan en la misma
+# clave cuando suenan igual ("ve"/"be", "ce"/"se", "bee"/"bi", "cue"/"cu")
+PHONETIC_RULES = [
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"[cs]h"), "x"),
+    (re.compile(r"ll"), "y"),
+    (re.compile(r"qu|c(?=[aou])|k"), "k"),
+    (re.compile(r"c(?=[eiy])|z"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"v"), "b"),
+    (re.compile(r"gu(?=[ei])"), "g"),
+    (re.compile(r"g(?=[eiy])"), "j"),
+    (re.compile(r"h"), ""),
+    (re.compile(r"ee|ea|y$"), "i"),
+    (re.compile(r"oo|ue$|ou"), "u"),
+    (re.compile(r"ay|ey"), "ei"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+@dataclass
+class LetterCandidate:
+    letter: str
+    score: float
+
+
+@dataclass
+class SpelledChunk:
+    chars: str
+    confidence: float
+
+
+def expected_kind(index: int) -> str:
+    """Lo que va en la posicion `index` de una placa ABC-1234."""
+    return "letter" if index < PLATE_LETTERS else "digit"
+
+
+def _fold(text: str) -> str:
+    return unidecode(text).lower()
+
+
+def phonetic_key(word: str) -> str:
+    key = re.sub(r"[^a-z]", "", _fold(word))
+    for pattern, repl in PHONETIC_RULES:
+        key = pattern.sub(repl, key)
+    return key
+
+
+def edit_distance(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+class BKTree:
+    """BK-tree sobre claves foneticas: busqueda por distancia de edicion sin recorrer todas."""
+
+    def __init__(self, words):
+        self.root: tuple[str, dict] | None = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            d = edit_distance(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                return
+            node = child
+
+    def search(self, word: str, radius: int) -> list[tuple[int, str]]:
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            key, children = stack.pop()
+            d = edit_distance(word, key)
+            if d <= radius:
+                found.append((d, key))
+            for dist, child in children.items():
+                if d - radius <= dist <= d + radius:
+                    stack.append(child)
+        return sorted(found)
+
+
+class LetterRecognizer:
+    """
+    Reconoce un caracter deletreado en modo letra por letra. Se construye una vez con
+    los nombres de letra y las anclas de LETTER_MAP y LETTER_MAP_EN, indexados por
+    nombre exacto, por clave fonetica y en un BK-tree para lo que el STT escribio mal.
+    Devuelve candidatos ordenados por puntaje en lugar de adivinar por la inicial.
+    """
+
+    def __init__(self, *letter_maps: dict[str, tuple[str, str]]):
+        self.names: dict[str, str] = {}
+        self.anchors: dict[str, str] = {}
+        # Clave fonetica -> {letra: puntaje}
+        self.phonetic: dict[str, dict[str, float]] = {}
+        for letter_map in letter_maps:
+            for name, (letter, anchor) in letter_map.items():
+                if len(letter) != 1 or not letter.isalpha():
+                    continue
+                name, anchor = _fold(name), _fold(anchor).replace("-", "")
+                self.names.setdefault(name, letter)
+                self.anchors[anchor] = letter
+                for word, score in ((name.replace(" ", ""), NAME_SCORE), (anchor, ANCHOR_SCORE)):
+                    scores = self.phonetic.setdefault(phonetic_key(word), {})
+                    scores[letter] = max(scores.get(letter, 0.0), score)
+        for name, letter in LETTER_NAMES.items():
+            self.names.setdefault(name, letter)
+            scores = self.phonetic.setdefault(phonetic_key(name), {})
+            scores[letter] = max(scores.get(letter, 0.0), NAME_SCORE)
+        self.tree = BKTree(sorted(self.phonetic))
+        self.max_key_len = max(len(key) for key in self.phonetic)
+        self._cache: dict[str, dict[str, float]] = {}
+        # "dedededo": "de de dedo" pegado por el STT
+        self.glued_anchor_re = re.compile(
+            r"^(?P<name>[a-z]+?)(?:de|for|como)(?P<anchor>" + "|".join(sorted(self.anchors, key=len, reverse=True)) + r")$"
+        )
+
+    def _token_candidates(self, token: str) -> dict[str, float]:
+        scores = self._cache.get(token)
+        if scores is None:
+            if len(self._cache) >= TOKEN_CACHE_SIZE:
+                self._cache.clear()
+            scores = self._cache[token] = self._score_token(token)
+        return scores
+
+    def _score_token(self, token: str) -> dict[str, float]:
+        if len(token) == 1 and token.isalpha():
+            return {token.upper(): NAME_SCORE}
+        glued = self.glued_anchor_re.match(token)
+        if glued and token not in self.anchors:
+            return {self.anchors[glued.group("anchor")]: ANCHOR_SCORE * AMBIGUOUS_PENALTY}
+        # Vecinos foneticos siempre, para que "bee" tambien ofrezca P, D, T... como alternativas
+        scores: dict[str, float] = {}
+        key = phonetic_key(token)
+        if key and len(key) <= self.max_key_len + 2:
+            radius = 1 if len(key) <= 4 else 2
+            for d, near in self.tree.search(key, radius):
+                factor = PHONETIC_SCORE - FUZZY_STEP * d
+                for letter, base in self.phonetic[near].items():
+                    scores[letter] = max(scores.get(letter, 0.0), base * factor)
+        if token in self.names:
+            scores[self.names[token]] = NAME_SCORE
+        elif token in self.anchors:
+            scores[self.anchors[token]] = ANCHOR_SCORE
+        return scores
+
+    def _content(self, text: str) -> tuple[list[str], bool]:
+        """Tokens que pueden ser caracteres y si la frase trae "letra"/"letter"."""
+        folded = NEXT_ONE_RE.sub("next", _fold(text).replace("doble u", "w").replace("double u", "w"))
+        folded = I_SAID_RE.sub("", folded)
+        tokens = TOKEN_RE.findall(folded)
+        cued = any(tok in LETTER_CUES for tok in tokens)
+        content = [tok for tok in tokens if tok not in LETTER_CUES]
+        # "the letter is m" -> m; si solo quedan palabras de relleno, la ultima puede ser la
+        # letra ("letter el", "es"). Con ancla se queda ("que de tigre", "es de Francia")
+        said = [tok for i, tok in enumerate(content) if tok not in STOP_WORDS or self._anchored(content, i)]
+        if said:
+            content = said
+        elif content and content[-1] in self.names:
+            content = content[-1:]
+        # Sin "letra" delante, "de"/"la"/"es" son relleno salvo que sean lo unico que se dijo
+        if not cued and any(tok not in FILLERS for tok in content):
+            content = [
+                tok for i, tok in enumerate(content)
+                if tok not in FILLERS or self._anchored(content, i)
+                or tok in CONNECTORS and i + 1 < len(content) and content[i + 1] in self.anchors
+            ]
+        return content, cued
+
+    def _read_char(self, content: list[str], i: int, expect: str | None, cued: bool) -> tuple[dict[str, float], int]:
+        """Puntajes del caracter que empieza en content[i] y el indice siguiente."""
+        tok = content[i]
+        scores: dict[str, float] = {}
+
+        def offer(char: str, score: float):
+            if expect == "letter" and not char.isalpha() or expect == "digit" and not char.isdigit():
+                return
+            scores[char] = max(scores.get(char, 0.0), score)
+
+        if tok.isdigit():
+            offer(tok, NAME_SCORE)
+        elif tok in SPOKEN_DIGITS:
+            offer(SPOKEN_DIGITS[tok], NAME_SCORE)
+        if expect == "digit" and tok in DIGIT_HOMOPHONES:
+            offer(DIGIT_HOMOPHONES[tok], HOMOPHONE_DIGIT_SCORE)
+        if tok.isdigit() or tok in SPOKEN_DIGITS and expect != "letter":
+            return scores, i + 1
+        if self._anchored(content, i):
+            # "be de burro": el ancla decide, la letra dicha solo confirma
+            anchor_letter = self.anchors[content[i + 2]]
+            said = self._token_candidates(tok)
+            agree = said.get(anchor_letter, 0.0) > 0
+            offer(anchor_letter, NAME_SCORE if agree else ANCHOR_SCORE)
+            for letter, score in said.items():
+                if letter != anchor_letter:
+                    offer(letter, min(score, ANCHOR_CONFLICT_SCORE))
+            return scores, i + 3
+        for letter, score in self._token_candidates(tok).items():
+            if tok in FILLERS and not cued:
+                score *= AMBIGUOUS_PENALTY
+            offer(letter, score)
+        return scores, i + 1
+
+    def recognize(self, text: str, expect: str | None = None, limit: int = 3) -> list[LetterCandidate]:
+        """
+        Candidatos para el caracter de la frase ("bee", "be de burro", "letra equis",
+        "número cuatro"). `expect` = "letter" o "digit" descarta el otro tipo.
+        """
+        content, cued = self._content(text)
+        # +2: el "de <ancla>" de la ultima palabra
+        content = content[:MAX_CONTENT_TOKENS + 2]
+        scores: dict[str, float] = {}
+        decay = 1.0
+        i = 0
+        while i < len(content):
+            char_scores, i = self._read_char(content, i, expect, cued)
+            for char, score in char_scores.items():
+                scores[char] = max(scores.get(char, 0.0), score * decay)
+            decay *= POSITION_DECAY
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [LetterCandidate(char, round(score, 3)) for char, score in ranked[:limit]]
+
+    def recognize_sequence(self, text: str, start: int = 0, length: int = PLATE_LENGTH) -> SpelledChunk:
+        """
+        Todos los caracteres que el usuario deletreo seguidos ("jota ka ele", "A B C one
+        two", "be de burro ce de casa"), a partir de la posicion `start` de la placa:
+        las primeras PLATE_LETTERS posiciones son letras y el resto digitos. La confianza
+        es la del caracter mas dudoso, y baja por cada palabra que no se pudo leer.
+        """
+        content, cued = self._content(text)
+        chars: list[str] = []
+        confidence = 1.0
+        i = 0
+        while i < len(content) and start + len(chars) < length:
+            expect = expected_kind(start + len(chars))
+            if expect == "digit" and content[i] in NUMBER_WORDS:
+                # "fourteen eighty", "mil doscientos": el numero completo, digito por digito
+                j = i
+                while j < len(content) and (content[j] in NUMBER_WORDS or content[j].isdigit()):
+                    j += 1
+                spoken = parse_spoken_number(" ".join(content[i:j]))
+                if spoken is not None:
+                    digits = spoken.digits[:length - start - len(chars)]
+                    chars.extend(digits)
+                    confidence = min(confidence, spoken.confidence)
+                    i = j
+                    continue
+            scores, i = self._read_char(content, i, expect, cued)
+            if not scores:
+                confidence *= UNKNOWN_TOKEN_PENALTY
+                continue
+            char, score = max(scores.items(), key=lambda kv: (kv[1], kv[0]))
+            chars.append(char)
+            confidence = min(confidence, score)
+        return SpelledChunk("".join(chars), round(confidence, 3) if chars else 0.0)
+
+    def _anchored(self, tokens: list[str], i: int) -> bool:
+        return i + 2 < len(tokens) and tokens[i + 1] in CONNECTORS and tokens[i + 2] in self.anchors
+
+
+letter_recognizer = LetterRecognizer(config.LETTER_MAP, config.LETTER_MAP_EN)
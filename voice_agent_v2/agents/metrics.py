@@ -0,0 +1,64 @@
+import logging
+from collections import defaultdict, deque
+
+logger = logging.getLogger("voice-metrics")
+
+# Registro en memoria por proceso del worker: contadores y muestras en ms.
+# Se vuelca al log al terminar cada llamada (ver main.py).
+MAX_SAMPLES = 2000
+
+_counters: dict[str, float] = defaultdict(float)
+_samples: dict[str, deque] = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+
+
+def incr(name: str, value: float = 1):
+    _counters[name] += value
+
+
+def observe(name: str, value_ms: float):
+    _samples[name].append(value_ms)
+
+
+def counter(name: str) -> float:
+    return _counters.get(name, 0)
+
+
+def percentile(name: str, pct: float) -> float | None:
+    """Percentil (rango mas cercano) de las muestras de `name`, o None si no hay."""
+    samples = _samples.get(name)
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def snapshot() -> dict:
+    data = {"counters": dict(_counters), "timings": {}}
+    for name, samples in _samples.items():
+        if samples:
+            data["timings"][name] = {
+                "count": len(samples),
+                "p50": percentile(name, 50),
+                "p95": percentile(name, 95),
+                "p99": percentile(name, 99),
+            }
+    return data
+
+
+def reset():
+    _counters.clear()
+    _samples.clear()
+
+
+def log_summary():
+    data = snapshot()
+    for name, value in sorted(data["counters"].items()):
+        logger.info("%s=%g", name, value)
+    for name, stats in sorted(data["timings"].items()):
+        # Las muestras son ms salvo las que no llevan _ms ("turns_per_call", "plate_chunk_chars")
+        unit = "ms" if "_ms" in name else ""
+        logger.info(
+            "%s n=%d p50=%.1f%s p95=%.1f%s p99=%.1f%s",
+            name, stats["count"], stats["p50"], unit, stats["p95"], unit, stats["p99"], unit
+        )
@@ -0,0 +1,356 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from unidecode import unidecode
+from .spoken_numbers import parse_spoken_number
+
+# Motor de normalizacion del texto del usuario, compilado una sola vez al importar.
+# No depende del resto de agents/ para que voice_agent_experiments pueda usarlo tal cual.
+
+# Diccionario para convertir números en texto a dígitos
+SPANISH_DIGITS = {
+    "cero": "0", "uno": "1", "dos": "2", "tres": "3", "cuatro": "4",
+    "cinco": "5", "seis": "6", "siete": "7", "ocho": "8", "nueve": "9",
+    "diez": "10", "once": "11", "doce": "12", "trece": "13", "catorce": "14",
+    "quince": "15", "dieciséis": "16", "diecisiete": "17", "dieciocho": "18",
+    "diecinueve": "19", "veinte": "20", "veintiuno": "21", "veintidós": "22",
+    "veintitrés": "23"
+}
+
+# Muletillas comunes en español mexicano, sin y con acentos. Se quitan todas (y se
+# colapsan los espacios) en una sola pasada de FILLERS_RE.
+FILLER_WORDS = [
+    "esteee", "umm+", "creo", "ehh+", "a ver", "bueno", "este", "ósea", "osea", "vale",
+]
+FILLERS_RE = re.compile(r"(?:\b(?:" + "|".join(FILLER_WORDS) + r")\b|\s)+")
+
+# Palabras numericas para leer horas: SPANISH_DIGITS sin acentos mas lo que falta
+# para minutos ("cuarenta y cinco") y el equivalente en ingles
+ETA_UNITS = {unidecode(word): int(digit) for word, digit in SPANISH_DIGITS.items()}
+ETA_UNITS.update({
+    "un": 1, "una": 1, "veinticuatro": 24, "veinticinco": 25, "veintiseis": 26,
+    "veintisiete": 27, "veintiocho": 28, "veintinueve": 29,
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19,
+    "mediodia": 12, "noon": 12, "midday": 12, "medianoche": 0, "midnight": 0,
+})
+ETA_TENS = {
+    "treinta": 30, "cuarenta": 40, "cincuenta": 50,
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+}
+ETA_AMPM_RE = re.compile(r"\b([ap])\.\s?m\b\.?")
+ETA_TOKEN_RE = re.compile(r"\d{1,2}:\d{2}|\d+|[a-z]+")
+# "en dos horas", "in an hour and a half", "en media hora", "in 45 minutes"; sin "en"/"in"
+# la cantidad es obligatoria ("1 hour", "dos horas y media" tambien son una duracion)
+ETA_RELATIVE_RE = re.compile(
+    r"\b(?P<lead>(?:en|in|dentro de|within)\s+)?"
+    r"(?:(?:unas?|about|around|como|approximately|aproximadamente|like)\s+)?"
+    r"(?P<amount>\d+|half an?|media|an?)?\s*"
+    r"(?P<unit>horas?|hours?|hrs?|minutos?|minutes?|mins?)\b"
+    r"(?:\s+(?:y|and)\s+(?P<extra>media|a half|\d+))?"
+)
+# "quarter past three", "ten to four"
+ETA_PAST_RE = re.compile(r"\b(?P<minute>quarter|half|\d{1,2})\s+(?:minutes\s+)?(?:past|after)\s+(?P<hour>\d{1,2})\b")
+ETA_TO_RE = re.compile(r"\b(?P<minute>quarter|\d{1,2})\s+(?:minutes\s+)?(?:to|till|til|before|of)\s+(?P<hour>\d{1,2})\b")
+# "tres y media", "cinco menos cuarto", "diez para las cinco"
+ETA_Y_RE = re.compile(r"\b(?P<hour>\d{1,2})\s+(?:y|con)\s+(?P<minute>media|cuarto|\d{1,2})\b")
+ETA_MENOS_RE = re.compile(r"\b(?P<hour>\d{1,2})\s+menos\s+(?P<minute>cuarto|\d{1,2})\b")
+ETA_PARA_RE = re.compile(r"\b(?P<minute>cuarto|\d{1,2})\s+(?:minutos\s+)?para\s+(?:las?\s+)?(?P<hour>\d{1,2})\b")
+# "diecisiete cuarenta y cinco" -> "17 45", "cero cero treinta" -> "0 0 30"
+# "en diez segundos", "dos dias": numeros que no son una hora
+# "a las diecisiete horas", "at 5 hours": la hora del reloj, no una duracion
+ETA_CLOCK_LEAD_RE = re.compile(r"\b(?:las?|at|son|by|around)\s*$")
+ETA_RUN_RE = re.compile(
+    r"\b\d{1,2}:\d{2}\b|\b\d+(?:\s+\d+)*\b"
+    r"(?!\s+(?:segundos?|seconds?|minutos?|minutes?|dias?|days?|semanas?|weeks?|km|millas|miles))"
+)
+# Despues de la secuencia: "8 oclock", "3 15 de la tarde", "9 pm"
+ETA_CLOCK_TRAIL_RE = re.compile(
+    r"\s*(?:oclock|o clock|am|pm|de la (?:tarde|noche|manana|madrugada)|in the (?:morning|afternoon|evening)"
+    r"|at night|tonight|this (?:morning|afternoon|evening))\b"
+)
+# Lo unico que puede acompanar a una secuencia sin "a las" ni "pm" ("its 1600"); con
+# cualquier otra palabra ("the tractor is 1555", "I have 2 trucks") no es una hora
+ETA_BARE_WORDS = {"es", "its", "it", "s", "is"}
+ETA_PM_RE = re.compile(
+    r"\b(pm|de la tarde|de la noche|por la tarde|por la noche|in the afternoon|"
+    r"in the evening|at night|tonight|this afternoon|this evening)\b"
+)
+ETA_AM_RE = re.compile(r"\b(am|de la manana|de la madrugada|por la manana|in the morning|this morning)\b")
+ETA_NIGHT_RE = re.compile(r"\b(de la noche|por la noche|at night|tonight)\b")
+ETA_MINUTE_WORDS = {"quarter": 15, "cuarto": 15, "half": 30, "media": 30}
+# "manana a las 8" es de otro dia: no se pasa a la tarde aunque las 8 ya hayan pasado
+ETA_TOMORROW_RE = re.compile(r"\btomorrow\b|(?<!la )\bmanana\b")
+# Por debajo del confirm_threshold de la ETA (ver fields): la hora se confirma siempre.
+# Una secuencia sin "a las"/"pm", una hora sin am/pm que se paso a la tarde y una de manana
+ETA_UNSURE_CONFIDENCE = 0.7
+
+
+@dataclass
+class SpokenEta:
+    eta: str
+    confidence: float
+
+
+def _eta_normalize(raw: str) -> str:
+    """Texto en minusculas, sin acentos ni muletillas y con los numeros en digitos."""
+    text = unidecode(raw).lower()
+    text = ETA_AMPM_RE.sub(r"\1m", text)
+    text = FILLERS_RE.sub(" ", text.replace("'", ""))
+    tokens = ETA_TOKEN_RE.findall(text)
+    out: list[str] = []
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+        if tok in ETA_TENS:
+            value = ETA_TENS[tok]
+            # "cuarenta y cinco", "forty five"
+            if nxt in ("y", "and") and 1 <= ETA_UNITS.get(tokens[i + 2] if i + 2 < len(tokens) else "", 0) <= 9:
+                value += ETA_UNITS[tokens[i + 2]]
+                i += 2
+            elif 1 <= ETA_UNITS.get(nxt, 0) <= 9:
+                value += ETA_UNITS[nxt]
+                i += 1
+            out.append(str(value))
+        elif tok in ETA_UNITS:
+            out.append(str(ETA_UNITS[tok]))
+        elif tok == "oh" and out and out[-1].isdigit() and (nxt.isdigit() or nxt in ETA_UNITS):
+            # "nine oh five"
+            out.append("0")
+        elif tok in ("hundred", "cien") and out and out[-1].isdigit():
+            # "fifteen hundred"
+            out.append("00")
+        else:
+            out.append(tok)
+        i += 1
+    return " ".join(out)
+
+
+def _eta_run_to_clock(run: str) -> tuple[int, int] | None:
+    """Lee una secuencia de numeros como hora: "17 45", "0 0 30", "1600", "9 0 5", "3"."""
+    if ":" in run:
+        hour, minute = run.split(":")
+        return int(hour), int(minute)
+    parts = run.split()
+    if len(parts) == 2:
+        return int(parts[0]), int(parts[1])
+    digits = "".join(parts)
+    if len(parts) == 1 and len(digits) <= 2:
+        return int(digits), 0
+    if len(digits) not in (3, 4):
+        return None
+    return int(digits[:-2]), int(digits[-2:])
+
+
+def _eta_minute(word: str) -> int:
+    return ETA_MINUTE_WORDS[word] if word in ETA_MINUTE_WORDS else int(word)
+
+
+def _eta_to_24h(hour: int, minute: int, text: str, now: datetime, confidence: float = 1.0) -> SpokenEta | None:
+    """Aplica "de la tarde"/"am"/"pm"; sin indicacion se toma la siguiente ocurrencia despues de now."""
+    if hour == 24:
+        hour = 0
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    if ETA_PM_RE.search(text):
+        if hour == 12 and ETA_NIGHT_RE.search(text):
+            hour = 0
+        elif hour < 12 and not (hour < 5 and ETA_NIGHT_RE.search(text)):
+            hour += 12
+    elif ETA_AM_RE.search(text):
+        if hour == 12:
+            hour = 0
+    elif ETA_TOMORROW_RE.search(text):
+        confidence = min(confidence, ETA_UNSURE_CONFIDENCE)
+    elif 1 <= hour <= 11 and (hour, minute) < (now.hour, now.minute):
+        # "a las tres" dicho a las 10:00 es a las 15:00
+        hour += 12
+        confidence = min(confidence, ETA_UNSURE_CONFIDENCE)
+    return SpokenEta(f"{hour:02d}:{minute:02d}", confidence)
+
+
+def _eta_run_confidence(text: str, m: re.Match) -> float | None:
+    """Confianza de una secuencia de numeros como hora, o None si en esa frase no es una hora."""
+    if ":" in m.group() or ETA_CLOCK_LEAD_RE.search(text[:m.start()]) or ETA_CLOCK_TRAIL_RE.match(text, m.end()):
+        return 1.0
+    if all(word in ETA_BARE_WORDS for word in (text[:m.start()] + text[m.end():]).split()):
+        return ETA_UNSURE_CONFIDENCE
+    return None
+
+
+def parse_spoken_eta(raw: str, now: datetime | None = None) -> SpokenEta | None:
+    """
+    Lee una hora estimada de llegada hablada en espanol o ingles en HH:MM de 24 horas,
+    con una confianza; None si la frase no trae una hora reconocible.
+    """
+    now = now or datetime.now()
+    text = _eta_normalize(raw)
+
+    m = ETA_RELATIVE_RE.search(text)
+    if m and m.group("lead") is None and (
+            m.group("amount") is None or ETA_CLOCK_LEAD_RE.search(text[:m.start()])):
+        m = None
+    if m:
+        amount, unit, extra = m.group("amount"), m.group("unit"), m.group("extra")
+        if amount is None or amount in ("a", "an"):
+            value = 1.0
+        elif amount.isdigit():
+            value = float(amount)
+        else:
+            value = 0.5
+        minutes = value * 60 if unit.startswith(("h", "hr")) else value
+        if extra and unit.startswith("h"):
+            minutes += 30 if not extra.isdigit() else int(extra)
+        return SpokenEta((now + timedelta(minutes=minutes)).strftime("%H:%M"), 1.0)
+
+    m = ETA_PAST_RE.search(text)
+    if m:
+        return _eta_to_24h(int(m.group("hour")), _eta_minute(m.group("minute")), text, now)
+    m = ETA_TO_RE.search(text) or ETA_MENOS_RE.search(text) or ETA_PARA_RE.search(text)
+    if m:
+        minute = _eta_minute(m.group("minute"))
+        if not 0 < minute < 60:
+            return None
+        return _eta_to_24h((int(m.group("hour")) - 1) % 24, 60 - minute, text, now)
+    m = ETA_Y_RE.search(text)
+    if m:
+        return _eta_to_24h(int(m.group("hour")), _eta_minute(m.group("minute")), text, now)
+
+    for m in ETA_RUN_RE.finditer(text):
+        confidence = _eta_run_confidence(text, m)
+        clock = _eta_run_to_clock(m.group()) if confidence is not None else None
+        if clock is not None:
+            eta = _eta_to_24h(*clock, text, now, confidence)
+            if eta is not None:
+                return eta
+    return None
+
+
+def parse_eta(raw: str, now: datetime | None = None) -> str | None:
+    """La hora de parse_spoken_eta en HH:MM, sin la confianza."""
+    spoken = parse_spoken_eta(raw, now)
+    return spoken.eta if spoken is not None else None
+
+
+class FieldNormalizer:
+    """Normalizador de un campo. Recibe el texto ya en minusculas y sin muletillas."""
+
+    def __call__(self, text: str) -> str:
+        return text
+
+
+class NameNormalizer(FieldNormalizer):
+    INTRO_RE = re.compile(r"(?:mi nombre es|me llamo|soy|el nombre del operador es|el nombre es)\s+(.+)")
+
+    def __call__(self, text: str) -> str:
+        m = self.INTRO_RE.search(text)
+        name = m.group(1).strip() if m else text
+        return " ".join(p.capitalize() for p in name.split())
+
+
+class NumberNormalizer(FieldNormalizer):
+    DIGIT_RE = re.compile(r"\d")
+
+    def __call__(self, text: str) -> str:
+        # Digitos directos
+        digits = self.DIGIT_RE.findall(text)
+        if digits:
+            return "".join(digits)
+        # Numeros en texto: "mil quinientos cincuenta y cinco", "fifteen fifty-five", "uno cinco"
+        spoken = parse_spoken_number(text)
+        if spoken is not None:
+            return spoken.digits
+        return text
+
+
+class PlateNormalizer(FieldNormalizer):
+    """
+    "las placas son a b c guion uno dos tres cuatro" -> "ABC-1234" en una sola
+    pasada: cada alternativa del patron sabe con que se reemplaza.
+    """
+
+    PLATE_RE = re.compile(
+        r"(?P<dash>\s*(?:\bguion\b|\bguión\b|-)\s*)"
+        r"|(?P<intro>\b(?:las placas son|placas|son)\b)"
+        r"|\b(?P<digit>" + "|".join(sorted(SPANISH_DIGITS, key=len, reverse=True)) + r")\b"
+        r"|(?P<space>\s+)"
+    )
+
+    @staticmethod
+    def _replace(m: re.Match) -> str:
+        if m.group("dash") is not None:
+            return "-"
+        if m.group("digit") is not None:
+            return SPANISH_DIGITS[m.group("digit")]
+        return ""
+
+    def __call__(self, text: str) -> str:
+        return self.PLATE_RE.sub(self._replace, text).upper()
+
+
+class EtaNormalizer(FieldNormalizer):
+    """parse_eta; si no reconoce una hora, la conversion palabra a palabra de siempre."""
+
+    LEGACY_RE = re.compile(
+        r"\b(?:a las|alrededor de|como a las|horas|de la tarde|de la mañana|son las)\b"
+        r"|\b(?P<digit>" + "|".join(sorted(SPANISH_DIGITS, key=len, reverse=True)) + r")\b"
+        r"|\b(?P<colon>y|con)\b"
+    )
+    COLON_RE = re.compile(r"\s*:\s*")
+
+    @staticmethod
+    def _replace(m: re.Match) -> str:
+        if m.group("digit") is not None:
+            return SPANISH_DIGITS[m.group("digit")]
+        if m.group("colon") is not None:
+            # Para "catorce y treinta"
+            return ":"
+        return ""
+
+    def __call__(self, text: str) -> str:
+        eta = parse_eta(text)
+        if eta is not None:
+            return eta
+        text = " ".join(self.LEGACY_RE.sub(self._replace, text).split())
+        return self.COLON_RE.sub(":", text)
+
+
+class TextNormalizer:
+    """
+    Motor de normalizacion: una pasada para muletillas y espacios y despues el
+    normalizador precompilado del campo. Los campos sin normalizador propio se
+    devuelven solo limpios.
+    """
+
+    def __init__(self, fields: dict[str, FieldNormalizer]):
+        self.fields = fields
+        self._default = FieldNormalizer()
+
+    def strip_fillers(self, raw: str) -> str:
+        return FILLERS_RE.sub(" ", raw.lower()).strip()
+
+    def clean(self, raw: str, field: str) -> str:
+        return self.fields.get(field, self._default)(self.strip_fillers(raw))
+
+
+_number = NumberNormalizer()
+_plate = PlateNormalizer()
+
+normalizer = TextNormalizer({
+    "nombre_operador": NameNormalizer(),
+    "numero_tractor": _number,
+    "numero_trailer": _number,
+    "placas_tractor": _plate,
+    "placas_trailer": _plate,
+    "eta": EtaNormalizer(),
+})
+
+
+def clean_user_text(raw: str, current_field: str) -> str:
+    """
+    Limpia el texto del usuario según el campo actual.
+    """
+    return normalizer.clean(raw, current_field)
@@ -0,0 +1,225 @@
+import re
+from dataclasses import dataclass
+from unidecode import unidecode
+from . import config
+from .spoken_numbers import parse_spoken_number
+
+# Palabras que no aportan nada a la placa
+FILLERS = {
+    "las", "los", "la", "el", "placas", "placa", "plates", "plate", "son", "es", "are", "is", "the",
+    "del", "de", "tractor", "trailer", "numero", "numeros", "number", "numbers", "minuscula",
+    "mayuscula", "lowercase", "uppercase", "capital", "y", "and", "then", "luego", "mi", "my",
+    "umm", "um", "eh", "ehh", "este", "esteee", "creo", "que", "bueno", "like",
+    "sus", "su", "their", "its", "ok", "okay",
+}
+# Palabras que obligan a leer el siguiente token como letra ("letra de" -> D)
+LETTER_CUES = {"letra", "letter"}
+# Conectores de "A de Aguila" / "A for Apple" / "A as in Apple" / "A como Aguila"
+CONNECTORS = {"de", "for", "como", "as", "in"}
+SEPARATORS = {"-", "guion", "dash", "hyphen", "menos"}
+
+SPOKEN_DIGITS = {
+    "cero": "0", "uno": "1", "una": "1", "dos": "2", "tres": "3", "cuatro": "4",
+    "cinco": "5", "seis": "6", "siete": "7", "ocho": "8", "nueve": "9",
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4",
+    "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9",
+}
+# Solo se leen como digito cuando ya estamos en la parte numerica
+DIGIT_HOMOPHONES = {"oh": "0", "o": "0", "for": "4", "to": "2", "too": "2", "won": "1"}
+NUMBER_WORDS_ES = {
+    "diez", "once", "doce", "trece", "catorce", "quince", "dieciseis", "diecisiete", "dieciocho",
+    "diecinueve", "veinte", "veintiuno", "veintidos", "veintitres", "veinticuatro", "veinticinco",
+    "veintiseis", "veintisiete", "veintiocho", "veintinueve", "treinta", "cuarenta", "cincuenta",
+    "sesenta", "setenta", "ochenta", "noventa", "cien", "ciento", "doscientos", "trescientos",
+    "cuatrocientos", "quinientos", "seiscientos", "setecientos", "ochocientos", "novecientos", "mil",
+}
+NUMBER_WORDS_EN = {
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen",
+    "nineteen", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety",
+    "hundred", "thousand",
+}
+# Nombres de letra que tambien son palabras comunes: se aceptan, pero con menos confianza
+AMBIGUOUS_LETTER_NAMES = {
+    "a", "e", "o", "y", "i", "de", "te", "se", "ve", "be", "en", "em", "ar", "ex",
+    "you", "see", "why", "eye", "oh", "at", "ay", "ee",
+}
+
+# En espanol mexicano "be" y "ve" se confunden; el ancla ("de vaca") es la que decide
+BV_NAMES = {"b", "v", "be", "ve", "uve"}
+
+TOKEN_RE = re.compile(r"[a-z]+|\d+|-")
+PLATE_RE = re.compile(r"^[A-Z]{2,3}-[0-9]{3,4}$")
+# Placa ya escrita por el STT: "abc 1234" como frase completa o "abc-1234" dentro de la frase
+WRITTEN_PLATE_RE = re.compile(r"^([a-z]{2,3})\s*-?\s*([0-9]{3,4})$|\b([a-z]{2,3})-([0-9]{3,4})\b")
+
+# Por debajo de esta confianza la frase se manda al LLM
+CONFIDENCE_THRESHOLD = 0.75
+
+# Penalizaciones multiplicativas sobre la confianza
+AMBIGUOUS_PENALTY = 0.85
+ANCHOR_CONFLICT_PENALTY = 0.7
+BV_CONFLICT_PENALTY = 0.95
+LOOSE_ANCHOR_PENALTY = 0.9
+GLUED_LETTERS_PENALTY = 0.6
+GLUED_CONSONANTS_PENALTY = 0.8
+WRITTEN_PLATE_CONFIDENCE = 0.95
+COMPOUND_NUMBER_PENALTY = 0.9
+UNKNOWN_TOKEN_PENALTY = 0.7
+
+
+@dataclass
+class PlateCandidate:
+    plate: str
+    confidence: float
+
+
+def _fold(text: str) -> str:
+    return unidecode(text).lower()
+
+
+class SpelledPlateParser:
+    """
+    Parser de estados finitos para placas deletreadas, construido una vez a partir
+    de LETTER_MAP y LETTER_MAP_EN. Recorre los tokens en dos estados (letras y
+    numeros) y cada lectura dudosa baja la confianza, para que solo las frases
+    realmente ambiguas lleguen al LLM.
+    """
+
+    LETTERS, DIGITS = "letters", "digits"
+
+    def __init__(self, *letter_maps: dict[str, tuple[str, str]]):
+        self.letter_names: dict[str, str] = {}
+        self.anchors: dict[str, str] = {}
+        for letter_map in letter_maps:
+            for name, (letter, anchor) in letter_map.items():
+                if len(letter) != 1 or not letter.isalpha():
+                    continue
+                self.letter_names.setdefault(_fold(name), letter)
+                self.anchors[_fold(anchor).replace("-", "")] = letter
+
+    def _prepare(self, text: str) -> list[str]:
+        text = _fold(text)
+        text = re.sub(r"\b(doble u|double u|doble v)\b", " w ", text)
+        text = re.sub(r"\bi griega\b", " y ", text)
+        text = text.replace("x-ray", "xray")
+        return TOKEN_RE.findall(text)
+
+    def _number_span(self, tokens: list[str], i: int) -> tuple[str | None, int, float]:
+        """Lee una secuencia de palabras numericas desde i; devuelve (digitos, siguiente i, penalizacion)."""
+        j = i
+        words = []
+        while j < len(tokens):
+            tok = tokens[j]
+            if tok in SPOKEN_DIGITS or tok in NUMBER_WORDS_ES or tok in NUMBER_WORDS_EN:
+                words.append(tok)
+            elif tok in ("y", "and") and words and j + 1 < len(tokens) and (
+                    tokens[j + 1] in SPOKEN_DIGITS or tokens[j + 1] in NUMBER_WORDS_ES):
+                words.append(tok)
+            else:
+                break
+            j += 1
+        if all(w in SPOKEN_DIGITS for w in words):
+            return "".join(SPOKEN_DIGITS[w] for w in words), j, 1.0
+        # "catorce ochenta" -> "1480": cada grupo se lee por separado y se concatena
+        spoken = parse_spoken_number(" ".join(words))
+        if spoken is None:
+            return None, j, UNKNOWN_TOKEN_PENALTY
+        return spoken.digits, j, COMPOUND_NUMBER_PENALTY * spoken.confidence
+
+    def _anchor_after(self, tokens: list[str], i: int, letter: str, name: str = "") -> tuple[str, int, float]:
+        """Revisa si despues de la letra viene "de/for <ancla>" y resuelve la letra final."""
+        j = i
+        while j < len(tokens) and tokens[j] in CONNECTORS:
+            j += 1
+        if j == i or j >= len(tokens):
+            return letter, i, 1.0
+        word = tokens[j]
+        anchor = self.anchors.get(word)
+        if anchor is not None:
+            if anchor == letter:
+                return anchor, j + 1, 1.0
+            return anchor, j + 1, BV_CONFLICT_PENALTY if name in BV_NAMES else ANCHOR_CONFLICT_PENALTY
+        if word[0].upper() == letter:
+            # "Zeta de zapato": ancla fuera del mapa pero con la misma inicial
+            return letter, j + 1, LOOSE_ANCHOR_PENALTY
+        return letter, i, 1.0
+
+    def parse(self, text: str) -> PlateCandidate | None:
+        written = WRITTEN_PLATE_RE.search(_fold(text).strip(" .,"))
+        if written:
+            letters, digits = written.group(1) or written.group(3), written.group(2) or written.group(4)
+            return PlateCandidate(f"{letters.upper()}-{digits}", WRITTEN_PLATE_CONFIDENCE)
+        tokens = self._prepare(text)
+        state = self.LETTERS
+        letters: list[str] = []
+        digits: list[str] = []
+        confidence = 1.0
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok in SEPARATORS:
+                # "D-E-F": el guion separa letras, no marca el inicio de los numeros
+                nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+                if not (len(nxt) == 1 and nxt in self.letter_names):
+                    state = self.DIGITS
+                i += 1
+                continue
+            if tok.isdigit():
+                digits.append(tok)
+                state = self.DIGITS
+                i += 1
+                continue
+            if tok in LETTER_CUES and i + 1 < len(tokens) and tokens[i + 1] in self.letter_names:
+                letter = self.letter_names[tokens[i + 1]]
+                letter, i, penalty = self._anchor_after(tokens, i + 2, letter, tokens[i + 1])
+                letters.append(letter)
+                confidence *= penalty
+                continue
+            if state == self.DIGITS and tok in DIGIT_HOMOPHONES and tok not in self.letter_names:
+                digits.append(DIGIT_HOMOPHONES[tok])
+                confidence *= AMBIGUOUS_PENALTY
+                i += 1
+                continue
+            if tok in SPOKEN_DIGITS or tok in NUMBER_WORDS_ES or tok in NUMBER_WORDS_EN:
+                value, i, penalty = self._number_span(tokens, i)
+                if value is not None:
+                    digits.append(value)
+                    state = self.DIGITS
+                confidence *= penalty
+                continue
+            if tok in self.letter_names and (tok not in FILLERS or self._anchor_after(tokens, i + 1, "")[1] != i + 1):
+                letter = self.letter_names[tok]
+                letter, nxt, penalty = self._anchor_after(tokens, i + 1, letter, tok)
+                if nxt == i + 1 and tok in AMBIGUOUS_LETTER_NAMES:
+                    penalty *= AMBIGUOUS_PENALTY
+                if state == self.DIGITS:
+                    penalty *= UNKNOWN_TOKEN_PENALTY
+                letters.append(letter)
+                confidence *= penalty
+                i = nxt
+                continue
+            if tok in self.anchors:
+                letters.append(self.anchors[tok])
+                confidence *= LOOSE_ANCHOR_PENALTY
+                i += 1
+                continue
+            if tok in FILLERS or tok in LETTER_CUES:
+                i += 1
+                continue
+            if state == self.LETTERS and not letters and 2 <= len(tok) <= 3:
+                # "zac", "mna": letras pegadas en una sola palabra
+                letters.extend(tok.upper())
+                has_vowel = any(c in "aeiou" for c in tok)
+                confidence *= GLUED_LETTERS_PENALTY if has_vowel else GLUED_CONSONANTS_PENALTY
+                i += 1
+                continue
+            confidence *= UNKNOWN_TOKEN_PENALTY
+            i += 1
+
+        plate = f"{''.join(letters)}-{''.join(digits)}"
+        if not PLATE_RE.match(plate):
+            return None
+        return PlateCandidate(plate, round(confidence, 3))
+
+
+plate_parser = SpelledPlateParser(config.LETTER_MAP, config.LETTER_MAP_EN)
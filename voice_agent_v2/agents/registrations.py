@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from . import metrics
+
+logger = logging.getLogger("registrations")
+
+# Registros anteriores por telefono: cada registro terminado lo escribe el servidor MCP
+# (services/server.py -> services/records.py) en recolect_data/driver_data_*.json con el
+# telefono de la llamada. El indice se carga al arrancar el worker y despues solo lee los
+# archivos nuevos; si el transportista ya se registro, VoiceAgent pregunta "lo mismo que
+# la vez pasada?" en vez de pedir todo otra vez.
+
+# El mismo directorio que services/records.py
+RECORDS_DIR = os.getenv("DRIVER_RECORDS_DIR", "recolect_data")
+RECORD_PREFIX = "driver_data_"
+PHONE_RE = re.compile(r"^\+[1-9][0-9]{7,14}$")
+
+
+def normalize_phone(raw: str | None) -> str | None:
+    """"+1 (555) 012-3456" -> "+15550123456"; None si no es E.164."""
+    if not raw or not isinstance(raw, str):
+        return None
+    phone = re.sub(r"[\s().-]", "", raw)
+    return phone if PHONE_RE.match(phone) else None
+
+
+@dataclass(frozen=True)
+class PriorRegistration:
+    phone_number: str
+    # Atributo de DriverData -> valor guardado
+    values: dict[str, str]
+    # mtime del archivo: gana el registro mas reciente del telefono
+    saved_at: float
+
+
+class RegistrationIndex:
+    """
+    Telefono E.164 -> registro mas reciente. `refresh` recorre el directorio pero solo
+    abre los archivos que no habia leido (o que cambiaron); los registros sin telefono
+    (anteriores a que se guardara) se ignoran.
+    """
+
+    def __init__(self, directory: str = RECORDS_DIR):
+        self.directory = directory
+        self._by_phone: dict[str, PriorRegistration] = {}
+        # Archivo -> mtime con el que ya se leyo
+        self._seen: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_phone)
+
+    def refresh(self) -> int:
+        """Lee los registros nuevos del directorio; devuelve cuantos archivos se leyeron."""
+        start = time.perf_counter()
+        read = 0
+        with self._lock:
+            try:
+                entries = list(os.scandir(self.directory))
+            except FileNotFoundError:
+                return 0
+            for entry in entries:
+                if not (entry.name.startswith(RECORD_PREFIX) and entry.name.endswith(".json")):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                    if self._seen.get(entry.name) == mtime:
+                        continue
+                    with open(entry.path, encoding="utf-8") as f:
+                        record = json.load(f)
+                except (OSError, ValueError) as e:
+                    # Un archivo a medio escribir se vuelve a intentar en el siguiente refresh
+                    logger.warning("No se pudo leer %s: %s", entry.name, e)
+                    continue
+                self._seen[entry.name] = mtime
+                read += 1
+                if isinstance(record, dict):
+                    self._add(record, mtime)
+        metrics.observe("registration_index_refresh_ms", (time.perf_counter() - start) * 1000)
+        if read:
+            logger.info("Indice de registros: %d archivos nuevos, %d telefonos", read, len(self._by_phone))
+        return read
+
+    def _add(self, record: dict, saved_at: float):
+        phone = normalize_phone(record.get("phone_number"))
+        if phone is None:
+            return
+        current = self._by_phone.get(phone)
+        if current is not None and current.saved_at > saved_at:
+            return
+        values = {k: v for k, v in record.items() if k != "phone_number" and isinstance(v, str) and v}
+        self._by_phone[phone] = PriorRegistration(phone_number=phone, values=values, saved_at=saved_at)
+
+    def record(self, phone_number: str | None, values: dict[str, str]):
+        """Registro recien guardado en este proceso: disponible sin esperar al refresh."""
+        with self._lock:
+            self._add({**values, "phone_number": phone_number}, time.time())
+
+    def lookup(self, phone_number: str | None) -> PriorRegistration | None:
+        phone = normalize_phone(phone_number)
+        registration = self._by_phone.get(phone) if phone else None
+        metrics.incr("prior_registration_hits" if registration else "prior_registration_misses")
+        return registration
+
+
+registration_index = RegistrationIndex()
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from . import metrics
+
+logger = logging.getLogger("response-cache")
+
+
+@dataclass
+class _Entry:
+    created_at: float
+    variants: list[str] = field(default_factory=list)
+
+
+class TemplateResponseCache:
+    """
+    Cache LRU con TTL para las respuestas de ASI1 que solo reformulan una plantilla
+    (ASK/CONFIRM/REPEAT/OFF_TOPIC). La llave es (plantilla, parametros, temperatura,
+    modelo) y cada llave guarda hasta `variants` respuestas distintas; en un acierto
+    se elige una al azar para que Daisy no suene siempre igual, y mientras el pool
+    no este lleno se genera otra variante en segundo plano.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600, variants: int = 3):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variants = variants
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._refilling: set[tuple] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def key(template: str, params: dict, temperature: float, model: str) -> tuple:
+        return (template, tuple(sorted(params.items())), temperature, model)
+
+    def lookup(self, key: tuple) -> str | None:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.created_at > self.ttl:
+            del self._entries[key]
+            entry = None
+        if entry is None or not entry.variants:
+            metrics.incr("response_cache_misses")
+            return None
+        self._entries.move_to_end(key)
+        metrics.incr("response_cache_hits")
+        # Lo que se ahorra es una generacion completa de ASI1
+        saved = metrics.percentile("asi1_completion_ms", 50)
+        if saved is not None:
+            metrics.incr("response_cache_saved_ms", saved)
+        return random.choice(entry.variants)
+
+    def peek(self, key: tuple) -> str | None:
+        """Como lookup pero sin contar acierto/fallo ni mover la llave en el LRU."""
+        entry = self._entries.get(key)
+        if entry is None or not entry.variants or time.monotonic() - entry.created_at > self.ttl:
+            return None
+        return random.choice(entry.variants)
+
+    def store(self, key: tuple, text: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(created_at=time.monotonic())
+        self._entries.move_to_end(key)
+        if text not in entry.variants and len(entry.variants) < self.variants:
+            entry.variants.append(text)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refill(self, key: tuple, generate: Callable[[], Awaitable[str | None]]):
+        """Agrega una variante nueva en segundo plano si el pool de la llave no esta lleno."""
+        entry = self._entries.get(key)
+        if entry is None or len(entry.variants) >= self.variants or key in self._refilling:
+            return
+
+        async def _refill():
+            try:
+                text = await generate()
+                if text:
+                    self.store(key, text)
+            finally:
+                self._refilling.discard(key)
+
+        self._refilling.add(key)
+        task = asyncio.create_task(_refill())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def hit_rate(self) -> float:
+        hits = metrics.counter("response_cache_hits")
+        total = hits + metrics.counter("response_cache_misses")
+        return hits / total if total else 0.0
+
+
+# Un cache por proceso del worker: las plantillas son las mismas en todas las llamadas
+response_cache = TemplateResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+    variants=int(os.getenv("RESPONSE_CACHE_VARIANTS", "3")),
+)
@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable
+from models.driver_model import DataField
+from . import kinds
+from .fields import FIELD_SPECS
+from .intents import IntentMatcher
+
+# Varios campos en una sola respuesta: "tractor 1555, plates JKL 4321, arriving at nine
+# fifteen". Las frases de FieldSpec.cues parten la frase en trozos y cada trozo pasa por
+# el extractor local de su campo (FieldSpec.extract). Lo dicho antes de la primera frase
+# es la respuesta al campo que se pregunto. Las mismas frases dicen que campos del
+# resumen final estan mal ("the trailer number is wrong").
+
+PLATES = "PLATES"  # "placas" sin decir de que vehiculo
+PLATE_CUES = ("plates", "plate", "license plate", "placas", "placa")
+# Las "placas" sueltas son del ultimo vehiculo mencionado
+VEHICLE_PLATES = {
+    DataField.TRACTOR_NUMBER: DataField.TRACTOR_PLATES,
+    DataField.TRACTOR_PLATES: DataField.TRACTOR_PLATES,
+    DataField.TRAILER_NUMBER: DataField.TRAILER_PLATES,
+    DataField.TRAILER_PLATES: DataField.TRAILER_PLATES,
+}
+# Palabras de enlace alrededor del valor ("tractor is 1555 and", "placas son JKL 1234")
+EDGE_WORDS = {
+    "is", "are", "its", "it", "s", "es", "son", "my", "mi", "the", "el", "la", "los", "las", "number", "numero",
+    "de", "del", "and", "y", "also", "tambien", "um", "eh", "este", "pues", "then", "luego", "with", "con",
+    "now", "ahora", "new", "nuevo", "nueva", "changed", "cambio",
+}
+MIN_SLOT_CONFIDENCE = 0.85
+# Texto libre sin extractor (el nombre): se toma lo dicho, pero no es una lectura segura
+FREE_TEXT_CONFIDENCE = 0.9
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class Slot:
+    value: str
+    confidence: float
+
+
+def trim_edges(span: str) -> str:
+    """Quita las palabras de enlace y la puntuacion de las orillas del trozo."""
+    words = list(WORD_RE.finditer(span))
+    while words and words[0].group().lower() in EDGE_WORDS:
+        words.pop(0)
+    while words and words[-1].group().lower() in EDGE_WORDS:
+        words.pop()
+    return span[words[0].start():words[-1].end()] if words else ""
+
+
+class SlotFiller:
+    def __init__(self):
+        phrases: dict[str, set[str]] = {PLATES: set(PLATE_CUES)}
+        for field, spec in FIELD_SPECS.items():
+            if spec.cues:
+                phrases[field.name] = set(spec.cues)
+        self.matcher = IntentMatcher(phrases)
+
+    def _cues(self, text: str) -> list:
+        matches = sorted(self.matcher.match(text), key=lambda m: (m.start, -(m.end - m.start)))
+        cues = []
+        for m in matches:
+            # "tractor plates" contiene "tractor" y "plates": gana la frase mas larga
+            if cues and m.start < cues[-1].end:
+                continue
+            cues.append(m)
+        return cues
+
+    def fill(self, text: str, missing: Iterable[DataField], current: DataField | None = None) -> dict[DataField, Slot]:
+        """
+        Campos de `missing` que la frase trae con confianza alta. Si la frase no anuncia
+        ningun campo devuelve {}: es la respuesta normal al campo `current`.
+        """
+        missing = list(missing)
+        cues = self._cues(text)
+        if not cues:
+            return {}
+        found: dict[DataField, Slot] = {}
+
+        def offer(field: DataField | None, span: str) -> bool:
+            if field not in missing:
+                return False
+            spec = FIELD_SPECS[field]
+            span = trim_edges(span)
+            if not span:
+                return False
+            if spec.extract is not None:
+                extracted = spec.extract(span)
+            else:
+                # Texto libre (el nombre): se toma lo que quedo sin la frase que lo anuncia
+                extracted = (
+                    (span, FREE_TEXT_CONFIDENCE) if spec.kind == kinds.TEXT and any(c.isalpha() for c in span)
+                    else None
+                )
+            if extracted is None or extracted[1] < MIN_SLOT_CONFIDENCE:
+                return False
+            if field not in found or extracted[1] > found[field].confidence:
+                found[field] = Slot(*extracted)
+            return True
+
+        offer(current, text[:cues[0].start])
+        vehicle = current if current in VEHICLE_PLATES else None
+        for cue, following in zip(cues, cues[1:] + [None]):
+            span = text[cue.end:following.start if following else len(text)]
+            if cue.intent == PLATES:
+                field = VEHICLE_PLATES.get(vehicle) or next((f for f in missing if f in VEHICLE_PLATES.values()), None)
+                offer(field, span)
+                continue
+            field = DataField[cue.intent]
+            if field in VEHICLE_PLATES:
+                vehicle = field
+            # "tractor JKL 4321": el vehiculo seguido de una placa en vez de su numero
+            if not offer(field, span) and field in (DataField.TRACTOR_NUMBER, DataField.TRAILER_NUMBER):
+                offer(VEHICLE_PLATES[field], span)
+        return found
+
+    def mentioned(self, text: str, among: Iterable[DataField]) -> list[DataField]:
+        """Campos de `among` que la frase nombra; "las placas" sin vehiculo son las dos."""
+        among = list(among)
+        named = set()
+        for cue in self._cues(text):
+            if cue.intent == PLATES:
+                named.update(f for f in among if f in VEHICLE_PLATES.values())
+            else:
+                named.add(DataField[cue.intent])
+        return [field for field in among if field in named]
+
+    def unread(
+            self,
+            text: str,
+            missing: Iterable[DataField],
+            found: dict[DataField, Slot],
+            current: DataField | None = None
+        ) -> list[DataField]:
+        """
+        Campos de `missing` que la frase anuncia pero que `fill` no pudo leer (se piden a
+        ASI1). Las "placas" sueltas ya cuentan como leidas si se lleno alguna placa.
+        """
+        missing = list(missing)
+        plates_read = any(field in VEHICLE_PLATES.values() for field in found)
+        named = set()
+        for cue in self._cues(text):
+            if cue.intent != PLATES:
+                named.add(DataField[cue.intent])
+            elif not plates_read:
+                named.update(f for f in missing if f in VEHICLE_PLATES.values())
+        return [field for field in missing if field in named and field not in found and field != current]
+
+
+slot_filler = SlotFiller()
+
+
+def fill_slots(text: str, missing: Iterable[DataField], current: DataField | None = None) -> dict[DataField, Slot]:
+    return slot_filler.fill(text, missing, current)
+
+
+def unread_slots(
+        text: str,
+        missing: Iterable[DataField],
+        found: dict[DataField, Slot],
+        current: DataField | None = None
+    ) -> list[DataField]:
+    return slot_filler.unread(text, missing, found, current)
+
+
+def mentioned_fields(text: str, among: Iterable[DataField]) -> list[DataField]:
+    return slot_filler.mentioned(text, among)
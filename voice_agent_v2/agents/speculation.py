@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+from livekit import rtc
+from livekit.agents import tts as agents_tts
+from . import metrics
+
+logger = logging.getLogger("speculation")
+
+
+@dataclass
+class SpeculativeResult:
+    text: str
+    frames: list[rtc.AudioFrame] = field(default_factory=list)
+
+    async def audio(self) -> AsyncIterator[rtc.AudioFrame]:
+        for frame in self.frames:
+            yield frame
+
+
+class SpeculativePrompt:
+    """
+    Prepara el siguiente prompt mientras el usuario escucha la confirmacion: el
+    texto (y opcionalmente el audio) del ASK del siguiente campo. Si el usuario
+    confirma, `take` lo entrega ya listo o a medio hacer; si corrige, `discard`
+    cancela el trabajo. Solo hay una especulacion activa por agente.
+    """
+
+    def __init__(self, synthesize_audio: bool = True):
+        self.synthesize_audio = synthesize_audio
+        self._key: tuple | None = None
+        self._task: asyncio.Task | None = None
+        self._started_at = 0.0
+        self._finished_at: float | None = None
+
+    def start(
+            self,
+            key: tuple,
+            generate: Callable[[], Awaitable[str | None]],
+            tts: agents_tts.TTS | None = None
+        ):
+        """Empieza a preparar el prompt de `key`, descartando cualquier especulacion anterior."""
+        if self._key == key and self._task is not None:
+            return
+        self.discard()
+        self._key = key
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+        self._task = asyncio.create_task(self._run(generate, tts if self.synthesize_audio else None))
+        metrics.incr("speculation_started")
+
+    async def _run(
+            self,
+            generate: Callable[[], Awaitable[str | None]],
+            tts: agents_tts.TTS | None
+        ) -> SpeculativeResult | None:
+        text = await generate()
+        if not text:
+            return None
+        result = SpeculativeResult(text)
+        if tts is not None:
+            try:
+                async with tts.synthesize(text) as stream:
+                    async for audio in stream:
+                        result.frames.append(audio.frame)
+            except Exception as e:
+                # Sin audio se dice el texto con el TTS normal
+                logger.warning("No se pudo pre-sintetizar el prompt especulativo: %s", e)
+                result.frames = []
+        self._finished_at = time.perf_counter()
+        return result
+
+    async def take(self, key: tuple) -> SpeculativeResult | None:
+        """
+        Devuelve el prompt especulado si corresponde a `key`, esperando lo que le falte;
+        None si no hay especulacion para esa llave o fallo.
+        """
+        if self._task is None or self._key != key:
+            return None
+        task, started_at = self._task, self._started_at
+        needed_at = time.perf_counter()
+        self._task = self._key = None
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning("Especulacion fallida: %s", e)
+            result = None
+        if result is None:
+            metrics.incr("speculation_failed")
+            return None
+        # Lo ahorrado es el trabajo que ya estaba hecho cuando hizo falta el prompt
+        finished_at = self._finished_at or time.perf_counter()
+        saved_ms = (min(needed_at, finished_at) - started_at) * 1000
+        metrics.incr("speculation_used")
+        metrics.incr("speculation_saved_ms", saved_ms)
+        metrics.observe("speculation_saved_ms", saved_ms)
+        return result
+
+    def discard(self):
+        """Cancela la especulacion en curso (el usuario dijo que no o cambio el flujo)."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            self._task.cancel()
+        elif not self._task.cancelled() and self._task.exception() is not None:
+            logger.warning("Especulacion descartada con error: %s", self._task.exception())
+        self._task = self._key = None
+        metrics.incr("speculation_discarded")
+
@@ -0,0 +1,266 @@
+import re
+from dataclasses import dataclass
+from unidecode import unidecode
+
+# Parser de numeros hablados en espanol e ingles, en una sola pasada por tokens.
+# No depende del resto de agents/ (lo usa tambien voice_agent_experiments).
+
+DIGIT, TEEN, TENS, HUNDREDS, HUNDRED, THOUSAND, REPEAT, CONNECTOR = (
+    "digit", "teen", "tens", "hundreds", "hundred", "thousand", "repeat", "connector"
+)
+
+# Lexico: secuencia de palabras (sin acentos) -> (tipo, valor)
+LEXICON: dict[tuple[str, ...], tuple[str, int]] = {}
+
+
+def _add(kind: str, words: dict[str, int]):
+    for phrase, value in words.items():
+        LEXICON[tuple(phrase.split())] = (kind, value)
+
+
+_add(DIGIT, {
+    "cero": 0, "uno": 1, "una": 1, "un": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5,
+    "seis": 6, "siete": 7, "ocho": 8, "nueve": 9,
+    "zero": 0, "oh": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9,
+})
+_add(TEEN, {
+    "diez": 10, "once": 11, "doce": 12, "trece": 13, "catorce": 14, "quince": 15,
+    "dieciseis": 16, "diecisiete": 17, "dieciocho": 18, "diecinueve": 19,
+    # El STT a veces separa los compuestos
+    "dieci seis": 16, "dieci siete": 17, "dieci ocho": 18, "dieci nueve": 19,
+    "diez y seis": 16, "diez y siete": 17, "diez y ocho": 18, "diez y nueve": 19,
+    "veintiuno": 21, "veintiun": 21, "veintidos": 22, "veintitres": 23, "veinticuatro": 24,
+    "veinticinco": 25, "veintiseis": 26, "veintisiete": 27, "veintiocho": 28, "veintinueve": 29,
+    "veinti uno": 21, "veinti dos": 22, "veinti tres": 23, "veinti cuatro": 24,
+    "veinti cinco": 25, "veinti seis": 26, "veinti siete": 27, "veinti ocho": 28, "veinti nueve": 29,
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+    "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+})
+_add(TENS, {
+    "veinte": 20, "treinta": 30, "cuarenta": 40, "cincuenta": 50, "sesenta": 60,
+    "setenta": 70, "ochenta": 80, "noventa": 90,
+    "twenty": 20, "thirty": 30, "forty": 40, "fourty": 40, "fifty": 50, "sixty": 60,
+    "seventy": 70, "eighty": 80, "ninety": 90,
+})
+_add(HUNDREDS, {
+    "cien": 100, "ciento": 100, "doscientos": 200, "trescientos": 300, "cuatrocientos": 400,
+    "quinientos": 500, "seiscientos": 600, "setecientos": 700, "ochocientos": 800,
+    "novecientos": 900,
+    "doscientas": 200, "trescientas": 300, "cuatrocientas": 400, "quinientas": 500,
+    "seiscientas": 600, "setecientas": 700, "ochocientas": 800, "novecientas": 900,
+})
+_add(HUNDREDS, {"a hundred": 100, "cien hundred": 100})
+_add(HUNDRED, {"hundred": 100})
+_add(THOUSAND, {"mil": 1000, "thousand": 1000, "a thousand": 1000})
+_add(REPEAT, {"doble": 2, "double": 2, "triple": 3})
+_add(CONNECTOR, {"y": 0, "and": 0})
+
+
+class WordTrie:
+    """Trie de palabras: encuentra en O(largo de la frase) el lexema mas largo que empieza en i."""
+
+    def __init__(self, entries: dict[tuple[str, ...], tuple[str, int]]):
+        self.root: dict = {}
+        for words, value in entries.items():
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            node[None] = value
+
+    def longest(self, tokens: list[str], i: int) -> tuple[tuple[str, int] | None, int]:
+        node, best, end = self.root, None, i
+        j = i
+        while j < len(tokens) and tokens[j] in node:
+            node = node[tokens[j]]
+            j += 1
+            if None in node:
+                best, end = node[None], j
+        return best, end
+
+
+TRIE = WordTrie(LEXICON)
+TOKEN_RE = re.compile(r"[a-z]+|\d+")
+
+# Penalizaciones multiplicativas sobre la confianza
+GROUP_SPLIT_PENALTY = 0.95      # "fifteen fifty-five": dos grupos que se concatenan
+HOMOPHONE_PENALTY = 0.9         # "oh" por cero
+INTERRUPTION_PENALTY = 0.8      # palabras que no son numero entre dos tramos numericos
+DANGLING_PENALTY = 0.85         # "doble" sin digito despues, "hundred" sin unidad antes
+
+# Multiplicadores ingleses que necesitan unidad antes ("five hundred"); "mil" y "cien" no
+BARE_MULTIPLIERS = {"hundred", "thousand"}
+
+
+@dataclass
+class SpokenNumber:
+    digits: str
+    confidence: float
+
+
+def _fold(text: str) -> str:
+    return unidecode(text).lower().replace("-", " ")
+
+
+class _Group:
+    """Acumulador de un numero compuesto ("mil quinientos cincuenta y cinco")."""
+
+    def __init__(self):
+        self.total = 0
+        self.current = 0
+        self.last: str | None = None
+
+    def value(self) -> str:
+        return str(self.total + self.current)
+
+    def accepts(self, kind: str, value: int) -> bool:
+        if self.last is None:
+            return True
+        last, cur = self.last, self.current
+        if kind == DIGIT:
+            # "fifty five", "ciento cinco", "mil uno"
+            return (last == TENS or (last in (HUNDREDS, HUNDRED, THOUSAND) and cur % 100 == 0)) and value > 0
+        if kind == TEEN:
+            return last in (HUNDREDS, HUNDRED, THOUSAND) and cur % 100 == 0
+        if kind == TENS:
+            return last in (HUNDREDS, HUNDRED, THOUSAND) and cur % 100 == 0
+        if kind == HUNDREDS:
+            return last == THOUSAND
+        if kind == HUNDRED:
+            # "fifteen hundred", "five hundred"
+            return last in (DIGIT, TEEN, TENS) and 0 < cur < 100
+        if kind == THOUSAND:
+            return last != THOUSAND and self.total == 0
+        return False
+
+    def add(self, kind: str, value: int):
+        if kind == HUNDRED:
+            self.current = (self.current or 1) * 100
+        elif kind == THOUSAND:
+            self.total += (self.current or 1) * 1000
+            self.current = 0
+        else:
+            self.current += value
+        self.last = kind
+
+
+def _single(kind: str, value: int) -> str:
+    group = _Group()
+    group.add(kind, value)
+    return group.value()
+
+
+def _spans(tokens: list[str]):
+    """Recorre los tokens y entrega (inicio, fin, digitos, confianza) por cada tramo numerico."""
+    i = 0
+    while i < len(tokens):
+        lexeme, end = TRIE.longest(tokens, i)
+        if tokens[i].isdigit():
+            lexeme, end = None, i
+        elif lexeme is None or lexeme[0] == CONNECTOR:
+            i += 1
+            continue
+        start = i
+        parts: list[str] = []
+        confidence = 1.0
+        group: _Group | None = None
+        repeat = 1
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.isdigit():
+                if group is not None:
+                    parts.append(group.value())
+                    group = None
+                parts.append(tok * repeat)
+                repeat = 1
+                i += 1
+                continue
+            lexeme, end = TRIE.longest(tokens, i)
+            if lexeme is None:
+                break
+            kind, value = lexeme
+            if kind == CONNECTOR:
+                # "cincuenta y cinco", "one hundred and five": solo une dentro de un grupo
+                nxt, _ = TRIE.longest(tokens, end)
+                if group is None or nxt is None or not group.accepts(*nxt):
+                    break
+                i = end
+                continue
+            if kind == REPEAT:
+                repeat = value
+                i = end
+                continue
+            if tok == "oh":
+                confidence *= HOMOPHONE_PENALTY
+            if kind == DIGIT and repeat == 1 and group is None:
+                # "five hundred", "dos mil": el digito abre un numero compuesto
+                nxt, _ = TRIE.longest(tokens, end)
+                if nxt is not None and nxt[0] in (HUNDRED, THOUSAND):
+                    group = _Group()
+                    group.add(kind, value)
+                    i = end
+                    continue
+            if repeat > 1 or kind == DIGIT and (group is None or not group.accepts(kind, value)):
+                # Digito a digito: "uno cinco cinco cinco", "double seven"
+                if group is not None:
+                    parts.append(group.value())
+                    group = None
+                parts.append(str(value) * repeat if kind == DIGIT else _single(kind, value) * repeat)
+                repeat = 1
+                i = end
+                continue
+            if tok in BARE_MULTIPLIERS and (group is None or group.current == 0 or not group.accepts(kind, value)):
+                # "hundred" solo o despues de otro multiplicador: se lee como cien, pero dudoso
+                confidence *= DANGLING_PENALTY
+            if group is not None and not group.accepts(kind, value):
+                parts.append(group.value())
+                confidence *= GROUP_SPLIT_PENALTY
+                group = None
+            if group is None:
+                group = _Group()
+            group.add(kind, value)
+            i = end
+        if group is not None:
+            parts.append(group.value())
+        if repeat > 1:
+            confidence *= DANGLING_PENALTY
+        if parts:
+            yield start, i, "".join(parts), confidence
+        else:
+            i = max(i, start + 1)
+
+
+def parse_spoken_number(text: str) -> SpokenNumber | None:
+    """
+    Lee todos los numeros de la frase ("mil quinientos cincuenta y cinco",
+    "fifteen fifty-five", "double seven", "uno cinco cinco cinco") y los devuelve
+    concatenados como digitos con una confianza; None si no hay ninguno.
+    """
+    tokens = TOKEN_RE.findall(_fold(text))
+    digits: list[str] = []
+    confidence = 1.0
+    last_end = None
+    for start, end, value, span_confidence in _spans(tokens):
+        if last_end is not None and start > last_end:
+            confidence *= INTERRUPTION_PENALTY
+        digits.append(value)
+        confidence *= span_confidence
+        last_end = end
+    if not digits:
+        return None
+    return SpokenNumber("".join(digits), round(confidence, 3))
+
+
+def words_to_digits(text: str) -> str:
+    """Convierte números escritos en palabras a dígitos, dejando el resto del texto igual."""
+    folded = _fold(text)
+    matches = list(TOKEN_RE.finditer(folded))
+    tokens = [m.group() for m in matches]
+    out: list[str] = []
+    cursor = 0
+    for start, end, value, _ in _spans(tokens):
+        out.append(folded[cursor:matches[start].start()])
+        out.append(value)
+        cursor = matches[end - 1].end()
+    out.append(folded[cursor:])
+    return "".join(out)
@@ -0,0 +1,86 @@
+import re
+import time
+from typing import AsyncIterable, AsyncIterator
+from . import metrics
+
+# Fin de oracion: siempre se corta. Fin de clausula (coma, punto y coma, dos puntos,
+# guion largo): solo si ya hay suficiente texto, para no mandar "Okay," suelto al TTS.
+SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s")
+CLAUSE_END = re.compile(r"[,;:—]\s")
+MIN_CLAUSE_CHARS = 24
+
+
+def _next_cut(buffer: str) -> int:
+    """Posicion donde cortar el buffer, o -1 si todavia no hay un limite util."""
+    sentence = SENTENCE_END.search(buffer)
+    if sentence:
+        return sentence.end()
+    for clause in CLAUSE_END.finditer(buffer):
+        if clause.end() >= MIN_CLAUSE_CHARS:
+            return clause.end()
+    return -1
+
+
+async def clause_chunks(deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Reagrupa los deltas del LLM en oraciones o clausulas listas para el TTS."""
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        cut = _next_cut(buffer)
+        while cut != -1:
+            chunk, buffer = buffer[:cut].strip(), buffer[cut:]
+            if chunk:
+                yield chunk + " "
+            cut = _next_cut(buffer)
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class TurnTimer:
+    """
+    Tiempos de un turno hablado: primer token del LLM, primera clausula enviada
+    al TTS y primer frame de audio (este ultimo lo marca VoiceAgent.tts_node).
+    """
+
+    def __init__(self, audio_metric: str = "turn_first_audio_ms"):
+        self.audio_metric = audio_metric
+        self.started_at = time.perf_counter()
+        self.first_token_ms: float | None = None
+        self.first_clause_ms: float | None = None
+        self.first_audio_ms: float | None = None
+
+    def _elapsed(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def mark_first_token(self):
+        if self.first_token_ms is None:
+            self.first_token_ms = self._elapsed()
+            metrics.observe("asi1_first_token_ms", self.first_token_ms)
+
+    def mark_first_clause(self):
+        if self.first_clause_ms is None:
+            self.first_clause_ms = self._elapsed()
+            metrics.observe("asi1_first_clause_ms", self.first_clause_ms)
+
+    def mark_first_audio(self):
+        if self.first_audio_ms is None:
+            self.first_audio_ms = self._elapsed()
+            metrics.observe(self.audio_metric, self.first_audio_ms)
+
+
+async def timed_deltas(deltas: AsyncIterable[str], timer: TurnTimer) -> AsyncIterator[str]:
+    async for delta in deltas:
+        timer.mark_first_token()
+        yield delta
+
+
+async def timed_clauses(clauses: AsyncIterable[str], timer: TurnTimer) -> AsyncIterator[str]:
+    async for clause in clauses:
+        timer.mark_first_clause()
+        yield clause
+
+
+async def timed_audio(frames: AsyncIterable, timer: TurnTimer) -> AsyncIterator:
+    async for frame in frames:
+        timer.mark_first_audio()
+        yield frame
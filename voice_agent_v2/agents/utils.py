@@ -1,224 +1,75 @@
 import re
 from . import config
-from unidecode import unidecode
-from number_parser import parse_number
-from .asi1_agent import ASI1RequestWrapper
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-NUMBER_WORDS = {
-    'cero': '0', 'uno': '1', 'dos': '2', 'tres': '3', 'cuatro': '4',
-    'cinco': '5', 'seis': '6', 'siete': '7', 'ocho': '8', 'nueve': '9',
-    'diez': '10', 'once': '11', 'doce': '12', 'trece': '13', 'catorce': '14',
-    'quince': '15', 'dieciseis': '16', 'diecisiete': '17', 'dieciocho': '18', 'diecinueve': '19',
-    'veinte': '20'
-}
-
-
-# Diccionario para convertir números en texto a dígitos
-SPANISH_DIGITS = {
-    "cero": "0", "uno": "1", "dos": "2", "tres": "3", "cuatro": "4",
-    "cinco": "5", "seis": "6", "siete": "7", "ocho": "8", "nueve": "9",
-    "diez": "10", "once": "11", "doce": "12", "trece": "13", "catorce": "14",
-    "quince": "15", "dieciséis": "16", "diecisiete": "17", "dieciocho": "18",
-    "diecinueve": "19", "veinte": "20", "veintiuno": "21", "veintidós": "22",
-    "veintitrés": "23"
-}
-
-# Muletillas comunes en español mexicano
-MULETILLAS = [
-    r"\b(esteee)\b", r"\b(umm+)\b", r"\b(creo)\b", r"\b(ehh+)\b", r"\b(a ver)\b",
-    r"\b(bueno)\b", r"\b(este)\b", r"\b(ósea)\b", r"\b(vale)\b"
-]
-
-def words_to_digits(text: str) -> str:
-    """Convierte números escritos en palabras a dígitos."""
-    text = unidecode(text.lower())
-    for word, digit in NUMBER_WORDS.items():
-        text = text.replace(word, digit)
-    return text
+from . import metrics
+from .extraction import extract_fields
+from .plate_parser import ( 
+    CONFIDENCE_THRESHOLD as PLATE_CONFIDENCE_THRESHOLD, 
+    plate_parser 
+)
+from .normalization import parse_spoken_eta
+from .intents import IntentMatcher
+from .letter_recognizer import MIN_LETTER_SCORE, letter_recognizer
+from models.driver_model import DataField
+
+# Un solo automata con todos los conjuntos de frases de config (repeticion, fuera de tema, wake words)
+intent_matcher = IntentMatcher.from_config(config)
 
 # Verifica si el texto del usuario contiene una solicitud de repetición
 def is_repeat_request(text: str) -> bool:
-    text = text.lower()
-    return any(trigger in text for trigger in config.REPEAT_REQUESTS)
+    return "repeat_requests" in intent_matcher.intents(text)
 
 # Verifica si el texto del usuario está fuera de tema
 def is_off_topic(text: str) -> bool:
-    text = text.lower()
-    return any(trigger in text for trigger in config.OFF_TOPIC_TRIGGERS)
-
-def clean_user_text(raw: str, current_field: str) -> str:
-    """
-    Limpia el texto del usuario según el campo actual.
-    """
-    raw = raw.strip().lower()
-    
-    # Eliminar muletillas
-    for muletilla in MULETILLAS:
-        raw = re.sub(muletilla, "", raw, flags=re.IGNORECASE)
-    
-    # Normalizar espacios
-    raw = re.sub(r"\s+", " ", raw).strip()
-    
-    if current_field == "nombre_operador":
-        m = re.search(r"(?:mi nombre es|me llamo|soy|el nombre del operador es|el nombre es)\s+(.+)", raw, re.IGNORECASE)
-        name = m.group(1).strip() if m else raw
-        return " ".join(p.capitalize() for p in name.split())
-    
-    elif current_field in ("numero_tractor", "numero_trailer"):
-        # Extraer dígitos directamente
-        digits = re.findall(r"\d", raw)
-        if digits:
-            return "".join(digits)
-        # Convertir números en texto
-        try:
-            num = parse_number(raw, language="es")
-            if num is not None:
-                return str(num)
-        except Exception:
-            pass
-        # Mapear palabras a dígitos
-        tokens = raw.split()
-        mapped = [SPANISH_DIGITS.get(tok) for tok in tokens if tok in SPANISH_DIGITS]
-        if mapped:
-            return "".join(mapped)
-        return raw
-    
-    elif current_field in ("placas_tractor", "placas_trailer"):
-        # Preprocesar para placas
-        # Reemplazar "guión" por "-"
-        raw = re.sub(r"\bguion\b|\bguion\b", "-", raw, flags=re.IGNORECASE)
-        # Eliminar "las placas son" o similares
-        raw = re.sub(r"\b(las placas son|placas|son)\b", "", raw, flags=re.IGNORECASE)
-        # Convertir números en texto a dígitos
-        tokens = raw.split()
-        converted = []
-        for token in tokens:
-            if token in SPANISH_DIGITS:
-                converted.append(SPANISH_DIGITS[token])
-            else:
-                converted.append(token)
-        raw = " ".join(converted)
-        # Normalizar formato (e.g., "A B C - 1 2 3 4" -> "ABC-1234")
-        raw = re.sub(r"\s*-\s*", "-", raw)
-        raw = re.sub(r"\s+", "", raw)
-        return raw.upper()
-    
-    elif current_field == "eta":
-        # Preprocesar ETA
-        raw = re.sub(r"\b(a las|alrededor de|como a las|horas|de la tarde|de la mañana|son las|)\b", "", raw, flags=re.IGNORECASE)
-        tokens = raw.split()
-        converted = []
-        for token in tokens:
-            if token in SPANISH_DIGITS:
-                converted.append(SPANISH_DIGITS[token])
-            elif token in {"y", "con"}:  # Para "catorce y treinta"
-                converted.append(":")
-            else:
-                converted.append(token)
-        raw = " ".join(converted)
-        raw = re.sub(r"\s*:\s*", ":", raw)
-        return raw
-
-    return raw
-
-import re
+    return "off_topic_triggers" in intent_matcher.intents(text)
 
-def normalize_letter_pronunciations(text: str) -> str:
-    text = text.lower()
-    words = text.split()
-    normalized = []
+# Verifica si el usuario dice que no tiene correo
+def is_no_email(text: str) -> bool:
+    return "no_email_phrases" in intent_matcher.intents(text)
 
-    for word in words:
-        cleaned = re.sub(r"[^a-záéíóúñü]", "", word)
+# Verifica si el texto del usuario empieza con una palabra de activación
+def is_wake_phrase(text: str) -> bool:
+    return any(
+        m.intent == "wake_words" and not re.search(r"\w", text[:m.start])
+        for m in intent_matcher.match(text)
+    )
 
-        #letter = config.LETTER_MAP.get(cleaned)
-        #if letter:
-        #if cleaned in config.LETTER_MAP:
-        if cleaned in config.LETTER_MAP_EN:
-        #    normalized.append(config.LETTER_MAP[cleaned])
-            normalized.append(config.LETTER_MAP_EN)
-        elif cleaned.isdigit():
-            normalized.append(cleaned)
-        elif len(cleaned) >= 1 and cleaned[0].isalpha():
-            normalized.append(cleaned[0].upper())
-        #else:
-        #    normalized.append(word)  # deja lo que no reconoce (por si dice "guión")
 
-    return " ".join(normalized)
+def normalize_letter_pronunciations(text: str, expect: str | None = None) -> str:
+    """
+    Caracter deletreado mas probable de la frase ("bee", "be de burro", "letra equis");
+    "" si no hay o si ni el mejor llega a MIN_LETTER_SCORE.
+    """
+    candidates = letter_recognizer.recognize(text, expect=expect, limit=1)
+    return candidates[0].letter if candidates and candidates[0].score >= MIN_LETTER_SCORE else ""
 
 
 async def infer_plate_from_text(raw: str) -> str:
     """
-    Detecta la placa vehicular usando el modelo de OpenAI Realtime.
+    Detecta la placa vehicular (ABC-1234 o XY-123). Primero con el parser local de
+    placas deletreadas; solo si la confianza es baja se usa la extraccion de ASI1.
     """
-    prompt = """
-    Detecta y devuelve únicamente la placa vehicular mencionada por el usuario en formato LETRAS-NÚMEROS (e.g., ABC-1234, XY-1234).
-    - Ignora muletillas como "esteee", "umm", "creo".
-    - Convierte números en texto (e.g., "cuatro cinco seis" → "456").
-    - Normaliza el formato (e.g., "A B C guión 1 2 3 4" → "ABC-1234").
-    - Si no hay placa clara, devuelve una cadena vacía.
-
-    Ejemplos:
-    - Entrada: "Las placas son ABC-1234" → Salida: ABC-1234
-    - Entrada: "Esteee, es A B C guión uno dos tres cuatro" → Salida: ABC-1234
-    - Entrada: "Placas D-E-F cuatro cinco seis siete" → Salida: DEF-4567
-    - Entrada: "Creo que es zac cuatro cinco seis uno" → Salida: ZAC-4561
-    - Entrada: "No sé, algo así como tango bravo 123" → Salida: TB-123
-    - Entrada: "Hola, cómo estás" → Salida: ""
-
-    Entrada: "{raw}"
-    Salida:
-    """.format(raw=raw)
-
-    response = ASI1RequestWrapper(
-        api_key=os.getenv('ASI1_API_KEY'), 
-        temperature=0.3
-    ).generate(prompt)
-    
-    if response is None:
+    candidate = plate_parser.parse(raw)
+    if candidate is not None and candidate.confidence >= PLATE_CONFIDENCE_THRESHOLD:
+        metrics.incr("plate_parser_local")
+        return candidate.plate
+    metrics.incr("plate_parser_llm_fallback")
+    found = await extract_fields(raw, [DataField.TRACTOR_PLATES])
+    if not found:
         return ""
+    return found[DataField.TRACTOR_PLATES].value
 
-    # Validar formato de la placa
-    plate = response.strip().upper()
-    if re.match(r"^[A-Z]{2,3}-[0-9]{3,4}$", plate):
-        return plate
-    return ""
-
-async def infer_eta_from_text(raw: str) -> str:
+async def infer_eta_from_text(raw: str) -> tuple[str, float] | None:
     """
-    Detecta y devuelve el ETA en formato HH:MM usando el modelo de OpenAI Realtime.
+    Detecta el ETA en formato HH:MM con su confianza. Primero con parse_spoken_eta; solo
+    si la frase no trae una hora reconocible se usa la extraccion estructurada de ASI1.
+    None si ninguno de los dos la encontro (o ASI1 no respondio).
     """
-    prompt = """
-    Detecta y devuelve únicamente el ETA mencionado por el usuario en formato HH:MM (e.g., 14:30, 09:15).
-    - Ignora muletillas como "esteee", "umm", "creo".
-    - Convierte números en texto (e.g., "catorce treinta" → "14:30").
-    - Normaliza el formato (e.g., "catorce y treinta" → "14:30").
-    - Si no hay un ETA claro o válido, devuelve una cadena vacía.
-
-    Ejemplos:
-    - Entrada: "Mi ETA es a las 14:30" → Salida: 14:30
-    - Entrada: "Esteee, catorce treinta" → Salida: 14:30
-    - Entrada: "Ummm, la ETA sería como a las dieciséis cero cero" → Salida: 16:00
-    - Entrada: "Llegada a las veinte cero cero" → Salida: 20:00
-    - Entrada: "No sé, mañana por la mañana" → Salida: ""
-    - Entrada: "A las tres quince de la tarde" → Salida: 15:15
-
-    Entrada: "{raw}"
-    Salida:
-    """.format(raw=raw)
-
-    response = ASI1RequestWrapper(
-        api_key=os.getenv('ASI1_API_KEY'), 
-        temperature=0.3
-    ).generate(prompt)
-
-    if response is None:
-        return "No quedo claro"
-    eta = response.strip()
-    if re.match(r"^[0-2][0-9]:[0-5][0-9]$", eta) and 0 <= int(eta.split(":")[0]) <= 23:
-        return eta
-    return ""
\ No newline at end of file
+    spoken = parse_spoken_eta(raw)
+    if spoken is not None:
+        metrics.incr("eta_parser_local")
+        return spoken.eta, spoken.confidence
+    metrics.incr("eta_parser_llm_fallback")
+    found = await extract_fields(raw, [DataField.ETA])
+    if not found or DataField.ETA not in found:
+        return None
+    return found[DataField.ETA].value, found[DataField.ETA].confidence
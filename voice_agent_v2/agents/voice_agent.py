@@ -1,27 +1,86 @@
 from __future__ import annotations
-from .asi1_agent import ASI1RequestWrapper
+from .asi1_agent import ASI1RequestWrapper, get_http_session
 from .utils import ( 
+    infer_eta_from_text,
     infer_plate_from_text,
+    is_no_email,
     normalize_letter_pronunciations
 )
+from .confirmation_classifier import AFFIRM, CORRECTION, DENY, classify_confirmation
+from .confirmation_policy import ConfirmationPolicy
+from .config import OFF_SCRIPT_TRIGGERS
+from .intents import IntentMatcher
+from . import kinds
+from .corrections import Correction, extract_correction
+from .email_parser import parse_spoken_email
+from .fields import FIELD_SPECS, is_valid_plate
+from .slot_filling import (
+    FREE_TEXT_CONFIDENCE,
+    MIN_SLOT_CONFIDENCE,
+    Slot,
+    fill_slots,
+    mentioned_fields,
+    trim_edges,
+    unread_slots
+)
+from .extraction import extract_fields
+from .plate_parser import CONFIDENCE_THRESHOLD as PLATE_CONFIDENCE_THRESHOLD, plate_parser
+from .registrations import PriorRegistration, registration_index
+from .checkpoints import CheckpointStore, checkpoint_store
+from . import interim
+from .interim import EarlyCommit
+from . import metrics
+from .letter_recognizer import (
+    CHUNK_CONFIDENCE_THRESHOLD,
+    PLATE_LENGTH,
+    PLATE_LETTERS,
+    expected_kind,
+    letter_recognizer
+)
+from .clip_library import ( 
+    CARRIER_PHRASES, 
+    clip_library 
+)
+from .response_cache import response_cache
+from .speculation import SpeculativePrompt
+from .streaming import ( 
+    TurnTimer, 
+    clause_chunks, 
+    timed_audio, 
+    timed_clauses, 
+    timed_deltas 
+)
 import logging
 from dotenv import load_dotenv
 from typing import (
     Any, 
+    AsyncIterable, 
     List
 )
-import requests
 from livekit import rtc, api
 import asyncio
+import copy
 import os
 import random
+import time
 from .en_prompts import ( 
     INSTRUCTIONS, 
     WELCOME_MESSAGE_ARRAY, 
-    ASK_MESSAGE, 
-    CONFIRM_MESSAGE, 
-    REPEAT_MESSAGE, 
     OFF_TOPIC_MESSAGE, 
+    FALLBACK_MESSAGES, 
+    FIELD_NAMES_EN, 
+    IMPLICIT_CONFIRM_MESSAGE,
+    SUMMARY_CONFIRM_MESSAGE,
+    SUMMARY_REOPEN_MESSAGE,
+    SLOTS_CONFIRM_MESSAGE,
+    PRIOR_REGISTRATION_MESSAGE,
+    PRIOR_CHANGES_MESSAGE,
+    RESUME_MESSAGE,
+    EMAIL_DOMAIN_MESSAGE,
+    EMAIL_INVALID_MESSAGE,
+    EMAIL_REQUIRED_MESSAGE,
+    CORRECTED_CHAR_MESSAGE,
+    CORRECTED_VALUE_MESSAGE,
 )
 from models.driver_model import ( 
     DataField, 
@@ -29,15 +88,42 @@ from models.driver_model import (
 )
 from livekit.agents import ( 
     Agent, 
+    ModelSettings, 
     RunContext, 
+    StopResponse,
+    ToolError,
     function_tool, 
-    get_job_context 
+    get_job_context,
+    llm,
+    stt
 )
+from livekit.agents.llm.tool_context import get_raw_function_info
 
 load_dotenv(override=True)
 logger = logging.getLogger("outbound-caller")
 logger.setLevel(logging.INFO)
 
+# Metodo de VoiceAgent que captura cada tipo de valor (FieldSpec.kind); devuelve
+# (valor, confianza de la captura) o None si ya contesto y el campo sigue abierto
+COLLECTORS = {
+    kinds.TEXT: "_collect_text",
+    kinds.NUMBER: "_collect_number",
+    kinds.PLATE: "_start_plate",
+    kinds.ETA: "_collect_eta",
+    kinds.EMAIL: "_collect_email",
+}
+# Lo que puede cambiar al procesar una frase; se guarda antes de contestar un parcial del STT
+# y en el checkpoint de cada paso confirmado (ver checkpoints)
+TURN_STATE = (
+    "current_field", "fields_to_collect", "waiting_for_confirmation", "last_value", "data",
+    "in_letter_mode", "letter_index", "partial_plate", "single_char_mode", "current_plate_type",
+    "plate_confidence", "partial_email", "implicitly_confirmed", "confirming_summary",
+    "last_confidence", "user_turns", "pending_slots", "confirming_prior", "prior_changes_asked",
+)
+
+# Turnos que contesta el LLM de la sesion en lugar del flujo de campos
+off_script_matcher = IntentMatcher({"off_script": OFF_SCRIPT_TRIGGERS})
+
 class VoiceAgent(Agent):
     def __init__(self, dial_info: dict[str, Any]):
         super().__init__(
@@ -48,231 +134,863 @@ class VoiceAgent(Agent):
         self.transcript_log: list[str] = []  # for logging events like complaints/reschedules
         self.data = DriverData()
         self.current_field = None
-        self.fields_to_collect: List[DataField] = [
-            DataField.NAME,
-            DataField.TRACTOR_NUMBER,
-            DataField.TRACTOR_PLATES,
-            DataField.TRAILER_NUMBER,
-            DataField.TRAILER_PLATES,
-            DataField.ETA,
-            DataField.EMAIL
-        ]
+        self.fields_to_collect: List[DataField] = list(FIELD_SPECS)
+        self._collectors = {kind: getattr(self, name) for kind, name in COLLECTORS.items()}
         self.waiting_for_confirmation = False
         self.last_value = None
-        self.phone_number = None
+        self.phone_number = dial_info.get("phone_number")
         # Configuracion para las placas
         self.current_plate_type = None  # tractor_plates o trailer_plates
         self.in_letter_mode = False
         self.letter_index = 0
         self.partial_plate = []  
+        # Varios caracteres por frase, confirmados en grupo (CHUNKED_PLATE_CAPTURE=0: uno por uno)
+        self.chunked_plate_capture = os.getenv("CHUNKED_PLATE_CAPTURE", "1") == "1"
+        self.single_char_mode = False
+        # Parte del correo antes de la arroba cuando el usuario la dicto en otro turno
+        self.partial_email: str | None = None
         self.say_welcome = True
+        # Valores validos con buena confianza del STT se aceptan sin el turno de "¿es correcto?".
+        # CONFIRMATION_MODE=summary: nada se confirma campo por campo, solo el resumen final
+        self.summary_mode = os.getenv("CONFIRMATION_MODE", "per_field") == "summary"
+        self.confirmation_policy = ConfirmationPolicy(
+            enabled=os.getenv("CONFIDENCE_GATED_CONFIRMATION", "1") == "1",
+            summary_only=self.summary_mode
+        )
+        self.implicitly_confirmed: List[DataField] = []
+        # Campos que llegaron de paso en otra respuesta y se confirman juntos
+        self.multi_slot_filling = os.getenv("MULTI_SLOT_FILLING", "1") == "1"
+        self.pending_slots: List[DataField] = []
+        self.confirming_summary = False
+        # Registro anterior del mismo telefono: se pregunta solo lo que cambio
+        self.prior_registration: PriorRegistration | None = None
+        if os.getenv("PREFILL_FROM_HISTORY", "1") == "1":
+            self.prior_registration = registration_index.lookup(self.phone_number)
+        self.confirming_prior = False
+        self.prior_changes_asked = False
+        # Checkpoint por llamada: el reintento de reschedule_call sigue donde se quedo esta
+        self.checkpoints: CheckpointStore | None = (
+            checkpoint_store if os.getenv("SESSION_CHECKPOINTS", "1") == "1" else None
+        )
+        self.checkpoint_key = CheckpointStore.key(dial_info)
+        self.resumed = False
+        self.last_confidence: float | None = None
+        # Confianza mas baja del STT entre las frases de la placa en curso
+        self.plate_confidence: float | None = None
+        self.user_turns = 0
         self.asi1_llm = ASI1RequestWrapper(api_key=os.getenv('ASI1_API_KEY'))
+        # Con streaming la primera clausula llega al TTS mientras ASI1 sigue generando
+        self.stream_responses = os.getenv("ASI1_STREAMING", "1") == "1"
+        self._turn_timer: TurnTimer | None = None
+        # Mientras se confirma un campo se prepara el ASK del siguiente
+        self.speculate_next_prompt = os.getenv("SPECULATE_NEXT_PROMPT", "1") == "1"
+        self.speculation = SpeculativePrompt(
+            synthesize_audio=os.getenv("SPECULATE_AUDIO", "1") == "1"
+        )
+        # Un "si" o un caracter suelto se contestan con el parcial del STT, sin esperar el endpointing
+        self.interim_fast_path = os.getenv("INTERIM_FAST_PATH", "1") == "1"
+        self._early_commit: EarlyCommit | None = None
 
     async def on_enter(self):
         self.current_field = self.fields_to_collect[0]
+        state = self.checkpoints.load(self.checkpoint_key) if self.checkpoints and self.checkpoint_key else None
+        if state is not None:
+            for name in TURN_STATE:
+                if name in state:
+                    setattr(self, name, state[name])
+            self.resumed = True
+            metrics.incr("sessions_resumed")
+            return
+        if self.prior_registration is not None:
+            self._prefill(self.prior_registration)
 
-    async def on_user_message(self, message: str):
-        if self.in_letter_mode:
+    async def start_conversation(self):
+        """Con el transportista ya en la llamada: retoma el checkpoint o pregunta por el registro anterior."""
+        if self.resumed:
+            await self._resume()
+        else:
+            await self.offer_prior_registration()
+
+    async def _resume(self):
+        """Repite la pregunta del paso en que se quedo la llamada anterior (campo o caracter de la placa)."""
+        # Media direccion de correo de otra llamada no se completa con la respuesta de esta
+        self.partial_email = None
+        await self.session.say(RESUME_MESSAGE)
+        if not self.in_letter_mode:
+            await self._ask_next()
+            return
+        if self.partial_plate:
+            await self._say_clips("i_have", *self.partial_plate, text=f"I have {', '.join(self.partial_plate)}.")
+        if self.letter_index == 0:
+            await self._say_clips("start_plate")
+        elif self.letter_index == PLATE_LETTERS:
+            await self._say_clips("move_to_numbers")
+        else:
+            await self._say_clips("next_letter" if self.letter_index < PLATE_LETTERS else "next_number")
+
+    async def save_checkpoint(self):
+        """
+        Shutdown del job (colgo el transportista, se cayo la llamada o el LLM la termino):
+        guarda el ultimo paso confirmado si el registro no se termino.
+        """
+        if self.current_field is not None:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        """Guarda el estado si esta en un paso confirmado; una pregunta de si/no pendiente se repite al retomar."""
+        if not self.checkpoints or not self.checkpoint_key or not self.current_field:
+            return
+        if self.waiting_for_confirmation and not self.confirming_summary:
+            return
+        self.checkpoints.save(self.checkpoint_key, {name: getattr(self, name) for name in TURN_STATE})
+
+    def _prefill(self, prior: PriorRegistration):
+        """Los valores validos del registro anterior quedan puestos y pendientes de un solo "si"."""
+        for field, spec in FIELD_SPECS.items():
+            value = prior.values.get(spec.attr)
+            if spec.reusable and value and spec.validate(value)[0]:
+                setattr(self.data, spec.attr, value)
+                self.pending_slots.append(field)
+                self.fields_to_collect.remove(field)
+        if not self.pending_slots:
+            return
+        self.current_field = self.fields_to_collect[0]
+        self.confirming_prior = True
+        self.waiting_for_confirmation = True
+        metrics.incr("prefilled_calls")
+        metrics.incr("prefilled_fields", len(self.pending_slots))
+
+    async def offer_prior_registration(self):
+        """Con el transportista ya en la llamada: "same tractor 1555 and plates JKL-4321?"."""
+        if self.confirming_prior:
+            await self.session.say(PRIOR_REGISTRATION_MESSAGE.format(items=self._read_back(self.pending_slots)))
+
+    async def tts_node(self, text: AsyncIterable[str], model_settings: ModelSettings):
+        # Marca el primer frame de audio del turno generado en curso
+        timer = self._turn_timer
+        async for frame in Agent.default.tts_node(self, text, model_settings):
+            if timer is not None:
+                timer.mark_first_audio()
+                timer = None
+            yield frame
+
+    async def stt_node(self, audio: AsyncIterable[rtc.AudioFrame], model_settings: ModelSettings):
+        # Los parciales pasan por aqui antes de que la sesion cierre el turno del usuario
+        async for event in Agent.default.stt_node(self, audio, model_settings):
+            if (event.type in (stt.SpeechEventType.INTERIM_TRANSCRIPT, stt.SpeechEventType.FINAL_TRANSCRIPT)
+                    and event.alternatives):
+                alternative = event.alternatives[0]
+                self.on_interim_transcript(alternative.text, confidence=alternative.confidence)
+            yield event
+
+    async def _say_clips(self, *keys: str, text: str | None = None):
+        """
+        Dice un prompt de placas empalmando clips pregrabados (ver clip_library);
+        si la biblioteca aun no esta lista usa el TTS normal con el mismo texto.
+        """
+        if text is None:
+            text = " ".join(CARRIER_PHRASES.get(key, key) for key in keys)
+        if clip_library.has(*keys):
+            timer = TurnTimer(audio_metric="plate_prompt_first_audio_ms.clips")
+            await self.session.say(text, audio=timed_audio(clip_library.frames(*keys), timer))
+        else:
+            self._turn_timer = TurnTimer(audio_metric="plate_prompt_first_audio_ms.tts")
+            await self.session.say(text)
+
+    async def _say_template(self, template: str, **params):
+        """
+        Dice la reformulacion de ASI1 de una plantilla de en_prompts, pasando
+        primero por el cache de respuestas del proceso. Si ASI1 no responde dentro
+        del presupuesto del turno se dice el texto fijo de FALLBACK_MESSAGES.
+        """
+        prompt = template.format(**params)
+        key = response_cache.key(template, params, self.asi1_llm.temperature, self.asi1_llm.model)
+        speculative = await self.speculation.take(key)
+        if speculative is not None:
+            if speculative.frames:
+                await self.session.say(speculative.text, audio=speculative.audio())
+            else:
+                await self.session.say(speculative.text)
+            return
+        cached = response_cache.lookup(key)
+        if cached is not None:
+            response_cache.refill(key, lambda: self.asi1_llm.agenerate(prompt))
+            await self.session.say(cached)
+            return
+        fallback = FALLBACK_MESSAGES[template].format(**{
+            **params,
+            "field_name": FIELD_NAMES_EN.get(params.get("field_name"), params.get("field_name")),
+        })
+        response = await self._say_generated(prompt, fallback)
+        if response:
+            response_cache.store(key, response)
+
+    def _speculate_next_ask(self):
+        """
+        Arranca en segundo plano el ASK del siguiente campo (texto y audio) para
+        que este listo si el usuario confirma el valor actual.
+        """
+        if not self.speculate_next_prompt or len(self.fields_to_collect) < 2:
+            return
+        template = FIELD_SPECS[self.fields_to_collect[1]].ask
+        params = {
+            "field_name": self.fields_to_collect[1].value,
+            "remaining": len(self.fields_to_collect) - 1,
+        }
+        key = response_cache.key(template, params, self.asi1_llm.temperature, self.asi1_llm.model)
+        prompt = template.format(**params)
+
+        async def generate() -> str | None:
+            cached = response_cache.peek(key)
+            if cached is not None:
+                return cached
+            response = await self.asi1_llm.agenerate_within(prompt)
+            if response:
+                response_cache.store(key, response)
+            return response
+
+        self.speculation.start(key, generate, self.session.tts)
+
+    async def _say_generated(self, prompt: str, fallback: str) -> str | None:
+        """
+        Genera la respuesta con ASI1 a partir del prompt, la dice por el TTS y la
+        devuelve; None si se uso `fallback` porque se agoto el presupuesto.
+        """
+        timer = TurnTimer()
+        self._turn_timer = timer
+        response = None
+        if self.stream_responses:
+            stream = await self.asi1_llm.astream_within(prompt)
+            if stream is not None:
+                spoken: list[str] = []
+
+                async def collect(clauses: AsyncIterable[str]):
+                    async for clause in clauses:
+                        spoken.append(clause)
+                        yield clause
+
+                deltas = timed_deltas(stream, timer)
+                await self.session.say(collect(timed_clauses(clause_chunks(deltas), timer)))
+                response = "".join(spoken).strip() or None
+        else:
+            response = await self.asi1_llm.agenerate_within(prompt)
+            if response:
+                timer.mark_first_token()
+                timer.mark_first_clause()
+                await self.session.say(response)
+        if response is None:
+            metrics.incr("asi1_fallbacks")
+            logger.warning("ASI1 sin respuesta dentro del presupuesto, usando texto fijo")
+            await self.session.say(fallback)
+        logger.info(
+            "turn timings: first_token=%s ms first_audio=%s ms",
+            timer.first_token_ms and round(timer.first_token_ms),
+            timer.first_audio_ms and round(timer.first_audio_ms),
+        )
+        return response
+
+    async def on_user_turn_completed(self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage):
+        # El flujo de campos lo maneja on_user_message; sin StopResponse la sesion
+        # ademas generaria su propia respuesta con el LLM
+        text = new_message.text_content or ""
+        if off_script_matcher.intents(text) and not self._answers_field(text):
+            # "call me back later", "quiero quejarme": contesta el LLM, que puede llamar a
+            # reschedule_call, log_complaint o end_call; el campo en curso sigue abierto
+            metrics.incr("off_script_turns")
+            commit, self._early_commit = self._early_commit, None
+            if commit is not None:
+                await self._rollback_early_commit(commit)
+            return
+        await self.on_final_transcript(text, confidence=new_message.transcript_confidence)
+        raise StopResponse()
+
+    def _answers_field(self, text: str) -> bool:
+        """La frase trae un campo que falta ("I'll be there at 5, call me back if not"): no es fuera del guion."""
+        if not self.current_field or self.waiting_for_confirmation or self.in_letter_mode:
+            return False
+        return bool(fill_slots(text, self.fields_to_collect, self.current_field))
+
+    def _expected_short_answer(self) -> str | None:
+        """Lo que se espera oir si la respuesta es de una palabra (si/no o un caracter); None si no."""
+        if not self.interim_fast_path or not self.current_field or self._early_commit is not None:
+            return None
+        if self.waiting_for_confirmation:
+            # El "si" que guarda los datos no se adelanta: no hay como deshacerlo
+            if self.confirming_summary or (not self.in_letter_mode and len(self.fields_to_collect) <= 1):
+                return None
+            return interim.CONFIRM
+        if self.in_letter_mode and (
+                self.single_char_mode or not self.chunked_plate_capture or self.letter_index == PLATE_LENGTH - 1):
+            return expected_kind(self.letter_index)
+        return None
+
+    def on_interim_transcript(self, text: str, confidence: float | None = None):
+        """
+        Parcial del STT: si el estado espera una respuesta corta y el parcial la trae
+        sin ambiguedad, se contesta ya. on_final_transcript decide si se queda.
+        """
+        stale = self._early_commit
+        if stale is not None and stale.expired and stale.task.done():
+            # Nunca llego la final de esa frase (la sesion descarto el turno): se queda
+            # como esta y este parcial ya es de la frase siguiente
+            self._early_commit = None
+            metrics.incr("interim_orphaned")
+        expect = self._expected_short_answer()
+        if expect is None:
+            return
+        answer = interim.short_answer(text, expect)
+        if answer is None:
+            return
+        snapshot = {name: copy.deepcopy(getattr(self, name)) for name in TURN_STATE}
+        commit = EarlyCommit(expect=expect, answer=answer, text=text, snapshot=snapshot)
+        self._early_commit = commit
+        commit.task = asyncio.create_task(self.on_user_message(text, confidence=confidence))
+        metrics.incr("interim_commits")
+
+    async def on_final_transcript(self, message: str, confidence: float | None = None):
+        """
+        Transcripcion final del turno: confirma lo contestado con el parcial o lo deshace.
+        Si el parcial ya se contesto, la final nunca se procesa otra vez sobre el estado que
+        el parcial dejo avanzado (aunque haya tardado mas de MAX_PENDING_S).
+        """
+        commit = self._early_commit
+        self._early_commit = None
+        if commit is not None:
+            if interim.agrees(commit, message):
+                # Lo que se ahorro es lo que tardo la final despues del parcial
+                metrics.observe("interim_saved_ms", (time.perf_counter() - commit.started) * 1000)
+                await commit.task
+                self._checkpoint()
+                return
+            await self._rollback_early_commit(commit)
+        await self.on_user_message(message, confidence=confidence)
+        self._checkpoint()
+
+    async def _rollback_early_commit(self, commit: EarlyCommit):
+        """La final no coincide con el parcial: se corta lo que se estaba diciendo y se vuelve al estado anterior."""
+        metrics.incr("interim_rollbacks")
+        if not commit.task.done():
+            commit.task.cancel()
+            try:
+                await commit.task
+            except asyncio.CancelledError:
+                pass
+        await self.session.interrupt()
+        self.speculation.discard()
+        for name, value in commit.snapshot.items():
+            setattr(self, name, value)
+
+    async def on_user_message(self, message: str, confidence: float | None = None):
+        if not self.current_field:
+            return
+        self.user_turns += 1
+        metrics.incr("user_turns")
+        self.last_confidence = confidence
+        if self.in_letter_mode and not self.waiting_for_confirmation:
+            self.plate_confidence = confidence if self.plate_confidence is None else min(self.plate_confidence, confidence or 0.0)
             await self._handle_letter_by_letter(message)
-        elif not self.current_field:
             return
-        
+
         if self.waiting_for_confirmation:
             await self.handle_confirmation(message)
         else:
             await self.handle_data_collection(message)
 
     async def handle_data_collection(self, message: str):
-        # Validate input based on field
-        if self.current_field in [DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES]:
-            self.in_letter_mode = True
-            self.partial_plate = []
-            self.letter_index = 0
-            self.current_plate_type = self.current_field
-            #await self.session.generate_reply("Vamos a hacerlo letra por letra. Dime la primera letra de la placa.")
-            #await self.session.say("Vamos a hacerlo letra por letra. Dime la primera letra de la placa.")
-            await self.session.say("Let's do it letter by letter. Tell me the first letter of the plate.")
-            return
-        if self.current_field == DataField.NAME:
-            self.data.name = message
-        elif self.current_field == DataField.TRACTOR_NUMBER:
-            self.data.tractor_number = message
-        elif self.current_field == DataField.TRAILER_NUMBER:
-            self.data.trailer_number = message
-        elif self.current_field == DataField.ETA:
-            if not self._is_valid_eta(message):
-
-                #await self.session.generate_reply(
-                #    REPEAT_MESSAGE.format(
-                #        field_name=self.current_field.value,
-                #    )
-                #)
-                response = self.asi1_llm.generate(
-                    REPEAT_MESSAGE.format(
-                        field_name=self.current_field.value,
-                    )
-                )
-                await self.session.say(response)
+        if self.multi_slot_filling:
+            slots = fill_slots(message, self.fields_to_collect, self.current_field)
+            unread = unread_slots(message, self.fields_to_collect, slots, self.current_field)
+            if unread:
+                # El campo que se pregunto va en la misma peticion si tampoco se leyo
+                if self.current_field not in slots:
+                    unread.append(self.current_field)
+                slots.update(await self._extract_slots(message, unread))
+            # Solo el campo que se pregunto: sigue el camino de siempre
+            if slots and set(slots) != {self.current_field}:
+                await self._confirm_slots(slots)
                 return
-            self.data.eta = message
-        elif self.current_field == DataField.EMAIL:
-            self.data.email = message
-
+        spec = FIELD_SPECS[self.current_field]
+        captured = await self._collectors[spec.kind](message)
+        if captured is None:
+            return
+        message, capture_confidence = captured
+        setattr(self.data, spec.attr, message)
         self.last_value = message
+        self._speculate_next_ask()
+        formatted_value = spec.format(message)
+        valid, parse_confidence = spec.validate(message)
+        if self.confirmation_policy.should_skip(
+                self.current_field, valid, self.last_confidence, min(parse_confidence, capture_confidence)):
+            await self._confirm_implicitly(formatted_value)
+            return
         self.waiting_for_confirmation = True
-        formatted_value = self._format_value(self.current_field, message)
         #await self.session.generate_reply(
         #    CONFIRM_MESSAGE.format(
         #        field_name=self.current_field.value, 
         #        value=formatted_value
         #    )
         #)
-        response = self.asi1_llm.generate(
-                CONFIRM_MESSAGE.format(
-                field_name=self.current_field.value, 
-                value=formatted_value
-            )
+        await self._say_template(
+            spec.confirm,
+            field_name=self.current_field.value,
+            value=formatted_value
+        )
+
+    async def _extract_slots(self, message: str, fields: List[DataField]) -> dict[DataField, Slot]:
+        """
+        Campos que la frase nombra pero su extractor local no leyo ("tractor 1555, and I'm
+        arriving right after lunch"): se piden todos juntos a ASI1 en una sola peticion.
+        """
+        metrics.incr("slot_fill_asi1")
+        found = await extract_fields(message, fields) or {}
+        return {
+            field: Slot(extracted.value, extracted.confidence)
+            for field, extracted in found.items() if extracted.confidence >= MIN_SLOT_CONFIDENCE
+        }
+
+    async def _confirm_slots(self, slots: dict[DataField, Slot]):
+        """Guarda los campos que trajo la frase, los saca de la lista y los lee juntos."""
+        self.pending_slots = [field for field in FIELD_SPECS if field in slots]
+        for field in self.pending_slots:
+            setattr(self.data, FIELD_SPECS[field].attr, slots[field].value)
+            self.fields_to_collect.remove(field)
+        metrics.incr("slot_fill_turns")
+        metrics.incr("slots_filled", len(slots))
+        self.waiting_for_confirmation = True
+        await self.session.say(SLOTS_CONFIRM_MESSAGE.format(items=self._read_back(self.pending_slots)))
+
+    async def _reopen_slots(self):
+        """El usuario rechazo la lectura conjunta: esos campos se piden otra vez, uno por uno."""
+        reopened = set(self.pending_slots) | set(self.fields_to_collect)
+        for field in self.pending_slots:
+            setattr(self.data, FIELD_SPECS[field].attr, None)
+        self.pending_slots = []
+        self.fields_to_collect = [field for field in FIELD_SPECS if field in reopened]
+        self.current_field = self.fields_to_collect[0]
+        await self.session.say(SUMMARY_REOPEN_MESSAGE)
+        await self._say_template(
+            FIELD_SPECS[self.current_field].ask,
+            field_name=self.current_field.value,
+            remaining=len(self.fields_to_collect)
+        )
+
+    async def _update_prior_fields(self, message: str, named: List[DataField]):
+        """
+        El registro anterior cambio. Lo nombrado con valor ("the trailer is 88 now") se
+        lee para confirmarlo; lo nombrado sin valor se pide; lo que no nombro se queda.
+        Un "no" sin decir que cambio se contesta una vez con "What changed?"; el segundo
+        vuelve a pedir todo.
+        """
+        if not named and not self.prior_changes_asked:
+            self.prior_changes_asked = True
+            await self.session.say(PRIOR_CHANGES_MESSAGE)
+            return
+        self.confirming_prior = False
+        if not named:
+            metrics.incr("prior_fields_changed", len(self.pending_slots))
+            self.waiting_for_confirmation = False
+            await self._reopen_slots()
+            return
+        metrics.incr("prior_fields_changed", len(named))
+        corrected = fill_slots(message, named)
+        reopened = [field for field in named if field not in corrected]
+        for field in reopened:
+            setattr(self.data, FIELD_SPECS[field].attr, None)
+        if reopened:
+            missing = set(reopened) | set(self.fields_to_collect)
+            self.fields_to_collect = [field for field in FIELD_SPECS if field in missing]
+            self.current_field = self.fields_to_collect[0]
+        if corrected:
+            self.pending_slots = [field for field in FIELD_SPECS if field in corrected]
+            for field in self.pending_slots:
+                setattr(self.data, FIELD_SPECS[field].attr, corrected[field].value)
+            await self.session.say(SLOTS_CONFIRM_MESSAGE.format(items=self._read_back(self.pending_slots)))
+            return
+        self.pending_slots = []
+        self.waiting_for_confirmation = False
+        await self.session.say(SUMMARY_REOPEN_MESSAGE)
+        await self._ask_next()
+
+    async def _say_repeat(self):
+        await self._say_template(
+            FIELD_SPECS[self.current_field].repeat,
+            field_name=self.current_field.value
         )
-        await self.session.say(response)
+
+    async def _collect_text(self, message: str) -> tuple[str, float] | None:
+        # "name is John Smith" -> "John Smith": se quitan las frases de FieldSpec.cues
+        slot = fill_slots(message, [self.current_field], self.current_field).get(self.current_field)
+        return (slot.value, slot.confidence) if slot else (message, FREE_TEXT_CONFIDENCE)
+
+    async def _collect_number(self, message: str) -> tuple[str, float] | None:
+        # "it's fifteen fifty-five" -> "1555": se guardan los digitos, no la frase. Solo si
+        # no dijo nada mas: "un momento" o "hold on one sec" no son un 1
+        spec = FIELD_SPECS[self.current_field]
+        slot = fill_slots(message, [self.current_field], self.current_field).get(self.current_field)
+        captured = (slot.value, slot.confidence) if slot else spec.extract(trim_edges(message))
+        if captured is None:
+            await self._say_repeat()
+            return None
+        return captured
+
+    async def _start_plate(self, message: str) -> tuple[str, float] | None:
+        # "JKL 4321" dicha de una vez y clara se confirma completa; si no, se pide
+        # caracter por caracter (ver _handle_letter_by_letter)
+        candidate = plate_parser.parse(message)
+        if (candidate is not None and candidate.confidence >= PLATE_CONFIDENCE_THRESHOLD
+                and is_valid_plate(candidate.plate)):
+            metrics.incr("plate_parser_local")
+            return candidate.plate, candidate.confidence
+        self.in_letter_mode = True
+        self.partial_plate = []
+        self.letter_index = 0
+        self.single_char_mode = False
+        self.plate_confidence = None
+        self.current_plate_type = self.current_field
+        #await self.session.generate_reply("Vamos a hacerlo letra por letra. Dime la primera letra de la placa.")
+        #await self.session.say("Vamos a hacerlo letra por letra. Dime la primera letra de la placa.")
+        await self._say_clips("start_plate")
+        return None
+
+    async def _collect_eta(self, message: str) -> tuple[str, float] | None:
+        # "a las tres y media de la tarde" -> "15:30"; ASI1 solo si parse_spoken_eta no la reconoce
+        captured = await infer_eta_from_text(message)
+        if captured is None:
+            await self._say_repeat()
+            return None
+        return captured
+
+    async def _collect_email(self, message: str) -> tuple[str, float] | None:
+        # Se arma y valida aqui: un correo invalido en el servidor MCP ya no se puede corregir
+        if is_no_email(message):
+            # El servidor MCP exige el correo (ahi se manda la confirmacion): se pide otro
+            metrics.incr("email_refused")
+            self.partial_email = None
+            await self.session.say(EMAIL_REQUIRED_MESSAGE)
+            return None
+        email = parse_spoken_email(message, local=self.partial_email)
+        if email is None:
+            await self._say_repeat()
+            return None
+        if not email.domain:
+            self.partial_email = email.local
+            await self.session.say(EMAIL_DOMAIN_MESSAGE.format(local=email.local))
+            return None
+        self.partial_email = None
+        if not email.valid:
+            metrics.incr("email_rejected")
+            await self.session.say(EMAIL_INVALID_MESSAGE.format(value=email.address))
+            return None
+        return email.address, email.confidence
+
     async def _handle_letter_by_letter(self, message: str):
-        normalized = normalize_letter_pronunciations(message).replace(" ", "")
+        # Todos los caracteres que dijo de corrido; se confirman juntos si la lectura es clara
+        chunk = letter_recognizer.recognize_sequence(message, start=self.letter_index)
+        if (self.chunked_plate_capture and not self.single_char_mode and len(chunk.chars) > 1
+                and chunk.confidence >= CHUNK_CONFIDENCE_THRESHOLD):
+            metrics.incr("plate_chunks")
+            metrics.observe("plate_chunk_chars", len(chunk.chars))
+            self.last_value = chunk.chars
+            if self.letter_index + len(chunk.chars) == PLATE_LENGTH:
+                # La placa completa se confirma una sola vez con CONFIRM_MESSAGE
+                await self._accept_plate_chars()
+                return
+            if self.summary_mode:
+                await self._acknowledge_plate_chars()
+                return
+            self.waiting_for_confirmation = True
+            await self._say_clips(
+                "i_have", *chunk.chars, "is_that_right",
+                text=f"I have {', '.join(chunk.chars)}. Is that right?"
+            )
+            return
+
+        normalized = normalize_letter_pronunciations(message, expect=expected_kind(self.letter_index))
         if not normalized:
             #await self.session.say("No entendí esa letra. ¿Puedes repetirla por favor?")
-            await self.session.say("I didn't catch that letter. Can you repeat it, please?")
+            await self._say_clips("repeat_letter")
             #await self.session.generate_reply("No entendí esa letra. ¿Puedes repetirla por favor?")
             return
 
         letra = normalized[0]
         self.last_value = letra
+        if self.summary_mode:
+            await self._acknowledge_plate_chars()
+            return
         self.waiting_for_confirmation = True
         #await self.session.generate_reply(f"¿La letra es {letra}?",)
         #await self.session.say(f"¿La letra es {letra}?")
-        await self.session.say(f"Is the letter {letra}?")
+        await self._say_clips("is_the_letter", letra, text=f"Is the letter {letra}?")
+
+    async def _acknowledge_plate_chars(self):
+        """Modo resumen: repite lo que oyo sin preguntar y sigue; la placa se revisa en el resumen."""
+        chars = self.last_value
+        await self._say_clips("i_have", *chars, text=f"I have {', '.join(chars)}.")
+        await self._accept_plate_chars()
+
+    async def _accept_plate_chars(self):
+        """Agrega a la placa los caracteres confirmados (uno o un grupo) y pide lo que sigue."""
+        self.waiting_for_confirmation = False
+        self.partial_plate.extend(self.last_value)
+        self.letter_index += len(self.last_value)
+        if self.letter_index == PLATE_LETTERS:
+            #await self.session.generate_reply("Ahora vamos con los números. Dime el primer número.")
+            #await self.session.say("Ahora vamos con los números. Dime el primer número.")
+            await self._say_clips("move_to_numbers")
+        elif self.letter_index == PLATE_LENGTH:
+            # Arma la placa completa
+            plate_str = "".join(self.partial_plate)
+            plate = f"{plate_str[:3]}-{plate_str[3:]}"
+            if not is_valid_plate(plate):
+                #await self.session.generate_reply(
+                #    "Hmm, no entendí bien la placa completa. Vamos a repetir todo desde el principio. Dime la primera letra."
+                #)
+                #await self.session.say("Hmm, no entendí bien la placa completa. Vamos a repetir todo desde el principio. Dime la primera letra.")
+                await self._say_clips("restart_plate")
+                self.partial_plate = []
+                self.letter_index = 0
+                return
+            setattr(self.data, FIELD_SPECS[self.current_plate_type].attr, plate)
+            self._speculate_next_ask()
+            formatted_value = self._format_value(self.current_field, plate)
+            self.in_letter_mode = False
+            if self.confirmation_policy.should_skip(self.current_field, True, self.plate_confidence):
+                await self._confirm_implicitly(formatted_value)
+                return
+            #await self.session.generate_reply(
+            #    CONFIRM_MESSAGE.format(field_name=self.current_field.value, value=formatted_value)
+            #)
+            await self._say_template(
+                FIELD_SPECS[self.current_field].confirm,
+                field_name=self.current_field.value,
+                value=formatted_value
+            )
+            self.waiting_for_confirmation = True
+        else:
+            tipo = "letter" if self.letter_index < PLATE_LETTERS else "number"
+            #tipo = "letra" if self.letter_index < 3 else "número"
+            await self._say_clips(f"next_{tipo}")
+            #await self.session.say(f"Dame la siguiente {tipo}.")
+            #await self.session.generate_reply(f"Dame la siguiente {tipo}.")
+
     async def handle_confirmation(self, message: str):
-        message = message.lower().strip()
+        # "Yes.", "yeah", "sí, está bien", "no, es 1556": sin ASI1 salvo que no se entienda
+        def corrects(remainder: str) -> bool:
+            # "yes, it is 1556": solo un campo a la vez, no la lectura conjunta ni el resumen
+            if self.pending_slots or self.confirming_summary or self.confirming_prior:
+                return False
+            return self._correction(message, remainder) is not None
+
+        reply = classify_confirmation(message, corrects)
+        metrics.incr(f"confirmation_{reply.label}")
+        if self.confirming_prior and reply.label != AFFIRM:
+            # "the trailer is 88 now", "new plates": se cambia solo lo que nombro
+            named = mentioned_fields(message, self.pending_slots)
+            if named or reply.label in (DENY, CORRECTION):
+                self.speculation.discard()
+                await self._update_prior_fields(message, named)
+                return
+        if self.confirming_summary and reply.label != AFFIRM:
+            # "the trailer number is wrong", "the ETA is 18:30": solo se rehace lo que nombro
+            named = mentioned_fields(message, self.implicitly_confirmed)
+            if named or reply.label in (DENY, CORRECTION):
+                self.waiting_for_confirmation = False
+                self.confirming_summary = False
+                self.speculation.discard()
+                await self._reopen_implicit_fields(message, named)
+                return
         #if message in ["sí", "sí está bien", "correcto", "está bien", "sí, avanza"]:
-        if message in ["yes", "that's right", "correct", "it's good", "yes, go ahead"]:
+        if reply.label == AFFIRM:
             self.waiting_for_confirmation = False
-            if self.in_letter_mode:
-                self.partial_plate.append(self.last_value)
-                self.letter_index += 1
-                if self.letter_index == 3:
-                    #await self.session.generate_reply("Ahora vamos con los números. Dime el primer número.")
-                    #await self.session.say("Ahora vamos con los números. Dime el primer número.")
-                    await self.session.say("Now let's move to the numbers. Tell me the first number.")
-                elif self.letter_index == 7:
-                    # Arma la placa completa
-                    plate_str = "".join(self.partial_plate)
-                    plate = f"{plate_str[:3]}-{plate_str[3:]}"
-                    if not self._is_valid_plate(plate):
-                        #await self.session.generate_reply(
-                        #    "Hmm, no entendí bien la placa completa. Vamos a repetir todo desde el principio. Dime la primera letra."
-                        #)
-                        #await self.session.say("Hmm, no entendí bien la placa completa. Vamos a repetir todo desde el principio. Dime la primera letra.")
-                        await self.session.say("Hmm, I didn't quite get the full plate. Let's start over from the beginning. Tell me the first letter.")
-                        self.partial_plate = []
-                        self.letter_index = 0
-                        return
-                    if self.current_plate_type == DataField.TRACTOR_PLATES:
-                        self.data.tractor_plates = plate
-                    else:
-                        self.data.trailer_plates = plate
-                    formatted_value = self._format_value(self.current_field, plate)
-                    #await self.session.generate_reply(
-                    #    CONFIRM_MESSAGE.format(field_name=self.current_field.value, value=formatted_value)
-                    #)
-                    response = self.asi1_llm.generate(
-                        CONFIRM_MESSAGE.format(
-                            field_name=self.current_field.value,
-                            value=formatted_value
-                        )
-                    )
-                    await self.session.say(response)
-                    self.waiting_for_confirmation = True
-                    self.in_letter_mode = False
-                    return
-                else:
-                    tipo = "letter" if self.letter_index < 3 else "number"
-                    #tipo = "letra" if self.letter_index < 3 else "número"
-                    await self.session.say(f"Give me the next {tipo}.")
-                    #await self.session.say(f"Dame la siguiente {tipo}.")
-                    #await self.session.generate_reply(f"Dame la siguiente {tipo}.")
+            if self.confirming_summary:
+                self.confirming_summary = False
+                await self._finish_call()
+            elif self.pending_slots:
+                self.pending_slots = []
+                self.confirming_prior = False
+                await self._ask_next()
+            elif self.in_letter_mode:
+                await self._accept_plate_chars()
             else:
                 # avanzar al siguiente campo si la confirmacion es correcta
-                self.fields_to_collect.remove(self.current_field)
-                if self.fields_to_collect:
-                    self.current_field = self.fields_to_collect[0]
-                    remaining = len(self.fields_to_collect)
-                    response = self.asi1_llm.generate(
-                        ASK_MESSAGE.format(
-                            field_name=self.current_field.value,
-                            remaining=remaining
-                        )
-                    )
-                    await self.session.say(response)
-                else:
-                    await self.save_driver_data()
-                    #await self.session.say("¡Perfecto, ya tengo todos tus datos! Gracias, ¡que tengas buen viaje!")
-                    await self.session.say("Perfect, I have all your info! Thanks, and have a great trip!")
-                    self.current_field = None
+                await self._advance_field()
 
         #elif message in ["no", "no está bien", "corrige", "incorrecto"]:
-        elif message in ["no", "that's not right", "fix it", "incorrect"]:
+        elif reply.label in (DENY, CORRECTION):
             self.waiting_for_confirmation = False
+            if self.pending_slots:
+                self.speculation.discard()
+                await self._reopen_slots()
+                return
+            # El siguiente campo sigue siendo el mismo: el ASK especulado aun sirve
+            if reply.label == CORRECTION and await self._apply_correction(message, reply.remainder):
+                return
+            self.speculation.discard()
+            if self.in_letter_mode and len(self.last_value or "") > 1:
+                # Un grupo rechazado: el resto de esta placa va caracter por caracter
+                self.single_char_mode = True
             #await self.session.say("Ok, dime nuevamente esa letra o número.")
-            await self.session.say("Okay, tell me that letter or number again.")
+            await self._say_clips("say_again")
             #await self.session.generate_reply("Ok, dime nuevamente esa letra o número.")
+        elif self.confirming_prior:
+            await self.offer_prior_registration()
+        elif self.confirming_summary:
+            # No se entendio la respuesta al resumen: se lee otra vez, no se pide el ultimo campo
+            await self.session.say(SUMMARY_CONFIRM_MESSAGE.format(items=self._read_back(self.implicitly_confirmed)))
         else:
-            response = self.asi1_llm.generate(
-                OFF_TOPIC_MESSAGE.format(field_name=self.current_field.value)
+            await self._say_template(
+                OFF_TOPIC_MESSAGE,
+                field_name=self.current_field.value
             )
-            await self.session.say(response)
             #await self.session.generate_reply(
             #    OFF_TOPIC_MESSAGE.format(field_name=self.current_field.value)
             #)
 
-    def _is_valid_plate(self, plate: str) -> bool:
-        # Simple validation for plates (e.g., ABC-1234 or XY-1234)
-        parts = plate.strip().split('-')
-        if len(parts) != 2:
+    def _correction(self, message: str, remainder: str) -> Correction | None:
+        """Correccion que la frase trae para el valor que se esta confirmando (ver corrections)."""
+        if self.in_letter_mode:
+            kind, current, start = kinds.PLATE_CHUNK, self.last_value or "", self.letter_index
+        else:
+            kind, current, start = FIELD_SPECS[self.current_field].kind, self._field_value(self.current_field), 0
+        return extract_correction(kind, current, message, remainder, start=start)
+
+    async def _apply_correction(self, message: str, remainder: str) -> bool:
+        """
+        "no, es 1556", "no, la ultima letra es D": aplica la correccion al valor que se
+        estaba confirmando y pregunta solo por lo que cambio. False si no se pudo leer o
+        si el valor corregido no pasa el validador del campo.
+        """
+        correction = self._correction(message, remainder)
+        if correction is None:
             return False
-        letters, numbers = parts
-        return len(letters) in [2, 3] and letters.isalpha() and len(numbers) == 4 and numbers.isdigit()
-        
-    def _is_valid_eta(self, eta: str) -> bool:
-        # Validate ETA format (HH:MM)
-        try:
-            hours, minutes = map(int, eta.split(':'))
-            return 0 <= hours <= 23 and 0 <= minutes <= 59
-        except (ValueError, AttributeError):
+        if not self.in_letter_mode and not FIELD_SPECS[self.current_field].validate(correction.value)[0]:
+            # Lo que se entendio no tiene el formato del campo: se pide otra vez
+            metrics.incr("inline_corrections_rejected")
             return False
+        metrics.incr("inline_corrections")
+        self.last_value = correction.value
+        if not self.in_letter_mode:
+            setattr(self.data, FIELD_SPECS[self.current_field].attr, correction.value)
+        self.waiting_for_confirmation = True
+        if correction.position is not None:
+            await self.session.say(CORRECTED_CHAR_MESSAGE.format(old=correction.old, new=correction.new))
+        else:
+            value = self._format_value(self.current_field, correction.value)
+            await self.session.say(CORRECTED_VALUE_MESSAGE.format(value=value))
+        return True
+
+    async def _advance_field(self):
+        """Da por confirmado el campo actual y pregunta el siguiente (o cierra la llamada)."""
+        self.fields_to_collect.remove(self.current_field)
+        await self._ask_next()
+
+    async def _ask_next(self):
+        """Pregunta el primer campo que falta; sin campos, el resumen o el cierre."""
+        if self.fields_to_collect:
+            self.current_field = self.fields_to_collect[0]
+            remaining = len(self.fields_to_collect)
+            await self._say_template(
+                FIELD_SPECS[self.current_field].ask,
+                field_name=self.current_field.value,
+                remaining=remaining
+            )
+        elif self.implicitly_confirmed:
+            # Lo que se acepto sin preguntar se repasa una vez antes de guardar
+            self.confirming_summary = True
+            self.waiting_for_confirmation = True
+            await self.session.say(SUMMARY_CONFIRM_MESSAGE.format(items=self._read_back(self.implicitly_confirmed)))
+        else:
+            await self._finish_call()
+
+    async def _confirm_implicitly(self, formatted_value: str):
+        """Confirmacion corta sin pregunta ("Got it, 17:45.") y directo al siguiente campo."""
+        self.implicitly_confirmed.append(self.current_field)
+        await self.session.say(IMPLICIT_CONFIRM_MESSAGE.format(value=formatted_value))
+        await self._advance_field()
+
+    async def _reopen_implicit_fields(self, message: str, named: List[DataField]):
+        """
+        El usuario corrigio el resumen. Lo que nombro con su valor nuevo ("the ETA is
+        18:30") se corrige ahi mismo; lo que nombro sin valor, o todo si no nombro nada,
+        se pide otra vez. Fuera del modo resumen lo reabierto se confirma campo por campo.
+        """
+        fields = named or list(self.implicitly_confirmed)
+        corrected = fill_slots(message, named) if named else {}
+        for field, slot in corrected.items():
+            setattr(self.data, FIELD_SPECS[field].attr, slot.value)
+        metrics.incr("summary_fields_reopened", len(fields))
+        reopened = [field for field in fields if field not in corrected]
+        self.implicitly_confirmed = [field for field in self.implicitly_confirmed if field not in reopened]
+        self.fields_to_collect = list(reopened)
+        if not self.summary_mode:
+            for field in reopened:
+                self.confirmation_policy.thresholds[field] = None
+        if not reopened:
+            # Todo se corrigio en la misma frase: se lee el resumen otra vez
+            await self._ask_next()
+            return
+        self.current_field = self.fields_to_collect[0]
+        await self.session.say(SUMMARY_REOPEN_MESSAGE)
+        await self._say_template(
+            FIELD_SPECS[self.current_field].ask,
+            field_name=self.current_field.value,
+            remaining=len(self.fields_to_collect)
+        )
+
+    async def _finish_call(self):
+        saved = await self.save_driver_data()
+        # Si no se guardo, el checkpoint queda: un reintento empieza en el resumen, no de cero
+        if saved and self.checkpoints and self.checkpoint_key:
+            self.checkpoints.delete(self.checkpoint_key)
+        #await self.session.say("¡Perfecto, ya tengo todos tus datos! Gracias, ¡que tengas buen viaje!")
+        await self.session.say("Perfect, I have all your info! Thanks, and have a great trip!")
+        self.current_field = None
+        metrics.incr("calls_completed")
+        metrics.observe("turns_per_call", self.user_turns)
+        # La despedida ya se dijo (say espera el playout): nadie mas va a llamar a end_call
+        await self.hangup()
+
+    def _read_back(self, fields: List[DataField]) -> str:
+        return ", ".join(
+            f"{FIELD_NAMES_EN.get(field.value, field.value)} {self._format_value(field, self._field_value(field))}"
+            for field in fields
+        )
+
+    def _field_value(self, field: DataField) -> str:
+        return getattr(self.data, FIELD_SPECS[field].attr) or ""
 
     def _format_value(self, field: DataField, value: str) -> str:
-        if field in [DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES]:
-            return ' '.join(value).upper()
-        elif field == DataField.ETA:
-            return value.zfill(5)  # Ensure HH:MM format
-        return value
+        return FIELD_SPECS[field].format(value)
     
-    async def save_driver_data(self):
-        data = {
-            "name": self.data.name or "",
-            "tractor_number": self.data.tractor_number or "",
-            "tractor_plates": self.data.tractor_plates or "",
-            "trailer_number": self.data.trailer_number or "",
-            "trailer_plates": self.data.trailer_plates or "",
-            "eta": self.data.eta or "",
-            "email" : self.data.email or ""
-        }
+    async def _call_mcp_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        """Llama directo (sin el LLM) una herramienta de los servidores MCP de la sesion."""
+        for server in self.session.mcp_servers or []:
+            if not server.initialized:
+                await server.initialize()
+            for tool in await server.list_tools():
+                if get_raw_function_info(tool).name == name:
+                    return await tool(arguments)
+        raise ToolError(f"ningun servidor MCP tiene la herramienta {name}")
+
+    async def save_driver_data(self) -> bool:
+        """Guarda el registro con la herramienta save_driver_data de services/server.py; False si fallo."""
+        data = {spec.attr: getattr(self.data, spec.attr) or "" for spec in FIELD_SPECS.values()}
+        # El telefono es la llave del registro anterior en la siguiente llamada (ver registrations)
+        data["phone_number"] = self.phone_number or ""
         try:
             logger.debug("Calling save_driver_data with data: %s", data)
-            result = await self.session.call_tool("save_driver_data", {"data": data})
+            result = await self._call_mcp_tool("save_driver_data", {"data": data})
             logger.info("Tool response: %s", result)
         except Exception as e:
             logger.error("Error calling save_driver_data tool: %s", str(e))
             #await self.session.generate_reply("Hummm, hubo un problema al guardar tus datos. ¡Pero no te preocupes, ya los tengo anotados!")
             #await self.session.say("Hummm, hubo un problema al guardar tus datos. ¡Pero no te preocupes, ya los tengo anotados!")
             await self.session.say("Hmm, there was an issue saving your data. But don't worry, I have it noted down!")
+            metrics.incr("save_failures")
+            return False
+        # Solo lo que el servidor confirmo que guardo sirve para pre-llenar la siguiente llamada
+        registration_index.record(self.phone_number, data)
+        return True
 
     def set_participant(self, participant: rtc.RemoteParticipant):
         self.participant = participant
@@ -300,17 +1018,22 @@ class VoiceAgent(Agent):
     
     @function_tool()
     async def reschedule_call(self, ctx: RunContext, delay_seconds: str):
+        """Called when the user asks to be called back later. delay_seconds: whole seconds until the callback, e.g. "1200"."""
         log_entry = f"[Reschedule] {self.participant.identity} requested callback on {delay_seconds}"
         logger.info(log_entry)
         self.transcript_log.append(log_entry)
+        # El job que lanza retry_call trae la misma dial_info y retoma desde aqui
+        self._checkpoint()
         try:
-            requests.post(
-                "http://localhost:8001/retry_call", 
+            # Por el pool de aiohttp: requests.post bloquearia el event loop de todas las llamadas
+            async with get_http_session().post(
+                "http://localhost:8001/retry_call",
                 json={
                     "dial_info": self.dial_info,
                     "delay": delay_seconds
-                }   
-            )
+                }
+            ) as response:
+                response.raise_for_status()
             logger.info(f"Petición enviada al backend para reintentar en {delay_seconds} segundos")
         except Exception as e:
             logger.error(f"Fallo al contactar backend: {e}")
@@ -0,0 +1,11 @@
+'''
+Benchmarks Package
+
+Suite de rendimiento del agente. Ejecutar desde voice_agent_v2/, por ejemplo:
+    python -m benchmarks.bench_event_loop_lag --sessions 20
+    python -m benchmarks.load_test --conversations 300 --concurrency 100
+
+load_test corre conversaciones simuladas de VoiceAgent contra asi1_stub (stand-in
+local de ASI1 con latencia, errores, streaming y record/replay) y es la prueba de
+referencia; los bench_* miden piezas aisladas.
+'''
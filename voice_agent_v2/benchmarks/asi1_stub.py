@@ -0,0 +1,327 @@
+"""
+Servidor local que reemplaza a https://api.asi1.ai/v1/chat/completions para
+pruebas de carga sin servicios reales.
+
+Modos:
+- synthetic: respuestas fijas con latencia, errores y streaming configurables.
+- record:    reenvia cada peticion a --upstream y guarda la respuesta en el cassette.
+- replay:    responde desde el cassette con los tiempos grabados; si una peticion
+             no esta grabada responde como synthetic.
+
+Distribuciones de latencia (segundos): fixed:0.3, uniform:0.2:0.8,
+normal:0.5:0.1, lognormal:<mediana>:<sigma>.
+
+    python -m benchmarks.asi1_stub --port 8765 --latency lognormal:0.45:0.35 --error-rate 0.02
+    python -m benchmarks.asi1_stub --mode record --cassette benchmarks/cassettes/asi1.json
+    python -m benchmarks.asi1_stub --mode replay --cassette benchmarks/cassettes/asi1.json
+
+Con el servidor arriba, apuntar el agente con ASI1_API_URL=http://127.0.0.1:8765/v1/chat/completions.
+GET /stats devuelve los contadores del servidor.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+import aiohttp
+from aiohttp import web
+
+DEFAULT_UPSTREAM = "https://api.asi1.ai/v1/chat/completions"
+DEFAULT_CONTENT = "Got it. Could you tell me that again, please?"
+# Las peticiones de extraccion (EXTRACT_FIELDS_MESSAGE) esperan JSON
+EXTRACTION_MARKER = "Return ONLY a JSON object"
+EXTRACTION_CONTENT = "{}"
+ERROR_STATUSES = (429, 500, 503)
+# Una peticion "colgada" tarda esto antes de responder: mas que cualquier presupuesto del agente
+HANG_SECONDS = 30.0
+
+
+@dataclass
+class LatencyDistribution:
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, *params = spec.split(":")
+        values = [float(p) for p in params]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f"distribucion de latencia invalida: {spec!r}")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.a
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(self.a, self.b))
+        return rng.lognormvariate(math.log(self.a), self.b)
+
+
+class Cassette:
+    """Respuestas grabadas de ASI1, por hash de (modelo, mensajes)."""
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self.interactions: dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for item in json.load(f)["interactions"]:
+                    self.interactions[item["key"]] = item
+
+    @staticmethod
+    def key(payload: dict) -> str:
+        # stream y temperature no cambian la llave: una grabacion sirve para ambos modos
+        raw = json.dumps({"model": payload.get("model"), "messages": payload.get("messages")}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, payload: dict) -> dict | None:
+        return self.interactions.get(self.key(payload))
+
+    def put(self, payload: dict, content: str, first_token: float, total: float):
+        key = self.key(payload)
+        self.interactions[key] = {
+            "key": key,
+            "request": {"model": payload.get("model"), "messages": payload.get("messages")},
+            "content": content,
+            "first_token": round(first_token, 4),
+            "total": round(total, 4),
+        }
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"interactions": list(self.interactions.values())}, f, ensure_ascii=False, indent=2)
+
+
+class ASI1StubServer:
+    """
+    Servidor aiohttp compatible con /v1/chat/completions (con y sin stream).
+    Se puede levantar en el loop actual (start/stop) o en su propio hilo
+    (with ASI1StubServer(...) as server), para no cargarle trabajo al loop medido.
+    """
+
+    def __init__(
+            self,
+            mode: str = "synthetic",
+            latency: LatencyDistribution | None = None,
+            token_interval: LatencyDistribution | None = None,
+            error_rate: float = 0.0,
+            hang_rate: float = 0.0,
+            content: str = DEFAULT_CONTENT,
+            cassette: str | None = None,
+            upstream: str = DEFAULT_UPSTREAM,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            seed: int | None = None
+        ):
+        if mode not in ("synthetic", "record", "replay"):
+            raise ValueError(f"modo invalido: {mode!r}")
+        self.mode = mode
+        self.latency = latency or LatencyDistribution("fixed", 0.3)
+        self.token_interval = token_interval or LatencyDistribution("fixed", 0.02)
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.content = content
+        self.cassette = Cassette(cassette)
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._client: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1/chat/completions"
+
+    def _synthetic_content(self, payload: dict) -> str:
+        messages = payload.get("messages") or [{}]
+        if EXTRACTION_MARKER in str(messages[-1].get("content", "")):
+            return EXTRACTION_CONTENT
+        return self.content
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        self.stats["requests"] += 1
+        self.stats["stream_requests" if payload.get("stream") else "plain_requests"] += 1
+        if self.mode == "record":
+            return await self._record(request, payload)
+
+        roll = self._rng.random()
+        if roll < self.error_rate:
+            self.stats["errors"] += 1
+            await asyncio.sleep(self.latency.sample(self._rng))
+            return web.json_response({"error": "stub error"}, status=self._rng.choice(ERROR_STATUSES))
+        if roll < self.error_rate + self.hang_rate:
+            self.stats["hangs"] += 1
+            await asyncio.sleep(HANG_SECONDS)
+
+        recorded = self.cassette.get(payload) if self.mode == "replay" else None
+        if recorded is not None:
+            self.stats["replay_hits"] += 1
+            content = recorded["content"]
+            first_token = recorded["first_token"]
+            words = max(1, len(content.split(" ")))
+            interval = max(0.0, recorded["total"] - first_token) / words
+            intervals = [interval] * words
+        else:
+            if self.mode == "replay":
+                self.stats["replay_misses"] += 1
+            content = self._synthetic_content(payload)
+            first_token = self.latency.sample(self._rng)
+            intervals = [self.token_interval.sample(self._rng) for _ in content.split(" ")]
+
+        await asyncio.sleep(first_token)
+        if payload.get("stream"):
+            return await self._stream(request, content, intervals)
+        await asyncio.sleep(sum(intervals))
+        return web.json_response({"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    async def _stream(self, request: web.Request, content: str, intervals: list[float]) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i, word in enumerate(content.split(" ")):
+            if i:
+                await asyncio.sleep(intervals[i % len(intervals)])
+            delta = {"choices": [{"delta": {"content": word if i == 0 else " " + word}}]}
+            await response.write(f"data: {json.dumps(delta)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def _record(self, request: web.Request, payload: dict) -> web.StreamResponse:
+        """Pide la respuesta completa al upstream, la graba y la devuelve en el formato pedido."""
+        headers = {"Authorization": request.headers.get("Authorization", ""), "Content-Type": "application/json"}
+        upstream_payload = {**payload, "stream": True}
+        start = time.perf_counter()
+        first_token = None
+        parts: list[str] = []
+        try:
+            async with self._client.post(self.upstream, headers=headers, json=upstream_payload) as response:
+                if response.status != 200:
+                    self.stats["upstream_errors"] += 1
+                    return web.Response(status=response.status, text=await response.text())
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = line[len("data:"):].strip()
+                    if chunk == "[DONE]":
+                        break
+                    delta = (json.loads(chunk).get("choices") or [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+                        parts.append(delta)
+        except aiohttp.ClientError as e:
+            self.stats["upstream_errors"] += 1
+            return web.json_response({"error": str(e)}, status=502)
+        total = time.perf_counter() - start
+        content = "".join(parts).strip()
+        self.cassette.put(payload, content, first_token or total, total)
+        self.cassette.save()
+        self.stats["recorded"] += 1
+        if payload.get("stream"):
+            return await self._stream(request, content, [0.0])
+        return web.json_response({"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._handle)
+        app.router.add_get("/stats", self._handle_stats)
+        if self.mode == "record":
+            self._client = aiohttp.ClientSession()
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._client is not None:
+            await self._client.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self.start())
+        self._ready.set()
+        self._loop.run_forever()
+
+    def __enter__(self):
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--mode", choices=("synthetic", "record", "replay"), default="synthetic")
+    parser.add_argument("--latency", default="lognormal:0.45:0.35", help="tiempo al primer token")
+    parser.add_argument("--token-interval", default="fixed:0.02", help="tiempo entre palabras en streaming")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraccion de respuestas 429/500/503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help=f"fraccion de peticiones que tardan {HANG_SECONDS:.0f}s")
+    parser.add_argument("--cassette", default=None, help="archivo JSON para record/replay")
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def server_from_args(args: argparse.Namespace, port: int = 0) -> ASI1StubServer:
+    return ASI1StubServer(
+        mode=args.mode,
+        latency=LatencyDistribution.parse(args.latency),
+        token_interval=LatencyDistribution.parse(args.token_interval),
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        cassette=args.cassette,
+        upstream=args.upstream,
+        port=port,
+        seed=args.seed,
+    )
+
+
+async def _serve_forever(server: ASI1StubServer):
+    await server.start()
+    print(f"ASI1 stub ({server.mode}) en {server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(server_from_args(args, port=args.port)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
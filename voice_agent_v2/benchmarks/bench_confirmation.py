@@ -0,0 +1,112 @@
+"""
+Clasificador de confirmaciones (agents/confirmation_classifier.py) contra la lista
+exacta de VoiceAgent.handle_confirmation: exactitud sobre respuestas etiquetadas a
+"¿es correcto?" (de logs/ y variantes en ingles), cuantas habrian terminado en el
+OFF_TOPIC_MESSAGE de ASI1, y costo por llamada.
+
+    python -m benchmarks.bench_confirmation
+"""
+import time
+from agents.confirmation_classifier import AFFIRM, CORRECTION, DENY, UNKNOWN, classify_confirmation
+from .transcripts import user_replies_to
+
+LEGACY_YES = ["yes", "that's right", "correct", "it's good", "yes, go ahead"]
+LEGACY_NO = ["no", "that's not right", "fix it", "incorrect"]
+
+# (respuesta, etiqueta esperada)
+LABELED = [
+    # De logs/
+    ("Sí.", AFFIRM),
+    ("Sí, es correcto.", AFFIRM),
+    ("Sí, es ese.", AFFIRM),
+    ("Si son correctos.", AFFIRM),
+    ("Sí, son las correctas.", AFFIRM),
+    ("Y ahora sí son correctas.", AFFIRM),
+    ("Sí, fue error mío.", AFFIRM),
+    ("Sí, sería esa hora.", AFFIRM),
+    ("Sí, ese sería.", AFFIRM),
+    ("De acuerdo.", AFFIRM),
+    ("Sí, estaría.", AFFIRM),
+    ("Exacto.", AFFIRM),
+    ("Sí, es correcto. ¿Me lo puedes decir?", AFFIRM),
+    ("No.", DENY),
+    ("No", DENY),
+    ("No. No.", DENY),
+    ("No, no, no, está mal.", DENY),
+    ("Está mal, sigue estando mal.", DENY),
+    ("No siguen estando mal.", DENY),
+    ("No, diecisiete cuarenta y cinco.", CORRECTION),
+    ("No, sería la letra T.", CORRECTION),
+    ("No, la única letra que está mal es la P. Sería la letra P.", CORRECTION),
+    ("En vez de la F va la S", CORRECTION),
+    ("En vez de la L es F.", CORRECTION),
+    ("Sí, pero va sin la n, lo demás está bien.", CORRECTION),
+    ("Sí, pero le hacen falta las letras \"X\".", CORRECTION),
+    ("Falta la letra P.", CORRECTION),
+    ("La letra L no va, sino más bien es la letra G.", CORRECTION),
+    ("No, las letras no están bien, los números sí.", CORRECTION),
+    ("La única letra que está bien es la A.", UNKNOWN),
+    ("Otra vez.", UNKNOWN),
+    ("Mmm.", UNKNOWN),
+    ("¿Quién?", UNKNOWN),
+    ("Hola", UNKNOWN),
+    # Ingles
+    ("Yes.", AFFIRM),
+    ("Yeah", AFFIRM),
+    ("Yep, that's right!", AFFIRM),
+    ("exactto", AFFIRM),
+    ("Correct.", AFFIRM),
+    ("corect", AFFIRM),
+    ("Sure, go ahead.", AFFIRM),
+    ("Sí, está bien", AFFIRM),
+    ("Nope.", DENY),
+    ("That's not right.", DENY),
+    ("No, it's wrong", DENY),
+    ("No, it's 1556", CORRECTION),
+    ("No, the last letter is D", CORRECTION),
+    ("Actually it's 17:30", CORRECTION),
+    ("Can you repeat that?", UNKNOWN),
+]
+CONFIRM_KEYWORDS = ("correcto", "correct")
+
+
+def legacy_label(text: str) -> str:
+    message = text.lower().strip()
+    if message in LEGACY_YES:
+        return AFFIRM
+    if message in LEGACY_NO:
+        return DENY
+    return UNKNOWN
+
+
+def per_call_us(fn, utterances: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def main():
+    # La correccion se compara como "no" en la version anterior (no sabia distinguirla)
+    legacy_ok = sum(legacy_label(text) == (DENY if label == CORRECTION else label) for text, label in LABELED)
+    engine_ok = sum(classify_confirmation(text).label == label for text, label in LABELED)
+    print(f"labeled: legacy correct={legacy_ok} of {len(LABELED)}  classifier correct={engine_ok} of {len(LABELED)}")
+    for text, label in LABELED:
+        reply = classify_confirmation(text)
+        extra = f" remainder={reply.remainder!r}" if reply.remainder else ""
+        print(f"  {'ok   ' if reply.label == label else 'WRONG'} {text[:48]!r:50} -> {reply.label}:{reply.score:.2f}{extra} (expected {label})")
+
+    utterances = user_replies_to(CONFIRM_KEYWORDS)
+    legacy_llm = sum(legacy_label(text) == UNKNOWN for text in utterances)
+    engine_llm = sum(classify_confirmation(text).label == UNKNOWN for text in utterances)
+    legacy = per_call_us(legacy_label, utterances, 50)
+    engine = per_call_us(classify_confirmation, utterances, 50)
+    print(
+        f"log confirmation replies: {len(utterances)}  sent to ASI1: legacy={legacy_llm} classifier={engine_llm}  "
+        f"legacy={legacy:.1f} us/call  classifier={engine:.1f} us/call"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Parser de correos dictados (agents/email_parser.py) contra lo que se hacia antes
+(guardar la frase del STT tal cual; extraction.py solo quitaba espacios y la validaba
+con una regex): cuantos correos etiquetados salen bien y validos en el mismo turno,
+y costo por llamada sobre las respuestas de logs/ a la pregunta del correo.
+
+    python -m benchmarks.bench_email_parser
+"""
+import re
+import time
+from agents.email_parser import email_parser, parse_spoken_email
+from .transcripts import user_replies_to
+
+# (frase, correo esperado)
+LABELED = [
+    # De logs/
+    ("Mi correo es jorgeoctavionicolasdiaz@gmail.com", "jorgeoctavionicolasdiaz@gmail.com"),
+    ("Es jorgeoctavionicolasdiaz@gmail.com", "jorgeoctavionicolasdiaz@gmail.com"),
+    ("soulgamer.negro@gmail.com", "soulgamer.negro@gmail.com"),
+    ("Número cero, letra s minúscula y letra g minúscula @gmail.com.", "0sg@gmail.com"),
+    ("jorgeoctavionicolas10@gmail.com", "jorgeoctavionicolas10@gmail.com"),
+    # Dictados con arroba/punto y alfabetos de deletreo
+    ("soulgamer punto negro arroba gmail punto com", "soulgamer.negro@gmail.com"),
+    ("jorge punto nicolas arroba gmail", "jorge.nicolas@gmail.com"),
+    ("te cuatro uve cero ese ge arroba gmail punto com", "t4v0sg@gmail.com"),
+    ("Letra t minúscula, número cuatro, letra v, cero, ese, ge arroba gmail", "t4v0sg@gmail.com"),
+    ("jota de jirafa, o de oso, ere, ge, e arroba hotmail punto com", "jorge@hotmail.com"),
+    ("my email is john dot smith at outlook dot com", "john.smith@outlook.com"),
+    ("J for Jet, O for Orange, E for Elephant at yahoo dot com", "joe@yahoo.com"),
+    ("john underscore doe at gmail", "john_doe@gmail.com"),
+    ("juan guion bajo perez arroba gmial punto com", "juan_perez@gmail.com"),
+    ("ana arroba hotmail punto com punto mx", "ana@hotmail.com.mx"),
+    ("pedro diez arroba outlook", "pedro10@outlook.com"),
+    ("maria guion lopez arroba yahoo punto com punto mx", "maria-lopez@yahoo.com.mx"),
+    ("be de burro, eme, uno, dos arroba live punto com", "bm12@live.com"),
+]
+EMAIL_KEYWORDS = ("correo", "email")
+LEGACY_RE = re.compile(r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$")
+
+
+def legacy_email(text: str) -> str | None:
+    """extraction._normalize antes del parser: minusculas, sin espacios y la regex."""
+    value = text.lower().replace(" ", "")
+    return value if LEGACY_RE.match(value) else None
+
+
+def parsed_email(text: str) -> str | None:
+    email = parse_spoken_email(text)
+    return email.address if email is not None and email.valid else None
+
+
+def per_call_us(fn, utterances: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def main():
+    legacy_ok = sum(legacy_email(text) == expected for text, expected in LABELED)
+    parser_ok = sum(parsed_email(text) == expected for text, expected in LABELED)
+    print(f"labeled: legacy correct={legacy_ok} of {len(LABELED)}  parser correct={parser_ok} of {len(LABELED)}")
+    for text, expected in LABELED:
+        email = parse_spoken_email(text)
+        got = parsed_email(text)
+        confidence = f"{email.confidence:.2f}" if email else "-"
+        print(f"  {'ok   ' if got == expected else 'WRONG'} {text[:52]!r:54} -> {got or '-'} ({confidence})")
+
+    # Frases que necesitan el turno siguiente: lo de antes de la arroba y luego el dominio
+    first = parse_spoken_email("jorge punto nicolas")
+    second = parse_spoken_email("gmail punto com", local=first.local)
+    print(f"two turns: 'jorge punto nicolas' + 'gmail punto com' -> {second.address} valid={second.valid}")
+
+    utterances = user_replies_to(EMAIL_KEYWORDS)
+    legacy = per_call_us(legacy_email, utterances, 50)
+    engine = per_call_us(parsed_email, utterances, 50)
+    print(
+        f"log email replies: {len(utterances)}  legacy={legacy:.1f} us/call  parser={engine:.1f} us/call  "
+        f"known domains={len(email_parser.trie.domains)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Parser local de ETA: cuantas respuestas de ETA de logs/ se resuelven sin ASI1,
+exactitud sobre un set etiquetado y costo por llamada.
+
+    python -m benchmarks.bench_eta_parser
+"""
+import time
+from datetime import datetime
+from agents.normalization import parse_eta
+from .transcripts import user_replies_to
+
+# Hora fija para que la regla de "siguiente ocurrencia" sea reproducible
+NOW = datetime(2025, 7, 10, 10, 0)
+
+LABELED = [
+    ("Diecisiete cuarenta y cinco.", "17:45"),
+    ("Cero cero treinta.", "00:30"),
+    ("Veintitrés treinta.", "23:30"),
+    ("Es a las tres y cincuenta.", "15:50"),
+    ("No, es a las 23:30", "23:30"),
+    ("tres quince de la tarde", "15:15"),
+    ("dieciséis cero cero", "16:00"),
+    ("a las tres y media de la tarde", "15:30"),
+    ("las cinco menos cuarto", "16:45"),
+    ("a las ocho de la mañana", "08:00"),
+    ("a las doce de la noche", "00:00"),
+    ("en dos horas", "12:00"),
+    ("en una hora y media", "11:30"),
+    ("quarter past three", "15:15"),
+    ("half past noon", "12:30"),
+    ("ten to four", "15:50"),
+    ("in two hours", "12:00"),
+    ("in half an hour", "10:30"),
+    ("nine oh five pm", "21:05"),
+    ("fifteen hundred", "15:00"),
+    ("around 4:30 in the afternoon", "16:30"),
+    ("Llámame en diez segundos.", None),
+    ("Jorge Octavio", None),
+]
+
+ETA_KEYWORDS = ("eta", "hora estimada", "llegada", "arrival")
+
+
+def main():
+    utterances = [t for t in user_replies_to(ETA_KEYWORDS) if t.strip(" .¡!¿?").lower() not in ("sí", "si", "yes")]
+    resolved = sum(1 for text in utterances if parse_eta(text, NOW) is not None)
+    print(f"log ETA replies: {len(utterances)}, resolved locally: {resolved}")
+
+    rounds = 500
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            parse_eta(text, NOW)
+    print(f"local parse cost: {(time.perf_counter() - start) / (rounds * len(utterances)) * 1e6:.1f} us/call")
+
+    correct = 0
+    for text, expected in LABELED:
+        got = parse_eta(text, NOW)
+        correct += got == expected
+        print(f"  {'ok   ' if got == expected else 'WRONG'} {text!r} -> {got} (expected {expected})")
+    print(f"labeled: correct={correct} of {len(LABELED)}")
+
+
+if __name__ == "__main__":
+    main()
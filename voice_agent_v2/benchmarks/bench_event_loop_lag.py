@@ -0,0 +1,57 @@
+"""
+Lag del event loop con N sesiones simuladas llamando a ASI1 en paralelo.
+
+Compara ASI1RequestWrapper.generate (requests, bloqueante) contra agenerate
+(aiohttp, pool compartido). Cada sesion hace varios turnos seguidos, como
+VoiceAgent al confirmar y pedir campos; una tarea aparte mide cuanto se retrasa
+el loop, que es lo que sufren el audio y el VAD de las demas llamadas.
+
+    python -m benchmarks.bench_event_loop_lag --sessions 20 --turns 5 --latency 0.3
+"""
+import argparse
+import asyncio
+import time
+from agents.asi1_agent import ASI1RequestWrapper, close_http_session
+from .common import LagProbe, ThreadedCompletionServer, summarize
+
+
+async def _session(llm: ASI1RequestWrapper, turns: int, blocking: bool):
+    for turn in range(turns):
+        prompt = f"Now confirm the data: número de tractor = {1550 + turn}."
+        if blocking:
+            llm.generate(prompt)
+        else:
+            await llm.agenerate(prompt)
+        await asyncio.sleep(0)
+
+
+async def run(url: str, sessions: int, turns: int, blocking: bool):
+    llm = ASI1RequestWrapper(api_key="bench", url=url)
+    probe = LagProbe()
+    probe.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(_session(llm, turns, blocking) for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    await probe.stop()
+    await close_http_session()
+    return elapsed, probe.samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3, help="latencia simulada de ASI1 en segundos")
+    args = parser.parse_args()
+
+    with ThreadedCompletionServer(latency=args.latency) as server:
+        for label, blocking in (("generate (sync)", True), ("agenerate (async)", False)):
+            elapsed, lag = asyncio.run(run(server.url, args.sessions, args.turns, blocking))
+            calls = args.sessions * args.turns
+            print(f"{label:20s} sessions={args.sessions} calls={calls} wall={elapsed:.2f}s "
+                  f"throughput={calls / elapsed:.1f} req/s")
+            print(f"{'':20s} loop lag {summarize(lag)}")
+
+
+if __name__ == "__main__":
+    main()
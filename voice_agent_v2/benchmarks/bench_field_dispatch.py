@@ -0,0 +1,127 @@
+"""
+Registro de campos (agents/fields.py) contra las cadenas if/elif por DataField que
+tenia VoiceAgent (handle_data_collection, _format_value, _validate y el guardado):
+costo de despachar un turno por campo, segun su lugar en la cadena, con y sin el
+trabajo del validador y del formato.
+
+    python -m benchmarks.bench_field_dispatch
+"""
+import time
+from agents.fields import FIELD_SPECS, is_valid_eta, is_valid_plate
+from agents.email_parser import is_valid_email
+from agents.normalization import parse_eta
+from agents.spoken_numbers import parse_spoken_number
+from models.driver_model import DataField, DriverData
+
+SAMPLE_VALUES = {
+    DataField.NAME: "Jorge Octavio",
+    DataField.TRACTOR_NUMBER: "1555",
+    DataField.TRACTOR_PLATES: "JKL-1234",
+    DataField.TRAILER_NUMBER: "43",
+    DataField.TRAILER_PLATES: "XAZ-1425",
+    DataField.ETA: "17:45",
+    DataField.EMAIL: "driver@gmail.com",
+}
+
+
+def legacy_store(data: DriverData, field: DataField, value: str):
+    if field == DataField.NAME:
+        data.name = value
+    elif field == DataField.TRACTOR_NUMBER:
+        data.tractor_number = value
+    elif field == DataField.TRACTOR_PLATES:
+        data.tractor_plates = value
+    elif field == DataField.TRAILER_NUMBER:
+        data.trailer_number = value
+    elif field == DataField.TRAILER_PLATES:
+        data.trailer_plates = value
+    elif field == DataField.ETA:
+        data.eta = value
+    elif field == DataField.EMAIL:
+        data.email = value
+
+
+def legacy_format(field: DataField, value: str) -> str:
+    if field in [DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES]:
+        return ' '.join(value).upper()
+    elif field == DataField.ETA:
+        return value.zfill(5)
+    return value
+
+
+def legacy_validate(field: DataField, value: str) -> tuple[bool, float]:
+    if field in (DataField.TRACTOR_NUMBER, DataField.TRAILER_NUMBER):
+        spoken = parse_spoken_number(value)
+        return spoken is not None, spoken.confidence if spoken else 0.0
+    if field in (DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES):
+        return is_valid_plate(value), 1.0
+    if field == DataField.ETA:
+        return is_valid_eta(value), 1.0 if parse_eta(value) is not None else 0.8
+    if field == DataField.EMAIL:
+        return is_valid_email(value), 1.0
+    return bool(value.strip()), 1.0
+
+
+def legacy_turn(data: DriverData, field: DataField, value: str):
+    legacy_store(data, field, value)
+    return legacy_format(field, value), legacy_validate(field, value)
+
+
+def registry_turn(data: DriverData, field: DataField, value: str):
+    spec = FIELD_SPECS[field]
+    setattr(data, spec.attr, value)
+    return spec.format(value), spec.validate(value)
+
+
+def legacy_select(field: DataField):
+    """Solo la eleccion de rama de las tres cadenas, sin el trabajo de cada campo."""
+    legacy_store(DUMMY, field, "")
+    if field in [DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES]:
+        pass
+    elif field == DataField.ETA:
+        pass
+    if field in (DataField.TRACTOR_NUMBER, DataField.TRAILER_NUMBER):
+        return
+    if field in (DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES):
+        return
+    if field == DataField.ETA:
+        return
+    if field == DataField.EMAIL:
+        return
+
+
+def registry_select(field: DataField):
+    spec = FIELD_SPECS[field]
+    setattr(DUMMY, spec.attr, "")
+    return spec.format, spec.validate
+
+
+DUMMY = DriverData()
+
+
+def per_call_ns(fn, *args, rounds: int = 100_000) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(*args)
+    return (time.perf_counter() - start) / rounds * 1e9
+
+
+def main():
+    data = DriverData()
+    for field, value in SAMPLE_VALUES.items():
+        assert legacy_turn(data, field, value) == registry_turn(data, field, value), field
+
+    print(f"{'field':22} {'select legacy':>14} {'select registry':>16} {'turn legacy':>12} {'turn registry':>14}")
+    for field, value in SAMPLE_VALUES.items():
+        select_legacy = per_call_ns(legacy_select, field)
+        select_registry = per_call_ns(registry_select, field)
+        turn_legacy = per_call_ns(legacy_turn, data, field, value, rounds=20_000)
+        turn_registry = per_call_ns(registry_turn, data, field, value, rounds=20_000)
+        print(
+            f"{FIELD_SPECS[field].attr:22} {select_legacy:11.0f} ns {select_registry:13.0f} ns "
+            f"{turn_legacy:9.0f} ns {turn_registry:11.0f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Matcher de intents (agents/intents.py) contra los escaneos lineales de antes
+(`any(trigger in text ...)` por cada conjunto de config) sobre las frases de
+usuario de logs/, y como crece el costo por frase con miles de frases disparadoras.
+
+    python -m benchmarks.bench_intents
+"""
+import random
+import time
+from agents import config
+from agents.intents import IntentMatcher
+from .transcripts import user_utterances
+
+PHRASE_SETS = ("REPEAT_REQUESTS", "OFF_TOPIC_TRIGGERS", "WAKE_WORDS")
+SIZES = (30, 300, 3000)
+
+
+def legacy_intents(text: str, phrase_sets: dict[str, set[str]]) -> set[str]:
+    """Un escaneo de subcadenas por conjunto, como is_repeat_request / is_off_topic."""
+    text = text.lower()
+    return {intent for intent, phrases in phrase_sets.items() if any(p in text for p in phrases)}
+
+
+def per_call_us(fn, utterances: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def synthetic_sets(size: int, rng: random.Random) -> dict[str, set[str]]:
+    """Los conjuntos de config mas frases inventadas hasta `size` en total."""
+    sets = {name.lower(): set(getattr(config, name)) for name in PHRASE_SETS}
+    words = [w for phrases in sets.values() for p in phrases for w in p.split()]
+    names = list(sets)
+    while sum(len(s) for s in sets.values()) < size:
+        phrase = " ".join(rng.sample(words, 3)) + f" {rng.randrange(10**6)}"
+        sets[rng.choice(names)].add(phrase)
+    return sets
+
+
+def main():
+    utterances = user_utterances()
+    phrase_sets = {name.lower(): set(getattr(config, name)) for name in PHRASE_SETS}
+    matcher = IntentMatcher(phrase_sets)
+    print(f"log utterances: {len(utterances)}")
+
+    # Acentos ("Sí" vs "si") y limites de palabra ("diecisiete" contiene "si")
+    differ = {
+        text: (legacy_intents(text, phrase_sets), matcher.intents(text))
+        for text in utterances
+        if legacy_intents(text, phrase_sets) != matcher.intents(text)
+    }
+    print(f"distinct utterances where the results differ: {len(differ)}")
+    for text, (old, new) in list(differ.items())[:15]:
+        print(f"  {text[:60]!r}: legacy={sorted(old)} matcher={sorted(new)}")
+
+    rng = random.Random(7)
+    for size in SIZES:
+        sets = synthetic_sets(size, rng)
+        m = IntentMatcher(sets)
+        legacy = per_call_us(lambda t: legacy_intents(t, sets), utterances, 5)
+        engine = per_call_us(m.intents, utterances, 5)
+        print(f"  {size:5} phrases  legacy={legacy:7.1f} us/call  matcher={engine:6.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Reconocedor de letras (agents/letter_recognizer.py) contra la version anterior de
+normalize_letter_pronunciations (mapa exacto de LETTER_MAP_EN y, si no, la inicial
+de cada palabra): exactitud sobre frases de deletreo etiquetadas, tomadas de logs/
+y de pronunciaciones en ingles, y costo por llamada sobre las respuestas de logs/
+a preguntas de placas y letras.
+
+    python -m benchmarks.bench_letter_recognizer
+"""
+import re
+import time
+from agents import config
+from agents.letter_recognizer import letter_recognizer
+from .transcripts import user_replies_to
+
+# (frase, caracter esperado, tipo esperado)
+LABELED = [
+    # De logs/
+    ("Letra A", "A", "letter"),
+    ("Ave águila.", "A", "letter"),
+    ("¿Qué de tigre?", "T", "letter"),
+    ("Es de Francia.", "F", "letter"),
+    ("Efe de Francia.", "F", "letter"),
+    ("Letra equis", "X", "letter"),
+    ("Ve de dedo.", "D", "letter"),
+    ("dedededo", "D", "letter"),
+    ("La M", "M", "letter"),
+    ("Las placas son la letra X.", "X", "letter"),
+    ("Le traje X.", "X", "letter"),
+    ("Letra C?", "C", "letter"),
+    ('Letra "P"', "P", "letter"),
+    ("Letra p minúscula.", "P", "letter"),
+    ("Número cuatro.", "4", "digit"),
+    # Pronunciaciones en ingles del modo letra por letra
+    ("Bee", "B", "letter"),
+    ("Pee.", "P", "letter"),
+    ("B as in ball", "B", "letter"),
+    ("Dee for dog", "D", "letter"),
+    ("Ess", "S", "letter"),
+    ("Why", "Y", "letter"),
+    ("Double u", "W", "letter"),
+    ("Zee", "Z", "letter"),
+    ("Jay.", "J", "letter"),
+    ("Aitch", "H", "letter"),
+    ("Queue", "Q", "letter"),
+    ("Tea", "T", "letter"),
+    ("Five", "5", "digit"),
+    ("Oh", "0", "digit"),
+    ("Burro", "B", "letter"),
+    ("Be de vaca", "V", "letter"),
+]
+LETTER_KEYWORDS = ("letra", "letter", "placas", "plates")
+
+
+def legacy_normalize_letter_pronunciations(text: str) -> str:
+    """normalize_letter_pronunciations antes del reconocedor, como referencia."""
+    normalized = []
+    for word in text.lower().split():
+        cleaned = re.sub(r"[^a-záéíóúñü0-9]", "", word)
+        if cleaned in config.LETTER_MAP_EN:
+            normalized.append(config.LETTER_MAP_EN[cleaned][0])
+        elif cleaned.isdigit():
+            normalized.append(cleaned)
+        elif len(cleaned) >= 1 and cleaned[0].isalpha():
+            normalized.append(cleaned[0].upper())
+    return " ".join(normalized).replace(" ", "")[:1]
+
+
+def recognized(text: str, expect: str | None = None) -> str:
+    candidates = letter_recognizer.recognize(text, expect=expect, limit=1)
+    return candidates[0].letter if candidates else ""
+
+
+def per_call_us(fn, utterances: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def main():
+    legacy_ok = sum(legacy_normalize_letter_pronunciations(text) == char for text, char, _ in LABELED)
+    engine_ok = sum(recognized(text, expect) == char for text, char, expect in LABELED)
+    print(f"labeled: legacy correct={legacy_ok} of {len(LABELED)}  recognizer correct={engine_ok} of {len(LABELED)}")
+    for text, char, expect in LABELED:
+        old = legacy_normalize_letter_pronunciations(text)
+        ranked = letter_recognizer.recognize(text, expect=expect)
+        new = ranked[0].letter if ranked else ""
+        alternatives = " ".join(f"{c.letter}:{c.score:.2f}" for c in ranked)
+        print(f"  {'ok   ' if new == char else 'WRONG'} {text!r:32} legacy={old or '-':2} recognizer=[{alternatives}] (expected {char})")
+
+    utterances = user_replies_to(LETTER_KEYWORDS)
+    letter_recognizer._cache.clear()
+    cold = per_call_us(recognized, utterances, 1)
+    legacy = per_call_us(legacy_normalize_letter_pronunciations, utterances, 50)
+    engine = per_call_us(recognized, utterances, 50)
+    print(
+        f"log letter/plate replies: {len(utterances)}  legacy={legacy:.1f} us/call  "
+        f"recognizer={engine:.1f} us/call (first pass, empty token cache: {cold:.1f} us/call)"
+    )
+
+
+if __name__ == "__main__":
+    main()
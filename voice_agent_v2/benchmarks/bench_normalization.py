@@ -0,0 +1,90 @@
+"""
+Costo por llamada de clean_user_text sobre las frases de usuario de logs/, por
+campo: el motor precompilado de agents/normalization.py contra la version
+anterior (nueve re.sub de muletillas y regex recompiladas en cada llamada).
+
+    python -m benchmarks.bench_normalization --rounds 50
+"""
+import argparse
+import re
+import time
+from number_parser import parse_number
+from agents.normalization import SPANISH_DIGITS, clean_user_text, parse_eta
+from .transcripts import user_utterances
+
+FIELDS = ("nombre_operador", "numero_tractor", "placas_tractor", "eta")
+
+MULETILLAS = [
+    r"\b(esteee)\b", r"\b(umm+)\b", r"\b(creo)\b", r"\b(ehh+)\b", r"\b(a ver)\b",
+    r"\b(bueno)\b", r"\b(este)\b", r"\b(ósea)\b", r"\b(vale)\b"
+]
+
+
+def legacy_clean_user_text(raw: str, current_field: str) -> str:
+    """clean_user_text antes del motor precompilado, como referencia."""
+    raw = raw.strip().lower()
+    for muletilla in MULETILLAS:
+        raw = re.sub(muletilla, "", raw, flags=re.IGNORECASE)
+    raw = re.sub(r"\s+", " ", raw).strip()
+    if current_field == "nombre_operador":
+        m = re.search(r"(?:mi nombre es|me llamo|soy|el nombre del operador es|el nombre es)\s+(.+)", raw, re.IGNORECASE)
+        name = m.group(1).strip() if m else raw
+        return " ".join(p.capitalize() for p in name.split())
+    elif current_field in ("numero_tractor", "numero_trailer"):
+        digits = re.findall(r"\d", raw)
+        if digits:
+            return "".join(digits)
+        try:
+            num = parse_number(raw, language="es")
+            if num is not None:
+                return str(num)
+        except Exception:
+            pass
+        mapped = [SPANISH_DIGITS.get(tok) for tok in raw.split() if tok in SPANISH_DIGITS]
+        return "".join(mapped) if mapped else raw
+    elif current_field in ("placas_tractor", "placas_trailer"):
+        raw = re.sub(r"\bguion\b|\bguion\b", "-", raw, flags=re.IGNORECASE)
+        raw = re.sub(r"\b(las placas son|placas|son)\b", "", raw, flags=re.IGNORECASE)
+        raw = " ".join(SPANISH_DIGITS.get(token, token) for token in raw.split())
+        raw = re.sub(r"\s*-\s*", "-", raw)
+        return re.sub(r"\s+", "", raw).upper()
+    elif current_field == "eta":
+        eta = parse_eta(raw)
+        if eta is not None:
+            return eta
+        raw = re.sub(r"\b(a las|alrededor de|como a las|horas|de la tarde|de la mañana|son las|)\b", "", raw, flags=re.IGNORECASE)
+        converted = []
+        for token in raw.split():
+            if token in SPANISH_DIGITS:
+                converted.append(SPANISH_DIGITS[token])
+            elif token in {"y", "con"}:
+                converted.append(":")
+            else:
+                converted.append(token)
+        return re.sub(r"\s*:\s*", ":", " ".join(converted))
+    return raw
+
+
+def per_call_us(clean, utterances: list[str], field: str, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            clean(text, field)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    utterances = user_utterances()
+    print(f"log utterances: {len(utterances)}")
+    for field in FIELDS:
+        legacy = per_call_us(legacy_clean_user_text, utterances, field, args.rounds)
+        engine = per_call_us(clean_user_text, utterances, field, args.rounds)
+        print(f"  {field:16} legacy={legacy:6.1f} us/call  engine={engine:6.1f} us/call  ({legacy / engine:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
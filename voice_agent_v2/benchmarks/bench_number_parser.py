@@ -0,0 +1,71 @@
+"""
+Parser de numeros hablados (agents/spoken_numbers.py) contra number_parser, que
+era el que usaban NumberNormalizer y plate_parser: exactitud sobre un set
+etiquetado y costo por llamada sobre las respuestas de numeros de logs/.
+
+    python -m benchmarks.bench_number_parser
+"""
+import time
+from number_parser import parse_number
+from agents.spoken_numbers import parse_spoken_number
+from .transcripts import user_replies_to
+
+LABELED = [
+    ("veintidós", "22"),
+    ("mil quinientos cincuenta y cinco", "1555"),
+    ("fifteen fifty-five", "1555"),
+    ("double seven", "77"),
+    ("uno cinco cinco cinco", "1555"),
+    ("cuarenta y tres", "43"),
+    ("El número es cuatro tres.", "43"),
+    ("catorce ochenta", "1480"),
+    ("nineteen oh five", "1905"),
+    ("one thousand five hundred and fifty five", "1555"),
+    ("doble cero siete", "007"),
+    ("ciento veinte", "120"),
+    ("dos mil veinticinco", "2025"),
+    ("seiscientos seis", "606"),
+    ("Jorge Octavio", None),
+]
+
+NUMBER_KEYWORDS = ("numero del tractor", "numero de tractor", "numero del trailer", "numero de trailer", "number")
+
+
+def legacy(text: str) -> str | None:
+    """Como leia los numeros NumberNormalizer antes: number_parser en espanol."""
+    try:
+        num = parse_number(text, language="es")
+    except Exception:
+        return None
+    return str(num) if num is not None else None
+
+
+def spoken(text: str) -> str | None:
+    result = parse_spoken_number(text)
+    return result.digits if result else None
+
+
+def per_call_us(parse, utterances: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            parse(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def main():
+    utterances = user_replies_to(NUMBER_KEYWORDS) or [text for text, _ in LABELED]
+    print(f"log number replies: {len(utterances)}")
+    for name, parse in (("number_parser", legacy), ("spoken_numbers", spoken)):
+        correct = sum(parse(text) == expected for text, expected in LABELED)
+        print(f"  {name:15} {per_call_us(parse, utterances, 200):7.1f} us/call  labeled correct={correct} of {len(LABELED)}")
+
+    for text, expected in LABELED:
+        result = parse_spoken_number(text)
+        got = result.digits if result else None
+        confidence = result.confidence if result else 0.0
+        print(f"  {'ok   ' if got == expected else 'WRONG'} {text!r} -> {got} ({confidence:.2f}, expected {expected})")
+
+
+if __name__ == "__main__":
+    main()
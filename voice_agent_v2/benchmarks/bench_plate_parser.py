@@ -0,0 +1,112 @@
+"""
+Parser local de placas deletreadas contra la extraccion con ASI1.
+
+1. Costo por llamada del parser sobre las frases de placas de logs/.
+2. Exactitud sobre un set etiquetado (ejemplos del prompt y frases de los logs).
+3. Con ASI1_API_KEY definida, acuerdo local/LLM en las frases de los logs y
+   cuantas se resuelven sin red (confianza >= CONFIDENCE_THRESHOLD).
+
+    python -m benchmarks.bench_plate_parser [--llm]
+"""
+import argparse
+import asyncio
+import os
+import time
+from agents.asi1_agent import close_http_session
+from agents.extraction import extract_fields
+from agents.plate_parser import CONFIDENCE_THRESHOLD, plate_parser
+from models.driver_model import DataField
+from .transcripts import user_replies_to
+
+LABELED = [
+    ("Las placas son ABC-1234", "ABC-1234"),
+    ("Esteee, es A B C guión uno dos tres cuatro", "ABC-1234"),
+    ("Placas D-E-F cuatro cinco seis siete", "DEF-4567"),
+    ("Creo que es zac cuatro cinco seis uno", "ZAC-4561"),
+    ("A de Águila, B de Burro, C de Casa, guión, uno, dos, tres, cuatro", "ABC-1234"),
+    ("Equis de Xilófono, Ye de Yegua, guión, cuatro, cinco, seis, siete", "XY-4567"),
+    ("A for Apple, B for Ball, C for Cat, dash, one, two, three, four", "ABC-1234"),
+    ("X for X-ray, Y for Yellow, dash, four, five, six, seven", "XY-4567"),
+    ("J for Jet, K for Kite, L for Lion, dash, two, three, four, five", "JKL-2345"),
+    ("Las placas son letra P, letra A, letra C, ciento veinticuatro.", "PAC-124"),
+    ("Son letra M, letra F, letra E, ciento veintidós.", "MFE-122"),
+    ("Letra K, letra J, letra M ciento cuarenta y cuatro", "KJM-144"),
+    ("Ve de vaca, be de burro, de de dedo, uno cuatro cuatro", "VBD-144"),
+    ("Hola, cómo estás", None),
+]
+
+PLATE_KEYWORDS = ("placa", "plate", "letra", "letter")
+
+
+def bench_cost(utterances: list[str], rounds: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            plate_parser.parse(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def accuracy():
+    """Correcta, diferida al LLM (confianza baja) o incorrecta, por frase etiquetada."""
+    correct = deferred = wrong = 0
+    for text, expected in LABELED:
+        candidate = plate_parser.parse(text)
+        got = candidate.plate if candidate and candidate.confidence >= CONFIDENCE_THRESHOLD else None
+        if got == expected:
+            correct += 1
+            mark = "ok   "
+        elif got is None:
+            deferred += 1
+            mark = "->llm"
+        else:
+            wrong += 1
+            mark = "WRONG"
+        conf = f"{candidate.confidence:.2f}" if candidate else "-"
+        print(f"  {mark} {text!r} -> {got} (conf {conf}, expected {expected})")
+    print(f"labeled: correct={correct} deferred_to_llm={deferred} wrong={wrong} of {len(LABELED)}")
+
+
+async def compare_with_llm(utterances: list[str]):
+    agree = local_only = llm_only = both_none = disagree = 0
+    for text in utterances:
+        candidate = plate_parser.parse(text)
+        local = candidate.plate if candidate and candidate.confidence >= CONFIDENCE_THRESHOLD else None
+        found = await extract_fields(text, [DataField.TRACTOR_PLATES]) or {}
+        llm = found[DataField.TRACTOR_PLATES].value if DataField.TRACTOR_PLATES in found else None
+        if local == llm:
+            both_none += local is None
+            agree += local is not None
+        elif local is None:
+            llm_only += 1
+        elif llm is None:
+            local_only += 1
+        else:
+            disagree += 1
+            print(f"  disagree {text!r}: local={local} llm={llm}")
+    await close_http_session()
+    print(f"vs LLM over {len(utterances)} log utterances: agree={agree} both_empty={both_none} "
+          f"local_only={local_only} llm_only={llm_only} disagree={disagree}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm", action="store_true", help="comparar contra ASI1 (requiere ASI1_API_KEY)")
+    args = parser.parse_args()
+
+    utterances = user_replies_to(PLATE_KEYWORDS)
+    resolved = sum(
+        1 for text in utterances
+        if (c := plate_parser.parse(text)) is not None and c.confidence >= CONFIDENCE_THRESHOLD
+    )
+    print(f"log plate utterances: {len(utterances)}, resolved locally: {resolved}")
+    print(f"local parse cost: {bench_cost(utterances):.1f} us/call")
+    accuracy()
+    if args.llm:
+        if not os.getenv("ASI1_API_KEY"):
+            print("ASI1_API_KEY no definida, se omite la comparacion con el LLM")
+        else:
+            asyncio.run(compare_with_llm(utterances))
+
+
+if __name__ == "__main__":
+    main()
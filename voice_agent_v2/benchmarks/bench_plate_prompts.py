@@ -0,0 +1,76 @@
+"""
+Latencia de los prompts de captura de placa: TTS por prompt contra clips empalmados.
+
+Recorre los prompts que VoiceAgent dice para una placa de 7 caracteres
+("Is the letter J?", "Give me the next letter.", ...). La ruta TTS se simula con
+un tiempo fijo al primer frame por peticion; la ruta de clips usa
+PlateClipLibrary real con clips sinteticos y mide el tiempo hasta el primer frame.
+
+    python -m benchmarks.bench_plate_prompts --plate JKL4321 --tts-ttfb 0.35
+"""
+import argparse
+import asyncio
+import math
+import struct
+import time
+from livekit import rtc
+from agents.clip_library import CARRIER_PHRASES, SYMBOLS, PlateClipLibrary
+from .common import summarize
+
+
+def _tone(seconds: float, sample_rate: int = 24000) -> rtc.AudioFrame:
+    n = int(seconds * sample_rate)
+    data = struct.pack(f"<{n}h", *(int(8000 * math.sin(i / 12)) for i in range(n)))
+    return rtc.AudioFrame(data=data, sample_rate=sample_rate, num_channels=1, samples_per_channel=n)
+
+
+def plate_prompts(plate: str) -> list[tuple[str, ...]]:
+    """Secuencia de prompts (llaves de clips) que se dicen al capturar la placa."""
+    prompts = [("start_plate",)]
+    for i, symbol in enumerate(plate, start=1):
+        prompts.append(("is_the_letter", symbol))
+        if i == 3:
+            prompts.append(("move_to_numbers",))
+        elif i < len(plate):
+            prompts.append(("next_letter",) if i < 3 else ("next_number",))
+    return prompts
+
+
+async def run(plate: str, tts_ttfb: float):
+    library = PlateClipLibrary()
+    for key in CARRIER_PHRASES:
+        library._clips[key] = _tone(1.5)
+    for symbol in SYMBOLS:
+        library._clips[symbol] = _tone(0.4)
+    library.ready = True
+
+    prompts = plate_prompts(plate)
+    tts_samples, clip_samples = [], []
+    for keys in prompts:
+        start = time.perf_counter()
+        await asyncio.sleep(tts_ttfb)
+        tts_samples.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        async for _ in library.frames(*keys):
+            clip_samples.append((time.perf_counter() - start) * 1000)
+            break
+    return prompts, tts_samples, clip_samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plate", default="JKL4321")
+    parser.add_argument("--tts-ttfb", type=float, default=0.35, help="tiempo del TTS al primer frame (s)")
+    args = parser.parse_args()
+
+    prompts, tts_samples, clip_samples = asyncio.run(run(args.plate.upper(), args.tts_ttfb))
+    print(f"plate={args.plate} prompts={len(prompts)}")
+    print(f"per-prompt TTS   requests={len(prompts)} first audio {summarize(tts_samples)} "
+          f"total={sum(tts_samples):.0f}ms")
+    print(f"spliced clips    requests=0 first audio {summarize(clip_samples)} "
+          f"total={sum(clip_samples):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Primer token y primer audio: respuesta completa contra streaming por clausulas.
+
+El TTS se simula con un tiempo fijo hasta el primer frame por cada fragmento de
+texto que recibe; el primer audio es cuando termina la sintesis del primer
+fragmento. Sin streaming el primer fragmento es la respuesta entera.
+
+    python -m benchmarks.bench_streaming --latency 0.25 --token-interval 0.03 --tts-ttfb 0.15
+"""
+import argparse
+import asyncio
+import time
+from agents.asi1_agent import ASI1RequestWrapper, close_http_session
+from agents.streaming import clause_chunks
+from .common import ThreadedCompletionServer, summarize
+
+RESPONSE = (
+    "Awesome, I noted the tractor plates as J K L - 4 3 2 1, "
+    "and the trailer number as 1555. Is that correct? "
+    "If anything is off, just tell me which part and we'll fix it."
+)
+
+
+async def _turn(llm: ASI1RequestWrapper, streaming: bool, tts_ttfb: float):
+    start = time.perf_counter()
+    first_token = None
+    if streaming:
+        async def deltas():
+            nonlocal first_token
+            async for delta in llm.astream("bench"):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                yield delta
+        first_clause = None
+        async for _ in clause_chunks(deltas()):
+            if first_clause is None:
+                first_clause = time.perf_counter() - start
+    else:
+        await llm.agenerate("bench")
+        first_token = first_clause = time.perf_counter() - start
+    # El TTS arranca con el primer fragmento, aunque el resto siga llegando
+    first_audio = first_clause + tts_ttfb
+    return first_token * 1000, first_audio * 1000
+
+
+async def run(url: str, turns: int, streaming: bool, tts_ttfb: float):
+    llm = ASI1RequestWrapper(api_key="bench", url=url)
+    results = [await _turn(llm, streaming, tts_ttfb) for _ in range(turns)]
+    await close_http_session()
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.25, help="tiempo hasta el primer token (s)")
+    parser.add_argument("--token-interval", type=float, default=0.03, help="tiempo entre palabras (s)")
+    parser.add_argument("--tts-ttfb", type=float, default=0.15, help="tiempo del TTS al primer frame (s)")
+    args = parser.parse_args()
+
+    with ThreadedCompletionServer(args.latency, RESPONSE, args.token_interval) as server:
+        for label, streaming in (("full completion", False), ("streamed clauses", True)):
+            first_token, first_audio = asyncio.run(run(server.url, args.turns, streaming, args.tts_ttfb))
+            print(f"{label:17s} first token {summarize(first_token)}")
+            print(f"{'':17s} first audio {summarize(first_audio)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import threading
+import time
+from aiohttp import web
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentil por rango mas cercano; 0.0 si no hay muestras."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(samples: list[float]) -> str:
+    return (
+        f"p50={percentile(samples, 50):.1f}ms "
+        f"p95={percentile(samples, 95):.1f}ms "
+        f"p99={percentile(samples, 99):.1f}ms "
+        f"max={max(samples, default=0.0):.1f}ms"
+    )
+
+
+class LagProbe:
+    """Mide el retraso del event loop: cuanto tarda en despertar un sleep corto."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.samples.append(max(0.0, lag) * 1000)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class ThreadedCompletionServer:
+    """
+    Servidor minimo compatible con /v1/chat/completions en su propio hilo,
+    para que un cliente bloqueante no congele tambien al servidor.
+    """
+
+    def __init__(
+            self,
+            latency: float = 0.3,
+            content: str = "Got it, is that right?",
+            token_interval: float = 0.0
+        ):
+        self.latency = latency
+        self.content = content
+        # Con stream=True el tiempo total es latency (primer token) + token_interval por palabra
+        self.token_interval = token_interval
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1/chat/completions"
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        await asyncio.sleep(self.latency)
+        if payload.get("stream"):
+            return await self._stream(request)
+        await asyncio.sleep(self.token_interval * len(self.content.split()))
+        body = {"choices": [{"message": {"role": "assistant", "content": self.content}}]}
+        return web.Response(text=json.dumps(body), content_type="application/json")
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i, word in enumerate(self.content.split(" ")):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            delta = {"choices": [{"delta": {"content": word if i == 0 else " " + word}}]}
+            await response.write(f"data: {json.dumps(delta)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start())
+        self._ready.set()
+        self._loop.run_forever()
+
+    def __enter__(self):
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,147 @@
+"""
+AgentSession y TTS falsos para correr VoiceAgent sin LiveKit. Solo implementan
+lo que el agente usa de la API real (say, interrupt, tts, mcp_servers) y miden el
+primer audio de cada turno.
+"""
+import asyncio
+import math
+import struct
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator
+from livekit import rtc
+from livekit.agents import function_tool
+
+SAMPLE_RATE = 24000
+
+
+def tone(seconds: float, sample_rate: int = SAMPLE_RATE) -> rtc.AudioFrame:
+    n = max(1, int(seconds * sample_rate))
+    data = struct.pack(f"<{n}h", *(int(8000 * math.sin(i / 12)) for i in range(n)))
+    return rtc.AudioFrame(data=data, sample_rate=sample_rate, num_channels=1, samples_per_channel=n)
+
+
+@dataclass
+class _Synthesized:
+    frame: rtc.AudioFrame
+
+
+class FakeTTS:
+    """TTS que tarda `ttfb` segundos en entregar un solo frame por texto."""
+
+    def __init__(self, ttfb: float = 0.15):
+        self.ttfb = ttfb
+        self.requests = 0
+        # Un solo frame precalculado: generar audio por peticion le sumaria CPU al loop medido
+        self._frame = tone(0.3)
+
+    @asynccontextmanager
+    async def _stream(self, text: str):
+        self.requests += 1
+
+        async def frames() -> AsyncIterator[_Synthesized]:
+            await asyncio.sleep(self.ttfb)
+            yield _Synthesized(self._frame)
+
+        yield frames()
+
+    def synthesize(self, text: str):
+        return self._stream(text)
+
+
+class FakeMCPServer:
+    """
+    Lo que VoiceAgent usa de llm.mcp.MCPServer: initialize y list_tools. La herramienta
+    save_driver_data guarda el registro en memoria en lugar de escribirlo con services/server.py.
+    """
+
+    def __init__(self):
+        self.saved: list[dict] = []
+        self._initialized = False
+
+        # Como MCPServer._make_function_tool: una funcion que recibe los argumentos crudos
+        async def save_driver_data(raw_arguments: dict[str, Any]) -> str:
+            self.saved.append(raw_arguments["data"])
+            return "Datos guardados exitosamente."
+
+        self._tools = [function_tool(save_driver_data, raw_schema={
+            "name": "save_driver_data",
+            "description": "Save the driver registration",
+            "parameters": {"type": "object", "properties": {"data": {"type": "object"}}, "required": ["data"]},
+        })]
+
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
+
+    async def initialize(self):
+        self._initialized = True
+
+    async def list_tools(self) -> list:
+        return self._tools
+
+
+class FakeSession:
+    """
+    Sustituto de AgentSession para el simulador. `begin_turn` marca cuando llega
+    la frase del usuario; el primer audio que sale despues cierra la latencia del
+    turno. `playout_scale` > 0 espera la duracion hablada para simular el audio.
+    """
+
+    def __init__(self, tts: FakeTTS, playout_scale: float = 0.0, chars_per_second: float = 15.0):
+        self.tts = tts
+        self.playout_scale = playout_scale
+        self.chars_per_second = chars_per_second
+        self.spoken: list[str] = []
+        self.turn_latencies: list[float] = []
+        self.mcp_server = FakeMCPServer()
+        self._turn_started: float | None = None
+        # Inicio del turno cuya latencia ya se registro; interrupt() la descarta
+        self._marked_turn: float | None = None
+
+    def begin_turn(self):
+        self._turn_started = time.perf_counter()
+        self._marked_turn = None
+
+    def _mark_audio(self):
+        if self._turn_started is not None:
+            self.turn_latencies.append((time.perf_counter() - self._turn_started) * 1000)
+            self._marked_turn = self._turn_started
+            self._turn_started = None
+
+    def interrupt(self) -> asyncio.Future:
+        # La respuesta cortada no cuenta como primer audio del turno
+        if self._marked_turn is not None:
+            self.turn_latencies.pop()
+            self._turn_started = self._marked_turn
+            self._marked_turn = None
+        done = asyncio.get_running_loop().create_future()
+        done.set_result(None)
+        return done
+
+    async def say(self, text: str | AsyncIterable[str], *, audio: AsyncIterable[rtc.AudioFrame] | None = None, **kwargs):
+        if isinstance(text, str):
+            chunks = [text]
+        else:
+            # Streaming: el TTS arranca con la primera clausula
+            chunks = []
+            async for chunk in text:
+                if not chunks and audio is None:
+                    await asyncio.sleep(self.tts.ttfb)
+                    self._mark_audio()
+                chunks.append(chunk)
+        if audio is not None:
+            async for _ in audio:
+                self._mark_audio()
+        elif isinstance(text, str):
+            await asyncio.sleep(self.tts.ttfb)
+            self._mark_audio()
+        spoken = "".join(chunks)
+        self.spoken.append(spoken)
+        if self.playout_scale:
+            await asyncio.sleep(len(spoken) / self.chars_per_second * self.playout_scale)
+
+    @property
+    def mcp_servers(self) -> list[FakeMCPServer]:
+        return [self.mcp_server]
@@ -0,0 +1,499 @@
+"""
+Prueba de carga: cientos de conversaciones simuladas de VoiceAgent en un solo
+proceso, contra el stub local de ASI1 (benchmarks.asi1_stub, en su propio hilo)
+y una AgentSession falsa.
+
+Cada conversacion toma las respuestas del usuario de una transcripcion de logs/
+(nombre, numeros, ETA, correo y la placa que quedo confirmada), en el orden en
+que el agente pregunta; los "si/no" de confirmacion y los caracteres de la placa
+en modo letra por letra los genera el llamante simulado.
+
+Reporta latencia por turno (fin del habla -> primer audio), lag del event
+loop y throughput, turnos y tiempo por placa, mas los contadores de
+agents.metrics (cache, hedges, fallbacks, especulacion).
+
+    python -m benchmarks.load_test --conversations 300 --concurrency 100
+    python -m benchmarks.load_test --latency lognormal:0.6:0.5 --error-rate 0.03 --hang-rate 0.01
+    python -m benchmarks.load_test --mode replay --cassette benchmarks/cassettes/asi1.json --json out.json
+    python -m benchmarks.load_test --chars-per-utterance 1   # placas caracter por caracter
+    python -m benchmarks.load_test --stt-confidence 0.95     # confirmaciones implicitas
+    python -m benchmarks.load_test --reject-rate 0.2 --inline-corrections  # "no, it's 1556"
+    python -m benchmarks.load_test --endpointing-ms 500 --interim --interim-error-rate 0.1
+    python -m benchmarks.load_test --slots-per-utterance 3   # "tractor 1555, plates JKL 1234, ..."
+    python -m benchmarks.load_test --confirmation-mode summary --playout-scale 1.0
+    python -m benchmarks.load_test --returning-rate 0.7 --change-rate 0.2  # "same tractor 1555?"
+    python -m benchmarks.load_test --drop-rate 0.5 --checkpoint-dir /tmp/daisy-ckpt  # llamadas caidas y retomadas
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+from unidecode import unidecode
+from agents import extraction, metrics
+from agents.asi1_agent import close_http_session
+from agents.clip_library import clip_library
+from agents.en_prompts import FIELD_NAMES_EN
+from agents.checkpoints import CheckpointStore
+from agents.fields import FIELD_SPECS
+from agents.letter_recognizer import PLATE_LENGTH, PLATE_LETTERS
+from agents.registrations import registration_index
+from agents.voice_agent import VoiceAgent
+from models.driver_model import DataField
+from .asi1_stub import add_server_arguments, server_from_args
+from .common import LagProbe, summarize
+from .fake_session import FakeSession, FakeTTS
+from .transcripts import load_turns, replies_by_topic
+
+# Palabras clave (sin acentos) de la pregunta del asistente para cada campo
+FIELD_TOPICS = {
+    DataField.TRACTOR_PLATES: ("placas del tractor", "placas de tu tractor", "tractor plates"),
+    DataField.TRAILER_PLATES: ("placas del trailer", "placas de tu trailer", "trailer plates"),
+    DataField.TRACTOR_NUMBER: ("numero del tractor", "numero de tractor", "numero de tu tractor", "tractor number"),
+    DataField.TRAILER_NUMBER: ("numero del trailer", "numero de trailer", "numero de tu trailer", "trailer number"),
+    DataField.ETA: ("eta", "hora estimada", "arrival"),
+    DataField.EMAIL: ("correo", "email"),
+    DataField.NAME: ("nombre", "name"),
+}
+# Respuesta limpia para cuando la transcripcion no tiene el campo o ya se agotaron sus frases
+DEFAULT_ANSWERS = {
+    DataField.NAME: "Jorge Octavio",
+    DataField.TRACTOR_NUMBER: "1555",
+    DataField.TRACTOR_PLATES: "Las placas son JKL-1234",
+    DataField.TRAILER_NUMBER: "43",
+    DataField.TRAILER_PLATES: "Las placas son XAZ-1425",
+    DataField.ETA: "17:45",
+    DataField.EMAIL: "driver@gmail.com",
+}
+DEFAULT_PLATES = {DataField.TRACTOR_PLATES: "JKL1234", DataField.TRAILER_PLATES: "XAZ1425"}
+PLATE_FIELDS = (DataField.TRACTOR_PLATES, DataField.TRAILER_PLATES)
+NUMBER_FIELDS = (DataField.TRACTOR_NUMBER, DataField.TRAILER_NUMBER)
+PLATE_RE = re.compile(r"\b([A-Z]{3})-?([0-9]{3,4})\b")
+# Como anuncia el llamante cada campo cuando dice varios de corrido
+SLOT_PHRASES = {
+    DataField.NAME: "{value}",
+    DataField.TRACTOR_NUMBER: "tractor {value}",
+    DataField.TRACTOR_PLATES: "tractor plates {value}",
+    DataField.TRAILER_NUMBER: "trailer {value}",
+    DataField.TRAILER_PLATES: "trailer plates {value}",
+    DataField.ETA: "arriving at {value}",
+    DataField.EMAIL: "my email is {value}",
+}
+
+# Lo que tenia el registro anterior de un campo que cambio desde entonces
+STALE_VALUES = {
+    DataField.TRACTOR_NUMBER: "1490",
+    DataField.TRACTOR_PLATES: "RTS-5521",
+    DataField.TRAILER_NUMBER: "12",
+    DataField.TRAILER_PLATES: "MNB-7730",
+    DataField.EMAIL: "old.driver@gmail.com",
+}
+
+
+@dataclass
+class CallerScript:
+    answers: dict[DataField, list[str]]
+    # Placa de 7 caracteres que el llamante deletrea en modo letra por letra
+    plates: dict[DataField, str]
+
+
+@dataclass
+class ConversationResult:
+    turns: int
+    latencies: list[float]
+    duration: float
+    completed: bool
+    # Por placa terminada: turnos del usuario y segundos desde que se pidio hasta confirmarla
+    plate_turns: list[int]
+    plate_seconds: list[float]
+
+
+def _confirmed_plates(turns: list[tuple[str, str]]) -> dict[DataField, str]:
+    """Placas que el asistente leyo en voz alta en la transcripcion ("...del tractor son ADB-0155")."""
+    plates = {}
+    for role, text in turns:
+        if role != "assistant":
+            continue
+        folded = unidecode(text).lower()
+        m = PLATE_RE.search(text)
+        if not m:
+            continue
+        plate = m.group(1) + m.group(2).zfill(4)
+        if "trailer" in folded:
+            plates[DataField.TRAILER_PLATES] = plate
+        elif "tractor" in folded:
+            plates[DataField.TRACTOR_PLATES] = plate
+    return plates
+
+
+def build_scripts() -> list[CallerScript]:
+    scripts = []
+    for turns in load_turns():
+        answers = replies_by_topic(turns, FIELD_TOPICS)
+        if not any(answers.values()):
+            continue
+        plates = {**DEFAULT_PLATES, **_confirmed_plates(turns)}
+        scripts.append(CallerScript(answers=answers, plates=plates))
+    return scripts
+
+
+class SimulatedVoiceAgent(VoiceAgent):
+    """VoiceAgent con la FakeSession en lugar de la AgentSession de LiveKit."""
+
+    def __init__(self, session: FakeSession, dial_info: dict):
+        super().__init__(dial_info=dial_info)
+        self._fake_session = session
+        self.hung_up = False
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+    async def hangup(self):
+        # Sin job de LiveKit no hay sala que borrar; basta saber que se colgo
+        self.hung_up = True
+
+
+class ScriptedCaller:
+    def __init__(
+            self,
+            script: CallerScript,
+            reject_rate: float,
+            rng: random.Random,
+            chars_per_utterance: int = 1,
+            inline_corrections: bool = False,
+            interim_error_rate: float = 0.0,
+            slots_per_utterance: int = 1,
+            changed: tuple[DataField, ...] = ()
+        ):
+        self.answers = {f: list(script.answers.get(f, [])) for f in FIELD_TOPICS}
+        self.plates = script.plates
+        self.reject_rate = reject_rate
+        self.rng = rng
+        self.chars_per_utterance = chars_per_utterance
+        self.inline_corrections = inline_corrections
+        self.interim_error_rate = interim_error_rate
+        self.slots_per_utterance = slots_per_utterance
+        # Campos del registro anterior que ya no son ciertos
+        self.changed = changed
+
+    def next_utterance(self, agent: VoiceAgent) -> str | None:
+        field = agent.current_field
+        if field is None:
+            return None
+        if agent.confirming_summary:
+            return self.summary_reply(agent)
+        if agent.confirming_prior:
+            return self.prior_reply(agent)
+        if agent.waiting_for_confirmation:
+            return self.rejection(agent) if self.rng.random() < self.reject_rate else "yes"
+        if agent.in_letter_mode:
+            plate, i = self.plates[agent.current_plate_type], agent.letter_index
+            end = min(PLATE_LENGTH, i + self.chars_per_utterance)
+            if i < PLATE_LETTERS and self.chars_per_utterance < PLATE_LENGTH:
+                # Dicta las letras y luego los numeros, como se los pide el agente
+                end = min(end, PLATE_LETTERS)
+            return " ".join(plate[i:end])
+        if self.slots_per_utterance > 1:
+            return self.several_fields(agent)
+        pending = self.answers[field]
+        if pending:
+            return pending.pop(0)
+        return DEFAULT_ANSWERS[field]
+
+
+    def rejection(self, agent: VoiceAgent) -> str:
+        """
+        El "no" a una confirmacion. Con inline_corrections el llamante dice tambien el
+        valor bueno, como si el agente hubiera oido mal el ultimo caracter.
+        """
+        if not self.inline_corrections:
+            return "no"
+        field = agent.current_field
+        value = agent.last_value if agent.in_letter_mode else agent._field_value(field)
+        last = (value or "")[-1:]
+        if field in PLATE_FIELDS and last.isalpha():
+            return f"no, the last letter is {'Y' if last == 'Z' else 'Z'}"
+        if field in PLATE_FIELDS and last.isdigit():
+            return f"no, the last number is {(int(last) + 1) % 10}"
+        if field in NUMBER_FIELDS and value and value.isdigit():
+            return f"no, it's {int(value) + 1}"
+        return "no"
+
+    def summary_reply(self, agent: VoiceAgent) -> str:
+        """Al resumen: cada campo leido sale mal con reject_rate y se dice cuales por nombre."""
+        wrong = [f for f in agent.implicitly_confirmed if self.rng.random() < self.reject_rate]
+        if not wrong:
+            return "yes"
+        names = " and the ".join(FIELD_NAMES_EN.get(f.value, f.value) for f in wrong)
+        return f"no, the {names} {'is' if len(wrong) == 1 else 'are'} wrong"
+
+    def prior_reply(self, agent: VoiceAgent) -> str:
+        """Al "same as last time?": si, o lo que cambio con su valor nuevo."""
+        changed = [f for f in agent.pending_slots if f in self.changed]
+        if not changed:
+            return "yes"
+        return "no, " + ", ".join(SLOT_PHRASES[f].format(value=self.current_value(f)) for f in changed) + " now"
+
+    def current_value(self, field: DataField) -> str:
+        if field in PLATE_FIELDS:
+            plate = self.plates[field]
+            return f"{plate[:PLATE_LETTERS]} {plate[PLATE_LETTERS:]}"
+        return DEFAULT_ANSWERS[field]
+
+    def several_fields(self, agent: VoiceAgent) -> str:
+        """El campo que se pregunto y los siguientes que faltan, en una sola frase."""
+        fields = agent.fields_to_collect[:self.slots_per_utterance]
+        return ", ".join(SLOT_PHRASES[field].format(value=self.current_value(field)) for field in fields)
+
+    def interim(self, utterance: str) -> str:
+        """
+        El parcial del STT al terminar de hablar: la primera palabra de la frase. Con
+        interim_error_rate el parcial se oyo mal (otro caracter, o un "yes" que no era).
+        """
+        first = utterance.split()[0].strip(",.") if utterance.strip() else ""
+        if not self.interim_error_rate or self.rng.random() >= self.interim_error_rate:
+            return first
+        if len(first) == 1 and first.isdigit():
+            return str((int(first) + 1) % 10)
+        if len(first) == 1 and first.isalpha():
+            return "Y" if first.upper() == "Z" else chr(ord(first.upper()) + 1)
+        return "yes"
+
+
+async def run_conversation(
+        script: CallerScript,
+        url: str,
+        tts: FakeTTS,
+        args: argparse.Namespace,
+        rng: random.Random,
+        phone_number: str
+    ) -> ConversationResult:
+    session = FakeSession(tts, playout_scale=args.playout_scale)
+    changed: tuple[DataField, ...] = ()
+    if rng.random() < args.returning_rate:
+        # Transportista que ya se registro desde este telefono; algunos datos cambiaron
+        changed = tuple(f for f in STALE_VALUES if rng.random() < args.change_rate)
+        previous = {
+            FIELD_SPECS[f].attr: STALE_VALUES[f] if f in changed else DEFAULT_ANSWERS[f] for f in FIELD_SPECS
+        }
+        previous.update({FIELD_SPECS[f].attr: p[:PLATE_LETTERS] + "-" + p[PLATE_LETTERS:]
+                         for f, p in script.plates.items() if f not in changed})
+        registration_index.record(phone_number, previous)
+    checkpoints = CheckpointStore(args.checkpoint_dir) if args.checkpoint_dir else None
+
+    async def connect() -> SimulatedVoiceAgent:
+        # Un job nuevo por intento, como el que lanza retry_call con la misma dial_info
+        agent = SimulatedVoiceAgent(session, dial_info={"phone_number": phone_number})
+        agent.asi1_llm.url = url
+        agent.multi_slot_filling = not args.no_slot_filling
+        agent.summary_mode = agent.confirmation_policy.summary_only = args.confirmation_mode == "summary"
+        agent.checkpoints = checkpoints
+        await agent.on_enter()
+        await agent.start_conversation()
+        return agent
+
+    caller = ScriptedCaller(
+        script, args.reject_rate, rng, args.chars_per_utterance, args.inline_corrections, args.interim_error_rate,
+        args.slots_per_utterance, changed
+    )
+    # La llamada se cae una vez despues de este turno del usuario
+    drop_at = rng.randint(1, args.drop_within) if rng.random() < args.drop_rate else None
+    start = time.perf_counter()
+    agent = await connect()
+    turns = 0
+    plate_turns: dict[DataField, int] = {}
+    plate_started: dict[DataField, float] = {}
+    plate_seconds: dict[DataField, float] = {}
+    while turns < args.max_turns:
+        field = agent.current_field
+        text = caller.next_utterance(agent)
+        if text is None:
+            break
+        if field in PLATE_FIELDS:
+            plate_started.setdefault(field, time.perf_counter())
+        if args.think_time:
+            await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+        # Fin del habla del usuario: el parcial llega ya, la final despues del endpointing
+        session.begin_turn()
+        if args.interim:
+            agent.on_interim_transcript(caller.interim(text), confidence=args.stt_confidence)
+        if args.endpointing_ms:
+            await asyncio.sleep(args.endpointing_ms / 1000)
+        await agent.on_final_transcript(text, confidence=args.stt_confidence)
+        turns += 1
+        if field in PLATE_FIELDS:
+            plate_turns[field] = plate_turns.get(field, 0) + 1
+            if agent.current_field != field:
+                plate_seconds[field] = time.perf_counter() - plate_started[field]
+        if turns == drop_at and agent.current_field is not None:
+            metrics.incr("dropped_calls")
+            agent.speculation.discard()
+            agent = await connect()
+    agent.speculation.discard()
+    return ConversationResult(
+        turns=turns,
+        latencies=session.turn_latencies,
+        duration=time.perf_counter() - start,
+        completed=agent.current_field is None and agent.hung_up and bool(session.mcp_server.saved),
+        plate_turns=[plate_turns[f] for f in plate_seconds],
+        plate_seconds=list(plate_seconds.values()),
+    )
+
+
+async def run(args: argparse.Namespace, url: str) -> dict:
+    rng = random.Random(args.seed)
+    scripts = build_scripts()
+    tts = FakeTTS(ttfb=args.tts_ttfb)
+    if args.clips:
+        await clip_library.ensure_built(tts)
+    # El extractor de ASI1 es un wrapper del modulo: tambien va al stub
+    extraction._extractor_llm().url = url
+    metrics.reset()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    results: list[ConversationResult] = []
+
+    async def one(i: int):
+        await asyncio.sleep(args.ramp * i / max(1, args.conversations))
+        async with semaphore:
+            results.append(await run_conversation(scripts[i % len(scripts)], url, tts, args, rng, f"+1555{i:07d}"))
+
+    probe = LagProbe()
+    probe.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.conversations)))
+    wall = time.perf_counter() - start
+    await probe.stop()
+    await close_http_session()
+
+    latencies = [ms for r in results for ms in r.latencies]
+    turns = sum(r.turns for r in results)
+    completed = [r for r in results if r.completed]
+    plate_turns = [t for r in results for t in r.plate_turns]
+    plate_seconds = [s for r in results for s in r.plate_seconds]
+    return {
+        "conversations": len(results),
+        "completed": len(completed),
+        "transcripts": len(scripts),
+        "turns": turns,
+        "wall_s": wall,
+        "conversations_per_s": len(completed) / wall if wall else 0.0,
+        "turns_per_s": turns / wall if wall else 0.0,
+        "avg_turns_per_call": turns / len(results) if results else 0.0,
+        "avg_turns_per_completed": sum(r.turns for r in completed) / len(completed) if completed else 0.0,
+        "avg_call_s": sum(r.duration for r in results) / len(results) if results else 0.0,
+        "plates": len(plate_turns),
+        "avg_turns_per_plate": sum(plate_turns) / len(plate_turns) if plate_turns else 0.0,
+        "avg_plate_s": sum(plate_seconds) / len(plate_seconds) if plate_seconds else 0.0,
+        "plate_turns": plate_turns,
+        "turn_latency_ms": latencies,
+        "loop_lag_ms": probe.samples,
+        "tts_requests": tts.requests,
+        "agent_metrics": metrics.snapshot(),
+    }
+
+
+def report(result: dict, stub_stats: dict):
+    print(
+        f"conversations={result['conversations']} completed={result['completed']} "
+        f"(from {result['transcripts']} transcripts) turns={result['turns']} wall={result['wall_s']:.1f}s"
+    )
+    print(
+        f"throughput: {result['conversations_per_s']:.2f} calls/s {result['turns_per_s']:.1f} turns/s "
+        f"avg {result['avg_turns_per_call']:.1f} turns/call ({result['avg_turns_per_completed']:.1f} per completed) "
+        f"{result['avg_call_s']:.1f}s/call"
+    )
+    print(
+        f"plates: {result['plates']} captured, avg {result['avg_turns_per_plate']:.1f} turns/plate "
+        f"{result['avg_plate_s']:.2f}s/plate"
+    )
+    print(f"turn latency (end of speech -> first audio): {summarize(result['turn_latency_ms'])}")
+    print(f"event loop lag:                          {summarize(result['loop_lag_ms'])}")
+    per_registration = stub_stats.get("requests", 0) / result["completed"] if result["completed"] else 0.0
+    print(f"tts requests: {result['tts_requests']}  asi1 stub: {stub_stats}  ({per_registration:.1f} asi1 calls/registration)")
+    counters = result["agent_metrics"]["counters"]
+    saved = result["agent_metrics"]["timings"].get("interim_saved_ms")
+    if saved:
+        print(
+            f"interim fast path: commits={counters.get('interim_commits', 0):.0f} "
+            f"rollbacks={counters.get('interim_rollbacks', 0):.0f} "
+            f"saved per committed turn p50={saved['p50']:.0f}ms p95={saved['p95']:.0f}ms"
+        )
+    print("agent metrics: " + " ".join(f"{k}={v:.0f}" for k, v in sorted(counters.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--ramp", type=float, default=2.0, help="segundos para arrancar todas las conversaciones")
+    parser.add_argument("--max-turns", type=int, default=120, help="corte por conversacion atorada")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pausa media del usuario antes de cada turno (s)")
+    parser.add_argument("--reject-rate", type=float, default=0.05, help="fraccion de confirmaciones respondidas con 'no'")
+    parser.add_argument(
+        "--inline-corrections", action="store_true",
+        help="el 'no' trae el valor corregido ('no, it's 1556', 'no, the last letter is Z')"
+    )
+    parser.add_argument(
+        "--stt-confidence", type=float, default=0.0,
+        help="transcript_confidence de cada frase (0.0, como en logs/, significa que el STT no la reporto)"
+    )
+    parser.add_argument(
+        "--slots-per-utterance", type=int, default=1,
+        help="campos que dice el llamante en cada respuesta (el que se pregunto y los siguientes)"
+    )
+    parser.add_argument(
+        "--confirmation-mode", choices=("per_field", "summary"), default="per_field",
+        help="summary: sin confirmacion por campo, un solo resumen al final (CONFIRMATION_MODE)"
+    )
+    parser.add_argument(
+        "--returning-rate", type=float, default=0.0,
+        help="fraccion de llamadas de un telefono con registro anterior (PREFILL_FROM_HISTORY)"
+    )
+    parser.add_argument(
+        "--change-rate", type=float, default=0.2,
+        help="fraccion de los campos del registro anterior que cambiaron desde entonces"
+    )
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraccion de llamadas que se caen una vez y se reintentan")
+    parser.add_argument("--drop-within", type=int, default=20, help="la caida llega en un turno al azar entre 1 y este")
+    parser.add_argument(
+        "--checkpoint-dir", default=None,
+        help="guardar checkpoints aqui y retomar el reintento (sin esto el reintento empieza de cero)"
+    )
+    parser.add_argument("--no-slot-filling", action="store_true", help="el agente solo toma el campo que pregunto")
+    parser.add_argument("--chars-per-utterance", type=int, default=3, help="caracteres de la placa que dicta el llamante por frase")
+    parser.add_argument(
+        "--endpointing-ms", type=float, default=0.0,
+        help="espera del STT entre el fin del habla y la transcripcion final (ms)"
+    )
+    parser.add_argument("--interim", action="store_true", help="mandar al agente el parcial del STT antes de la final")
+    parser.add_argument(
+        "--interim-error-rate", type=float, default=0.0,
+        help="fraccion de parciales que no coinciden con la final (prueba el rollback)"
+    )
+    parser.add_argument("--tts-ttfb", type=float, default=0.15, help="tiempo del TTS falso al primer frame (s)")
+    parser.add_argument("--playout-scale", type=float, default=0.0, help="1.0 espera la duracion hablada de cada respuesta")
+    parser.add_argument("--clips", action="store_true", help="construir la biblioteca de clips de placas con el TTS falso")
+    parser.add_argument("--json", default=None, help="guardar el resultado completo en este archivo")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    # Los logs por turno del agente ahogarian el reporte
+    logging.disable(logging.INFO)
+    # Los resets de conexion de las peticiones canceladas (hedges) no son errores del benchmark
+    logging.getLogger("aiohttp.server").setLevel(logging.CRITICAL)
+
+    with server_from_args(args) as server:
+        result = asyncio.run(run(args, server.url))
+        stub_stats = dict(server.stats)
+    report(result, stub_stats)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**result, "asi1_stub": stub_stats}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
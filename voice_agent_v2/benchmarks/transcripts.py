@@ -0,0 +1,65 @@
+import glob
+import json
+import os
+import re
+from unidecode import unidecode
+
+LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+
+def load_turns(logs_dir: str = LOGS_DIR) -> list[list[tuple[str, str]]]:
+    """Conversaciones de logs/ como listas de (rol, texto), en orden."""
+    conversations = []
+    for path in sorted(glob.glob(os.path.join(logs_dir, "transcript_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f)["transcript"]["items"]
+        turns = []
+        for item in items:
+            if item.get("type") != "message":
+                continue
+            text = " ".join(c for c in item["content"] if isinstance(c, str)).strip()
+            if text:
+                turns.append((item["role"], text))
+        conversations.append(turns)
+    return conversations
+
+
+def user_replies_to(keywords: tuple[str, ...], logs_dir: str = LOGS_DIR) -> list[str]:
+    """Respuestas del usuario a un mensaje del asistente que menciona alguna palabra clave."""
+    replies = []
+    for turns in load_turns(logs_dir):
+        last_assistant = ""
+        for role, text in turns:
+            if role == "assistant":
+                last_assistant = text.lower()
+            elif any(k in last_assistant for k in keywords):
+                replies.append(text)
+    return replies
+
+
+def user_utterances(logs_dir: str = LOGS_DIR) -> list[str]:
+    return [text for turns in load_turns(logs_dir) for role, text in turns if role == "user"]
+
+
+def replies_by_topic(turns: list[tuple[str, str]], topics: dict) -> dict:
+    """
+    Respuestas del usuario agrupadas segun la ultima pregunta del asistente. `topics`
+    mapea cada llave a palabras clave (sin acentos); gana la primera llave que aparezca
+    como palabra completa. Las confirmaciones ("¿es correcto?") no abren tema.
+    """
+    patterns = {
+        key: re.compile(r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b")
+        for key, keywords in topics.items()
+    }
+    replies: dict = {key: [] for key in topics}
+    current = None
+    for role, text in turns:
+        if role == "assistant":
+            folded = unidecode(text).lower()
+            if "correct" in folded:
+                current = None
+                continue
+            current = next((key for key, pattern in patterns.items() if pattern.search(folded)), None)
+        elif current is not None:
+            replies[current].append(text)
+    return replies
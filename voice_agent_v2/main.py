@@ -5,6 +5,10 @@ import logging
 from datetime import datetime
 from dotenv import load_dotenv
 from agents.voice_agent import VoiceAgent
+from agents.asi1_agent import close_http_session
+from agents import metrics
+from agents.clip_library import clip_library
+from agents.registrations import registration_index
 from livekit import api
 from livekit.plugins import ( 
     silero, 
@@ -17,6 +21,7 @@ from livekit.plugins import (
 from livekit.agents import ( 
     AgentSession,  
     JobContext,   
+    JobProcess,
     cli, 
     WorkerOptions, 
     RoomInputOptions,
@@ -28,6 +33,12 @@ logger.setLevel(logging.INFO)
 load_dotenv(override=True)
 outbound_trunk_id = os.getenv("SIP_OUTBOUND_TRUNK_ID")
 print(outbound_trunk_id)
+_background_tasks: set[asyncio.Task] = set()
+
+def prewarm(proc: JobProcess):
+    # Indice telefono -> registro anterior, una vez por proceso del worker
+    registration_index.refresh()
+
 async def entrypoint(ctx: JobContext):
     logger.info(f"connecting to room {ctx.room.name}")
     await ctx.connect()
@@ -39,6 +50,8 @@ async def entrypoint(ctx: JobContext):
         logger.error(f"Número de teléfono inválido: {phone_number}")
         raise ValueError("El número de teléfono debe estar en formato E.164 (por ejemplo, +1234567890)")
     # look up the user's phone number and appointment details
+    # Solo lee los registros guardados desde la ultima llamada de este proceso
+    registration_index.refresh()
     voice_agent = VoiceAgent(dial_info=dial_info)
     session = AgentSession(
         vad=silero.VAD.load(),
@@ -62,6 +75,20 @@ async def entrypoint(ctx: JobContext):
             mcp.MCPServerHTTP(url="http://localhost:8000/sse")
         ]
     )
+    # Clips de placas: se sintetizan una sola vez por proceso con la voz del TTS de la sesion
+    if not clip_library.ready:
+        build_clips = asyncio.create_task(clip_library.ensure_built(session.tts))
+        _background_tasks.add(build_clips)
+        build_clips.add_done_callback(_background_tasks.discard)
+    # Resumen de latencias y contadores del proceso al terminar la llamada
+    async def log_metrics():
+        metrics.log_summary()
+    ctx.add_shutdown_callback(log_metrics)
+    # El pool de ASI1 es del proceso, pero el proceso corre un job a la vez: se cierra al
+    # terminar la llamada y el siguiente job lo vuelve a abrir en su event loop
+    ctx.add_shutdown_callback(close_http_session)
+    # Una llamada que termina sin registro guardado se retoma en el siguiente job con la misma dial_info
+    ctx.add_shutdown_callback(voice_agent.save_checkpoint)
     # Save transcript at shutdown
     '''
     async def write_transcript():
@@ -103,6 +130,7 @@ async def entrypoint(ctx: JobContext):
         participant = await ctx.wait_for_participant(identity=participant_identity)
         logger.info(f"participant joined: {participant.identity}")
         voice_agent.set_participant(participant)
+        await voice_agent.start_conversation()
     except api.TwirpError as e:
         logger.error(
             f"error creating SIP participant: {e.message}, "
@@ -115,6 +143,7 @@ if __name__ == "__main__":
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
             agent_name="outbound-caller",
         )
     )
\ No newline at end of file
@@ -0,0 +1,16 @@
+import json
+import os
+import uuid
+
+# Donde save_driver_data escribe cada registro; agents/registrations.py lee el mismo directorio
+RECORDS_DIR = os.getenv("DRIVER_RECORDS_DIR", "recolect_data")
+
+
+def write_driver_record(data: dict, directory: str | None = None) -> str:
+    """Escribe el registro en directory/driver_data_<id>.json (RECORDS_DIR por omision) y devuelve la ruta."""
+    directory = directory or RECORDS_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"driver_data_{str(uuid.uuid4())[:5]}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
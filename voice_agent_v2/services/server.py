@@ -2,17 +2,16 @@ from mcp.server.fastmcp import FastMCP
 import logging
 from fastapi import FastAPI
 import os
-import json
 from pydantic import ( 
     BaseModel, 
     ValidationError, 
     EmailStr 
 )
-import uuid
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from .email_template import get_email_template, get_email_template_en
+from .records import write_driver_record
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -28,6 +27,8 @@ class DriverDataInput(BaseModel):
     trailer_plates: str
     eta: str
     email: EmailStr
+    # E.164 de la llamada: llave del registro anterior en la siguiente (ver agents/registrations.py)
+    phone_number: str = ""
 
 logger = logging.getLogger("mcp-tool")
 
@@ -39,23 +40,26 @@ def get_weather(location: str) -> str:
 
 @mcp.tool()
 def save_driver_data(data: DriverDataInput) -> str:
+    # Los errores se relanzan: el cliente MCP los recibe como isError (ToolError en VoiceAgent)
+    # y no como un texto que parece exito
     try:
         # Convert Pydantic model to dict for JSON serialization
         #data_dict = data.dict()
         data_dict = data.model_dump()
-        with open(f"recolect_data/driver_data_{str(uuid.uuid4())[:5]}.json", "w", encoding="utf-8") as f:
-            json.dump(data_dict, f, ensure_ascii=False, indent=2)
+        write_driver_record(data_dict)
         logger.info("Driver data saved: %s", data_dict)
-        # Enviar correo
-        send_email(data_dict["email"], data_dict)
-
-        return "Datos guardados exitosamente."
     except ValidationError as e:
         logger.error("Validation error for driver data: %s", str(e))
-        return f"Error al validar los datos: {str(e)}"
+        raise
     except Exception as e:
         logger.error("Error saving driver data: %s", str(e))
-        return f"Error al guardar los datos: {str(e)}"
+        raise
+    # Enviar correo; si falla el registro ya quedo guardado
+    try:
+        send_email(data_dict["email"], data_dict)
+    except Exception as e:
+        logger.error("Error al enviar correo: %s", str(e))
+    return "Datos guardados exitosamente."
 
 
 def send_email(recipient_email: str, data: dict):
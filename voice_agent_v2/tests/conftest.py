@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Los modulos se importan como en main.py y los benchmarks: desde voice_agent_v2
+V2_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if V2_DIR not in sys.path:
+    sys.path.insert(0, V2_DIR)
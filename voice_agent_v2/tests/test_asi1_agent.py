@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+from agents import metrics
+from agents.asi1_agent import ASI1RequestWrapper, _hedged
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class _Attempts:
+    """attempt() de _hedged: la copia n espera delays[n] y devuelve results[n]."""
+
+    def __init__(self, delays, results, gate: asyncio.Event | None = None):
+        self.delays = delays
+        self.results = results
+        self.gate = gate
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        n = self.started
+        self.started += 1
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            await asyncio.sleep(self.delays[n])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(self.results[n], Exception):
+            raise self.results[n]
+        return self.results[n]
+
+
+def test_fast_answer_never_fires_the_hedge():
+    attempts = _Attempts([0.0], ["a"])
+    assert asyncio.run(_hedged(attempts, budget=1.0, hedge_after=0.2)) == "a"
+    assert attempts.started == 1
+    assert metrics.counter("asi1_hedges_fired") == 0
+
+
+def test_slow_answer_is_beaten_by_the_hedge():
+    attempts = _Attempts([0.5, 0.0], ["slow", "fast"])
+
+    async def run():
+        result = await _hedged(attempts, budget=1.0, hedge_after=0.05)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "fast"
+    assert attempts.started == 2
+    assert attempts.cancelled == 1
+    assert metrics.counter("asi1_hedges_fired") == 1
+    assert metrics.counter("asi1_hedge_wins") == 1
+
+
+def test_failed_attempt_hedges_right_away():
+    attempts = _Attempts([0.0, 0.0], [RuntimeError("500"), "b"])
+    assert asyncio.run(_hedged(attempts, budget=1.0, hedge_after=0.5)) == "b"
+    assert metrics.counter("asi1_hedges_fired") == 1
+
+
+def test_answer_that_arrives_with_the_winner_is_discarded():
+    discarded = []
+
+    async def discard(result):
+        discarded.append(result)
+
+    async def run():
+        gate = asyncio.Event()
+        attempts = _Attempts([0.0, 0.0], ["first", "second"], gate)
+        asyncio.get_running_loop().call_later(0.1, gate.set)
+        return await _hedged(attempts, budget=1.0, hedge_after=0.02, discard=discard)
+
+    winner = asyncio.run(run())
+    # Las dos llegan en la misma vuelta del loop: cualquiera puede ganar, la otra se descarta
+    assert sorted([winner] + discarded) == ["first", "second"]
+
+
+def test_budget_expires_with_nothing():
+    attempts = _Attempts([1.0, 1.0], ["a", "b"])
+
+    async def run():
+        result = await _hedged(attempts, budget=0.1, hedge_after=0.02)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) is None
+    assert attempts.cancelled == 2
+    assert metrics.counter("asi1_deadline_expired") == 1
+
+
+class _Streams:
+    """astream falso: cada llamada es un stream nuevo con sus (espera, fragmento)."""
+
+    def __init__(self, *scripts):
+        self.scripts = list(scripts)
+        self.opened = 0
+        self.closed: list[int] = []
+
+    def __call__(self, messages):
+        self.opened += 1
+        return self._stream(self.scripts.pop(0), self.opened)
+
+    async def _stream(self, script, n):
+        try:
+            for delay, delta in script:
+                await asyncio.sleep(delay)
+                yield delta
+        finally:
+            self.closed.append(n)
+
+
+def _llm(streams: _Streams) -> ASI1RequestWrapper:
+    llm = ASI1RequestWrapper(api_key="test")
+    llm.astream = streams
+    return llm
+
+
+async def _collect(stream) -> list[str]:
+    return [delta async for delta in stream]
+
+
+def test_stream_is_passed_through_and_closed():
+    streams = _Streams([(0.0, "Hola, "), (0.0, "que tal.")])
+
+    async def run():
+        stream = await _llm(streams).astream_within("hi", budget=1.0, hedge_after=0.5)
+        return await _collect(stream)
+
+    assert asyncio.run(run()) == ["Hola, ", "que tal."]
+    assert len(streams.closed) == 1
+
+
+def test_losing_stream_is_closed():
+    streams = _Streams([(0.05, "a"), (0.0, "rest")], [(0.05, "b"), (0.0, "rest")])
+
+    async def run():
+        stream = await _llm(streams).astream_within("hi", budget=1.0, hedge_after=0.0)
+        deltas = await _collect(stream)
+        await asyncio.sleep(0)
+        return deltas
+
+    deltas = asyncio.run(run())
+    assert deltas[1:] == ["rest"]
+    # El ganador al terminar y el perdedor al descartarlo
+    assert len(streams.closed) == 2
+
+
+def test_stalled_stream_is_cut_after_the_chunk_timeout():
+    streams = _Streams([(0.0, "Hola, "), (1.0, "nunca llega")])
+
+    async def run():
+        stream = await _llm(streams).astream_within("hi", budget=1.0, hedge_after=0.5, chunk_timeout=0.05)
+        return await _collect(stream)
+
+    assert asyncio.run(run()) == ["Hola, "]
+    assert metrics.counter("asi1_stream_stalled") == 1
+
+
+def test_no_first_token_within_budget_is_none():
+    streams = _Streams([(1.0, "tarde")], [(1.0, "tarde")])
+    llm = _llm(streams)
+    assert asyncio.run(llm.astream_within("hi", budget=0.1, hedge_after=0.02)) is None
+    assert metrics.counter("asi1_deadline_expired") == 1
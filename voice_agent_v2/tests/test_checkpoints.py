@@ -0,0 +1,57 @@
+import asyncio
+from agents.checkpoints import CheckpointStore
+from agents.voice_agent import VoiceAgent
+from benchmarks.fake_session import FakeSession, FakeTTS
+from models.driver_model import DataField
+
+DIAL_INFO = {"phone_number": "+15551234567"}
+
+
+class _Agent(VoiceAgent):
+    def __init__(self, store: CheckpointStore):
+        super().__init__(dial_info=dict(DIAL_INFO))
+        self._fake_session = FakeSession(FakeTTS(ttfb=0))
+        self.checkpoints = store
+        self.prior_registration = None
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+
+def _halfway(store: CheckpointStore) -> _Agent:
+    agent = _Agent(store)
+    asyncio.run(agent.on_enter())
+    agent.data.name = "Jorge Octavio"
+    agent.data.tractor_number = "1555"
+    agent.fields_to_collect = agent.fields_to_collect[2:]
+    agent.current_field = DataField.TRACTOR_PLATES
+    return agent
+
+
+def test_hang_up_mid_call_resumes_in_the_next_job(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    asyncio.run(_halfway(store).save_checkpoint())
+
+    retry = _Agent(store)
+    asyncio.run(retry.on_enter())
+    assert retry.resumed
+    assert retry.current_field == DataField.TRACTOR_PLATES
+    assert retry.data.tractor_number == "1555"
+
+
+def test_failed_save_keeps_the_checkpoint(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    agent = _halfway(store)
+    asyncio.run(agent.save_checkpoint())
+
+    async def save_driver_data():
+        return False
+
+    async def hangup():
+        pass
+
+    agent.save_driver_data = save_driver_data
+    agent.hangup = hangup
+    asyncio.run(agent._finish_call())
+    assert store.load(CheckpointStore.key(DIAL_INFO)) is not None
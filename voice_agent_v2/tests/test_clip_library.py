@@ -0,0 +1,45 @@
+import asyncio
+from agents import clip_library as clips
+from agents.clip_library import CARRIER_PHRASES, SYMBOLS, PlateClipLibrary
+from benchmarks.fake_session import FakeTTS
+
+
+class FlakyTTS(FakeTTS):
+    """Falla la primera sintesis de cada texto en `flaky`."""
+
+    def __init__(self, flaky: set[str]):
+        super().__init__(ttfb=0)
+        self.flaky = set(flaky)
+        self.texts: list[str] = []
+
+    def synthesize(self, text: str):
+        self.texts.append(text)
+        if text in self.flaky:
+            self.flaky.discard(text)
+            raise RuntimeError("tts unavailable")
+        return super().synthesize(text)
+
+
+def test_failed_clips_are_retried_alone(monkeypatch):
+    monkeypatch.setattr(clips, "RETRY_BACKOFF_S", 0.0)
+    library = PlateClipLibrary()
+    tts = FlakyTTS({"B", "7"})
+    asyncio.run(library.ensure_built(tts))
+    assert library.ready
+    total = len(CARRIER_PHRASES) + len(SYMBOLS)
+    # Una ronda completa y despues solo las dos que fallaron
+    assert len(tts.texts) == total + 2
+    assert tts.texts[total:] in (["B", "7"], ["7", "B"])
+
+
+def test_next_job_builds_only_what_is_missing(monkeypatch):
+    monkeypatch.setattr(clips, "RETRY_BACKOFF_S", 0.0)
+    monkeypatch.setattr(clips, "BUILD_ATTEMPTS", 1)
+    library = PlateClipLibrary()
+    asyncio.run(library.ensure_built(FlakyTTS({"B"})))
+    assert not library.ready and not library.has("B") and library.has("A")
+
+    tts = FlakyTTS(set())
+    asyncio.run(library.ensure_built(tts))
+    assert library.ready
+    assert tts.texts == ["B"]
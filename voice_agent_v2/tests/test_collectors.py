@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from agents import utils
+from agents.en_prompts import EMAIL_REQUIRED_MESSAGE
+from agents.fields import FIELD_SPECS
+from agents.voice_agent import VoiceAgent
+from benchmarks.fake_session import FakeSession, FakeTTS
+from models.driver_model import DataField
+
+
+class _Agent(VoiceAgent):
+    """Agente sin ASI1: anota lo que dice en lugar de generarlo."""
+
+    def __init__(self, field: DataField):
+        super().__init__(dial_info={"phone_number": "+15551234567"})
+        self._fake_session = FakeSession(FakeTTS(ttfb=0))
+        self.checkpoints = None
+        self.current_field = field
+        self.said: list[str] = []
+
+        async def say(text, **kwargs):
+            self.said.append(text)
+
+        self._fake_session.say = say
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+    async def _say_template(self, template: str, **params):
+        self.said.append(template)
+
+
+def test_number_is_read_without_lead_words():
+    agent = _Agent(DataField.TRACTOR_NUMBER)
+    assert asyncio.run(agent._collect_number("it's fifteen fifty-five"))[0] == "1555"
+
+
+def test_number_after_its_cue_is_read():
+    agent = _Agent(DataField.TRACTOR_NUMBER)
+    assert asyncio.run(agent._collect_number("my tractor number is 1555"))[0] == "1555"
+
+
+def test_stalling_is_not_a_number():
+    for message in ("un momento", "hold on one sec"):
+        agent = _Agent(DataField.TRACTOR_NUMBER)
+        assert asyncio.run(agent._collect_number(message)) is None
+        assert agent.said == [FIELD_SPECS[DataField.TRACTOR_NUMBER].repeat]
+
+
+def test_eta_nobody_could_read_is_asked_again(monkeypatch):
+    async def extract_fields(utterance, missing):
+        return {}
+
+    monkeypatch.setattr(utils, "extract_fields", extract_fields)
+    agent = _Agent(DataField.ETA)
+    assert asyncio.run(agent._collect_eta("I have 2 trucks")) is None
+    assert agent.said == [FIELD_SPECS[DataField.ETA].repeat]
+
+
+def test_eta_keeps_the_parser_confidence():
+    agent = _Agent(DataField.ETA)
+    assert asyncio.run(agent._collect_eta("a las nueve de la noche")) == ("21:00", 1.0)
+
+
+def test_plate_said_whole_is_confirmed_whole():
+    agent = _Agent(DataField.TRACTOR_PLATES)
+    assert asyncio.run(agent._start_plate("jota ka ele cuatro tres dos uno")) == ("JKL-4321", 1.0)
+    assert not agent.in_letter_mode
+
+
+def test_unclear_plate_goes_letter_by_letter():
+    agent = _Agent(DataField.TRACTOR_PLATES)
+    agent._say_clips = _say_clips
+    assert asyncio.run(agent._start_plate("I think it starts with A")) is None
+    assert agent.in_letter_mode
+
+
+async def _say_clips(*keys, **kwargs):
+    pass
+
+
+@pytest.mark.parametrize("message", ["I don't have email", "no tengo correo", "no, I don't have one"])
+def test_no_email_is_not_dictated_as_one(message):
+    agent = _Agent(DataField.EMAIL)
+    assert asyncio.run(agent._collect_email(message)) is None
+    assert agent.said == [EMAIL_REQUIRED_MESSAGE]
+    assert agent.partial_email is None
+
+
+def test_dictated_email_is_read():
+    agent = _Agent(DataField.EMAIL)
+    assert asyncio.run(agent._collect_email("juan perez arroba gmail punto com"))[0] == "juanperez@gmail.com"
@@ -0,0 +1,26 @@
+import pytest
+from agents.confirmation_classifier import AFFIRM, CORRECTION, DENY, classify_confirmation
+
+
+@pytest.mark.parametrize("text", ["no problem", "No worries!", "no hay problema", "sin problema", "yes"])
+def test_agreeing_no_phrases_affirm(text):
+    assert classify_confirmation(text).label == AFFIRM
+
+
+def test_leading_no_still_denies():
+    assert classify_confirmation("no").label == DENY
+    reply = classify_confirmation("no, es 1556")
+    assert reply.label == CORRECTION
+    assert reply.remainder == "es 1556"
+
+
+@pytest.mark.parametrize("text", ["alright", "All right, go ahead"])
+def test_alright_affirms(text):
+    assert classify_confirmation(text).label == AFFIRM
+
+
+def test_yes_followed_by_another_value_is_a_correction():
+    reply = classify_confirmation("yes, it is 1556", corrects=lambda rest: rest == "it is 1556")
+    assert reply.label == CORRECTION
+    assert reply.remainder == "it is 1556"
+    assert classify_confirmation("yes, it is 1555", corrects=lambda rest: False).label == AFFIRM
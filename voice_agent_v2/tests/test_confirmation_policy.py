@@ -0,0 +1,52 @@
+import pytest
+from agents.confirmation_policy import ConfirmationPolicy
+from models.driver_model import DataField
+
+
+@pytest.fixture(autouse=True)
+def _no_env_thresholds(monkeypatch):
+    for field in DataField:
+        monkeypatch.delenv(f"CONFIRM_THRESHOLD_{field.name}", raising=False)
+
+
+def test_sure_valid_value_skips_the_confirmation():
+    assert ConfirmationPolicy().should_skip(DataField.ETA, True, 0.95, 1.0)
+
+
+@pytest.mark.parametrize("valid, stt, parse", [
+    (False, 0.95, 1.0),   # el validador no lo acepta
+    (True, 0.5, 1.0),     # STT dudoso
+    (True, 0.95, 0.7),    # parser dudoso
+    (True, None, 1.0),    # el STT no reporto confianza
+    (True, 0.0, 1.0),
+])
+def test_doubtful_value_is_confirmed(valid, stt, parse):
+    assert not ConfirmationPolicy().should_skip(DataField.ETA, valid, stt, parse)
+
+
+def test_fields_without_threshold_are_always_confirmed():
+    assert not ConfirmationPolicy().should_skip(DataField.NAME, True, 1.0, 1.0)
+    assert not ConfirmationPolicy().should_skip(DataField.EMAIL, True, 1.0, 1.0)
+
+
+def test_disabled_policy_confirms_everything():
+    assert not ConfirmationPolicy(enabled=False).should_skip(DataField.ETA, True, 1.0, 1.0)
+
+
+def test_summary_only_skips_every_valid_value():
+    policy = ConfirmationPolicy(summary_only=True)
+    assert policy.should_skip(DataField.NAME, True, None)
+    assert not policy.should_skip(DataField.NAME, False, 1.0)
+
+
+def test_thresholds_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("CONFIRM_THRESHOLD_ETA", "off")
+    monkeypatch.setenv("CONFIRM_THRESHOLD_NAME", "0.8")
+    policy = ConfirmationPolicy()
+    assert not policy.should_skip(DataField.ETA, True, 1.0, 1.0)
+    assert policy.should_skip(DataField.NAME, True, 0.9, 1.0)
+
+
+def test_explicit_thresholds_override_the_field_defaults():
+    policy = ConfirmationPolicy(thresholds={DataField.ETA: 0.99})
+    assert not policy.should_skip(DataField.ETA, True, 0.95, 1.0)
@@ -0,0 +1,80 @@
+import asyncio
+from agents.confirmation_classifier import classify_confirmation
+from agents.voice_agent import VoiceAgent
+from benchmarks.fake_session import FakeSession, FakeTTS
+from models.driver_model import DataField
+
+
+class _Agent(VoiceAgent):
+    def __init__(self):
+        super().__init__(dial_info={"phone_number": "+15551234567"})
+        self._fake_session = FakeSession(FakeTTS(ttfb=0))
+        self.checkpoints = None
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+
+def _confirming_tractor_number() -> _Agent:
+    agent = _Agent()
+    agent.current_field = DataField.TRACTOR_NUMBER
+    agent.data.tractor_number = agent.last_value = "1555"
+    agent.waiting_for_confirmation = True
+    return agent
+
+
+def _correct(agent: _Agent, message: str) -> bool:
+    return asyncio.run(agent._apply_correction(message, classify_confirmation(message).remainder))
+
+
+def test_valid_correction_is_applied():
+    agent = _confirming_tractor_number()
+    assert _correct(agent, "no, es 1556")
+    assert agent.data.tractor_number == "1556"
+
+
+def test_correction_failing_the_validator_asks_again():
+    agent = _confirming_tractor_number()
+    assert not _correct(agent, "no, es 1 2 3 4 5 6 7 8 9 1 2")
+    assert agent.data.tractor_number == "1555"
+
+
+def test_unclear_reply_to_the_summary_reads_it_again():
+    agent = _Agent()
+    agent.data.eta = "17:45"
+    agent.fields_to_collect = []
+    agent.implicitly_confirmed = [DataField.ETA]
+    agent.current_field = DataField.EMAIL
+    said = []
+
+    async def say(text, **kwargs):
+        said.append(text)
+
+    agent.session.say = say
+    asyncio.run(agent._ask_next())
+    asyncio.run(agent.handle_confirmation("what was that"))
+    assert agent.confirming_summary
+    assert said[-1] == said[0]
+
+
+def test_yes_with_a_different_number_corrects_it():
+    agent = _confirming_tractor_number()
+    agent.session.say = _ignore
+    asyncio.run(agent.handle_confirmation("yes, it is 1556"))
+    assert agent.data.tractor_number == "1556"
+    assert agent.waiting_for_confirmation
+
+
+def test_yes_repeating_the_same_number_confirms_it():
+    agent = _confirming_tractor_number()
+    agent.fields_to_collect = [DataField.TRACTOR_NUMBER]
+    agent.speculate_next_prompt = False
+    agent._finish_call = _ignore
+    asyncio.run(agent.handle_confirmation("yes, it is 1555"))
+    assert agent.data.tractor_number == "1555"
+    assert not agent.waiting_for_confirmation
+
+
+async def _ignore(*args, **kwargs):
+    pass
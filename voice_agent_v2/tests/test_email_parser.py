@@ -0,0 +1,26 @@
+import pytest
+from agents.email_parser import GLUED_WORD_PENALTY, parse_spoken_email
+
+
+@pytest.mark.parametrize("text", [
+    "it's juan at gmail dot com",
+    "sure juan at gmail dot com",
+    "um my email is juan at gmail dot com",
+    "este mi correo es juan arroba gmail punto com",
+    "okay so it is juan at gmail dot com",
+    "juan at gmail dot com please",
+])
+def test_lead_in_is_not_part_of_the_address(text):
+    email = parse_spoken_email(text)
+    assert email.address == "juan@gmail.com"
+    assert email.confidence == 1.0
+
+
+def test_spelled_address_is_kept():
+    assert parse_spoken_email("jota u a ene arroba gmail punto com").address == "juan@gmail.com"
+    assert parse_spoken_email("soulgamer punto negro arroba hotmail punto com").address == "soulgamer.negro@hotmail.com"
+
+
+def test_absorbed_words_lower_the_confidence():
+    email = parse_spoken_email("hmm let me see juan at gmail dot com")
+    assert email.confidence <= GLUED_WORD_PENALTY
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+from agents.intents import IntentMatcher
+
+matcher = IntentMatcher({
+    "repeat": {"repite", "otra vez", "qué dijiste"},
+    "yes": {"si"},
+    "plates": {"placas", "placas del tractor"},
+})
+
+
+def test_only_whole_words_match():
+    assert matcher.intents("así es") == set()
+    assert matcher.intents("si, claro") == {"yes"}
+
+
+def test_accents_case_and_punctuation_are_folded():
+    assert matcher.intents("¿Qué DIJISTE?") == {"repeat"}
+    assert matcher.intents("que... dijiste") == {"repeat"}
+
+
+def test_positions_are_in_the_original_text():
+    text = "Ok, ¿qué dijiste?"
+    [m] = matcher.match(text)
+    assert (m.intent, m.phrase) == ("repeat", "qué dijiste")
+    assert text[m.start:m.end] == "qué dijiste"
+
+
+def test_overlapping_phrases_are_all_reported():
+    found = {(m.phrase, m.start) for m in matcher.match("las placas del tractor")}
+    assert found == {("placas", 4), ("placas del tractor", 4)}
+
+
+def test_several_intents_in_one_pass():
+    assert matcher.intents("si, pero repite otra vez") == {"yes", "repeat"}
+
+
+def test_from_config_takes_every_phrase_set():
+    config = SimpleNamespace(
+        REPEAT_REQUESTS={"repite"}, WAKE_WORDS={"hola"}, NUM_FIELDS=7, FIELD_ORDER=["nombre"], lower={"x"},
+    )
+    assert IntentMatcher.from_config(config).intents("hola, repite") == {"repeat_requests", "wake_words"}
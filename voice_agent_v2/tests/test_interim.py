@@ -0,0 +1,105 @@
+import asyncio
+import time
+import pytest
+from agents import interim, metrics
+from agents.confirmation_classifier import AFFIRM
+from agents.interim import CONFIRM, EarlyCommit, agrees, short_answer
+from agents.voice_agent import VoiceAgent
+from benchmarks.fake_session import FakeSession, FakeTTS
+from models.driver_model import DataField
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.parametrize("text, expect, answer", [
+    ("yes", CONFIRM, AFFIRM),
+    ("no", CONFIRM, None),           # casi siempre sigue la correccion
+    ("si pero", CONFIRM, None),
+    ("bee", "letter", "B"),
+    ("cuatro", "digit", "4"),
+    ("okay", "letter", None),        # lectura debil: se espera la final
+])
+def test_short_answer_only_when_unambiguous(text, expect, answer):
+    assert short_answer(text, expect) == answer
+
+
+def test_final_agrees_with_the_interim():
+    commit = EarlyCommit(expect="letter", answer="B", text="bee", snapshot={})
+    assert agrees(commit, "Bee.")
+    assert not agrees(commit, "dee")
+    assert agrees(EarlyCommit(expect=CONFIRM, answer=AFFIRM, text="yes", snapshot={}), "yes, correct")
+
+
+def test_commit_expires(monkeypatch):
+    commit = EarlyCommit(expect=CONFIRM, answer=AFFIRM, text="yes", snapshot={})
+    assert not commit.expired
+    monkeypatch.setattr(interim, "MAX_PENDING_S", 0.0)
+    time.sleep(0.001)
+    assert commit.expired
+
+
+class _Agent(VoiceAgent):
+    """Primer caracter de la placa del tractor, uno por uno."""
+
+    def __init__(self):
+        super().__init__(dial_info={"phone_number": "+15551234567"})
+        self._fake_session = FakeSession(FakeTTS(ttfb=0))
+        self.checkpoints = None
+        self.interim_fast_path = True
+        self.current_field = self.current_plate_type = DataField.TRACTOR_PLATES
+        self.in_letter_mode = self.single_char_mode = True
+        self.said: list[str] = []
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+    async def _say_clips(self, *keys, text=None):
+        self.said.append(text or keys[0])
+
+
+def _speak(agent: _Agent, interim_text: str, final_text: str):
+    async def run():
+        agent.on_interim_transcript(interim_text, confidence=0.9)
+        await asyncio.sleep(0)
+        await agent.on_final_transcript(final_text, confidence=0.9)
+
+    asyncio.run(run())
+
+
+def test_agreeing_final_is_not_processed_again():
+    agent = _Agent()
+    _speak(agent, "bee", "bee")
+    assert agent.last_value == "B"
+    assert agent.waiting_for_confirmation
+    assert agent.user_turns == 1
+    assert agent.said == ["Is the letter B?"]
+    assert metrics.counter("interim_commits") == 1
+
+
+def test_disagreeing_final_rolls_back_and_is_processed():
+    agent = _Agent()
+    _speak(agent, "bee", "dee")
+    assert agent.last_value == "D"
+    assert agent.user_turns == 1
+    assert agent.said[-1] == "Is the letter D?"
+    assert metrics.counter("interim_rollbacks") == 1
+
+
+def test_orphaned_commit_is_dropped_by_the_next_interim(monkeypatch):
+    agent = _Agent()
+    monkeypatch.setattr(interim, "MAX_PENDING_S", 0.0)
+
+    async def run():
+        agent.on_interim_transcript("bee", confidence=0.9)
+        await agent._early_commit.task
+        time.sleep(0.001)
+        agent.on_interim_transcript("yes", confidence=0.9)
+
+    asyncio.run(run())
+    assert metrics.counter("interim_orphaned") == 1
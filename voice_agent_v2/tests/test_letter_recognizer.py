@@ -0,0 +1,38 @@
+import pytest
+from agents.letter_recognizer import letter_recognizer
+from agents.utils import normalize_letter_pronunciations
+
+
+@pytest.mark.parametrize("text, letter", [
+    ("the letter is m", "M"),
+    ("the next letter is b", "B"),
+    ("next one is jota", "J"),
+    ("la letra es ele", "L"),
+    ("el", "L"),
+    ("letter el", "L"),
+    ("es", "S"),
+    ("ar", "R"),
+    ("Es de Francia.", "F"),
+])
+def test_letter_around_stop_words(text, letter):
+    assert letter_recognizer.recognize(text, limit=1)[0].letter == letter
+
+
+def test_spelled_sequence_skips_stop_words():
+    assert letter_recognizer.recognize_sequence("the letter is m").chars == "M"
+    assert letter_recognizer.recognize_sequence("jota ka ele").chars == "JKL"
+
+
+@pytest.mark.parametrize("text, letter", [
+    ("I said B", "B"),
+    ("I mean D", "D"),
+    ("okay, B", "B"),
+    ("I said I", "I"),
+    ("I", "I"),
+])
+def test_filler_words_before_the_letter_are_skipped(text, letter):
+    assert normalize_letter_pronunciations(text, expect="letter") == letter
+
+
+def test_weak_reading_is_asked_again():
+    assert normalize_letter_pronunciations("okay", expect="letter") == ""
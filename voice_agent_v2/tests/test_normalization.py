@@ -0,0 +1,61 @@
+from datetime import datetime
+import pytest
+from agents.fields import FIELD_SPECS
+from agents.normalization import SpokenEta, parse_eta, parse_spoken_eta
+from models.driver_model import DataField
+
+NOW = datetime(2026, 10, 18, 10, 0)
+
+
+@pytest.mark.parametrize("text, eta", [
+    ("1 hour", "11:00"),
+    ("2 hours", "12:00"),
+    ("dos horas", "12:00"),
+    ("an hour", "11:00"),
+    ("1 hour and a half", "11:30"),
+    ("una hora y media", "11:30"),
+    ("45 minutes", "10:45"),
+    ("in 2 hours", "12:00"),
+])
+def test_bare_amount_of_hours_is_a_duration(text, eta):
+    assert parse_eta(text, NOW) == eta
+
+
+@pytest.mark.parametrize("text, eta", [
+    ("a las diecisiete horas", "17:00"),
+    ("at 1", "13:00"),
+    ("17:45", "17:45"),
+])
+def test_clock_times_are_not_durations(text, eta):
+    assert parse_eta(text, NOW) == eta
+
+
+@pytest.mark.parametrize("text", ["the tractor is 1555", "I have 2 trucks", "trailer 88 and 2 pallets"])
+def test_numbers_without_a_clock_cue_are_not_a_time(text):
+    assert parse_eta(text, NOW) is None
+
+
+def test_tomorrow_is_not_moved_to_the_afternoon():
+    assert parse_eta("mañana a las 8", NOW) == "08:00"
+    assert parse_spoken_eta("mañana a las 8", NOW).confidence < FIELD_SPECS[DataField.ETA].confirm_threshold
+
+
+@pytest.mark.parametrize("text, eta", [
+    ("a las tres de la tarde", "15:00"),
+    ("at 9 pm", "21:00"),
+    ("a las once y media", "11:30"),
+    ("17:45", "17:45"),
+])
+def test_cued_clock_times_are_sure(text, eta):
+    assert parse_spoken_eta(text, NOW) == SpokenEta(eta, 1.0)
+
+
+@pytest.mark.parametrize("text, eta", [
+    ("nine fifteen", "21:15"),
+    ("its 1600", "16:00"),
+    ("a las tres", "15:00"),
+])
+def test_bare_or_guessed_times_are_confirmed(text, eta):
+    spoken = parse_spoken_eta(text, NOW)
+    assert spoken.eta == eta
+    assert spoken.confidence < FIELD_SPECS[DataField.ETA].confirm_threshold
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from livekit.agents import StopResponse, llm
+from agents.voice_agent import VoiceAgent
+from benchmarks.fake_session import FakeSession, FakeTTS
+from models.driver_model import DataField
+
+
+class _Agent(VoiceAgent):
+    def __init__(self, field: DataField):
+        super().__init__(dial_info={"phone_number": "+15551234567"})
+        self._fake_session = FakeSession(FakeTTS(ttfb=0))
+        self.checkpoints = None
+        self.current_field = field
+        self.fields_to_collect = [field]
+        self.answered: list[str] = []
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+    async def on_final_transcript(self, message: str, confidence: float | None = None):
+        self.answered.append(message)
+
+
+def _turn(agent: _Agent, text: str) -> bool:
+    """True si el turno lo contesto el flujo de campos, False si se le dejo al LLM."""
+    message = llm.ChatMessage(role="user", content=[text])
+    try:
+        asyncio.run(agent.on_user_turn_completed(llm.ChatContext(), message))
+    except StopResponse:
+        return True
+    return False
+
+
+@pytest.mark.parametrize("text", ["call me back later", "no me interesa", "I have a complaint about the last load"])
+def test_off_script_turns_go_to_the_llm(text):
+    agent = _Agent(DataField.ETA)
+    assert not _turn(agent, text)
+    assert agent.answered == []
+
+
+@pytest.mark.parametrize("field, text", [
+    (DataField.NAME, "Adiós Goodbye Reyes"),
+    (DataField.EMAIL, "queja punto reschedule arroba gmail punto com"),
+])
+def test_single_trigger_words_inside_an_answer_are_answers(field, text):
+    agent = _Agent(field)
+    assert _turn(agent, text)
+    assert agent.answered == [text]
+
+
+def test_answer_that_also_asks_for_a_call_back_is_an_answer():
+    agent = _Agent(DataField.ETA)
+    assert _turn(agent, "I'll be there at 5 pm, call me back if I'm late")
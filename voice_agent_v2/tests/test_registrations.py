@@ -0,0 +1,107 @@
+import asyncio
+import json
+import pytest
+from livekit.agents import ToolError, function_tool
+from agents import voice_agent
+from agents.registrations import RegistrationIndex
+from agents.voice_agent import VoiceAgent
+from benchmarks.fake_session import FakeSession, FakeTTS
+from models.driver_model import DataField, DriverData
+from services import records
+
+PHONE = "+15551234567"
+
+
+class RecordsMCPServer:
+    """MCP con la herramienta save_driver_data escribiendo como services/server.py (services/records.py)."""
+
+    def __init__(self, fail: bool = False):
+        self.initialized = True
+
+        async def save_driver_data(raw_arguments: dict) -> str:
+            if fail:
+                raise ToolError("disk full")
+            records.write_driver_record(raw_arguments["data"])
+            return "Datos guardados exitosamente."
+
+        self.tools = [function_tool(save_driver_data, raw_schema={
+            "name": "save_driver_data", "description": "", "parameters": {"type": "object", "properties": {}},
+        })]
+
+    async def list_tools(self) -> list:
+        return self.tools
+
+
+class _Agent(VoiceAgent):
+    def __init__(self, session: FakeSession, dial_info: dict):
+        super().__init__(dial_info=dial_info)
+        self._fake_session = session
+        self.checkpoints = None
+
+    @property
+    def session(self) -> FakeSession:
+        return self._fake_session
+
+
+@pytest.fixture
+def records_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(records, "RECORDS_DIR", str(tmp_path))
+    monkeypatch.setattr("agents.voice_agent.registration_index", RegistrationIndex(str(tmp_path)))
+    return tmp_path
+
+
+def _agent(fail: bool = False) -> _Agent:
+    session = FakeSession(FakeTTS(ttfb=0))
+    session.mcp_server = RecordsMCPServer(fail=fail)
+    return _Agent(session, dial_info={"phone_number": PHONE})
+
+
+def _registered(agent: VoiceAgent):
+    agent.data = DriverData(
+        name="Jorge Octavio", tractor_number="1555", tractor_plates="JKL-4321", trailer_number="43",
+        trailer_plates="XAZ-1425", eta="17:45", email="driver@gmail.com",
+    )
+
+
+def test_saved_registration_prefills_the_next_call(records_dir, monkeypatch):
+    agent = _agent()
+    _registered(agent)
+    assert asyncio.run(agent.save_driver_data())
+
+    saved = list(records_dir.glob("driver_data_*.json"))
+    assert len(saved) == 1
+    assert json.loads(saved[0].read_text())["phone_number"] == PHONE
+
+    # Otro proceso del worker: solo ve el archivo
+    index = RegistrationIndex(str(records_dir))
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+    assert index.lookup(PHONE).values["tractor_plates"] == "JKL-4321"
+
+    monkeypatch.setattr(voice_agent, "registration_index", index)
+    next_call = _agent()
+    asyncio.run(next_call.on_enter())
+    assert next_call.confirming_prior
+    assert next_call.data.tractor_number == "1555"
+    # La ETA es de cada viaje
+    assert next_call.fields_to_collect == [DataField.ETA]
+
+
+def test_failed_save_is_not_indexed(records_dir):
+    agent = _agent(fail=True)
+    _registered(agent)
+    assert not asyncio.run(agent.save_driver_data())
+    assert not list(records_dir.glob("driver_data_*.json"))
+    assert voice_agent.registration_index.lookup(PHONE) is None
+
+
+def test_server_tool_writes_an_indexable_record(records_dir, monkeypatch):
+    server = pytest.importorskip("services.server", exc_type=ImportError)
+    monkeypatch.setattr(server, "send_email", lambda *args: None)
+    server.save_driver_data(server.DriverDataInput(
+        name="Jorge Octavio", tractor_number="1555", tractor_plates="JKL-4321", trailer_number="43",
+        trailer_plates="XAZ-1425", eta="17:45", email="driver@gmail.com", phone_number=PHONE,
+    ))
+    index = RegistrationIndex(str(records_dir))
+    index.refresh()
+    assert index.lookup(PHONE).values["email"] == "driver@gmail.com"
@@ -0,0 +1,96 @@
+import asyncio
+import time
+import pytest
+from agents import metrics
+from agents.response_cache import TemplateResponseCache
+
+
+def _key(name: str) -> tuple:
+    return TemplateResponseCache.key("Ask for {field_name}", {"field_name": name}, 0.3, "asi1-fast")
+
+
+KEY = _key("ETA")
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_key_ignores_parameter_order():
+    assert TemplateResponseCache.key("t", {"a": 1, "b": 2}, 0.3, "m") == TemplateResponseCache.key(
+        "t", {"b": 2, "a": 1}, 0.3, "m")
+    assert TemplateResponseCache.key("t", {}, 0.3, "m") != TemplateResponseCache.key("t", {}, 0.7, "m")
+
+
+def test_miss_then_hit():
+    cache = TemplateResponseCache()
+    assert cache.lookup(KEY) is None
+    cache.store(KEY, "What's your ETA?")
+    assert cache.lookup(KEY) == "What's your ETA?"
+    assert metrics.counter("response_cache_misses") == 1
+    assert metrics.counter("response_cache_hits") == 1
+
+
+def test_expired_entry_is_a_miss():
+    cache = TemplateResponseCache(ttl=0.01)
+    cache.store(KEY, "What's your ETA?")
+    time.sleep(0.02)
+    assert cache.peek(KEY) is None
+    assert cache.lookup(KEY) is None
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = TemplateResponseCache(max_entries=2)
+    cache.store(_key("a"), "A")
+    cache.store(_key("b"), "B")
+    assert cache.lookup(_key("a")) == "A"
+    cache.store(_key("c"), "C")
+    assert cache.peek(_key("b")) is None
+    assert cache.peek(_key("a")) == "A"
+    assert cache.peek(_key("c")) == "C"
+
+
+def test_variant_pool_is_capped_and_deduplicated():
+    cache = TemplateResponseCache(variants=2)
+    for text in ("one", "one", "two", "three"):
+        cache.store(KEY, text)
+    assert {cache.peek(KEY) for _ in range(50)} == {"one", "two"}
+
+
+def test_refill_adds_one_variant_in_the_background():
+    cache = TemplateResponseCache(variants=2)
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "another"
+
+    async def run():
+        cache.store(KEY, "first")
+        cache.refill(KEY, generate)
+        # Ya hay un relleno en curso para la llave: no se lanza otro
+        cache.refill(KEY, generate)
+        await asyncio.gather(*cache._tasks)
+        # El pool ya esta lleno
+        cache.refill(KEY, generate)
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert {cache.peek(KEY) for _ in range(50)} == {"first", "another"}
+
+
+def test_refill_needs_an_entry():
+    cache = TemplateResponseCache()
+
+    async def generate():
+        raise AssertionError("no deberia generarse")
+
+    async def run():
+        cache.refill(KEY, generate)
+        assert not cache._tasks
+
+    asyncio.run(run())
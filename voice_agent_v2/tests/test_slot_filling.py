@@ -0,0 +1,46 @@
+import asyncio
+from agents.extraction import ExtractedValue
+from agents.slot_filling import FREE_TEXT_CONFIDENCE, fill_slots, unread_slots
+from agents.voice_agent import VoiceAgent
+from models.driver_model import DataField
+
+
+def test_name_cue_is_not_part_of_the_name():
+    slots = fill_slots("name is John Smith and tractor 1555", list(DataField), DataField.NAME)
+    assert slots[DataField.NAME].value == "John Smith"
+    assert slots[DataField.NAME].confidence == FREE_TEXT_CONFIDENCE
+    assert slots[DataField.TRACTOR_NUMBER].value == "1555"
+
+
+def test_collected_name_drops_the_cue():
+    agent = VoiceAgent(dial_info={"phone_number": "+15551234567"})
+    agent.current_field = DataField.NAME
+    assert asyncio.run(agent._collect_text("my name is John Smith")) == ("John Smith", FREE_TEXT_CONFIDENCE)
+    assert asyncio.run(agent._collect_text("John Smith")) == ("John Smith", FREE_TEXT_CONFIDENCE)
+
+
+def test_named_field_the_local_extractor_missed_is_unread():
+    message = "tractor 1555, and I am arriving right after lunch"
+    slots = fill_slots(message, list(DataField), DataField.TRACTOR_NUMBER)
+    assert unread_slots(message, list(DataField), slots, DataField.TRACTOR_NUMBER) == [DataField.ETA]
+
+
+def test_generic_plates_count_as_read():
+    message = "tractor 1555 plates JKL 4321"
+    slots = fill_slots(message, list(DataField), DataField.TRACTOR_NUMBER)
+    assert unread_slots(message, list(DataField), slots, DataField.TRACTOR_NUMBER) == []
+
+
+def test_unread_fields_go_to_asi1_in_one_request(monkeypatch):
+    requested = []
+
+    async def extract_fields(utterance, missing):
+        requested.append(list(missing))
+        return {DataField.ETA: ExtractedValue("13:30", 0.9), DataField.TRACTOR_NUMBER: ExtractedValue("1555", 0.95)}
+
+    monkeypatch.setattr("agents.voice_agent.extract_fields", extract_fields)
+    agent = VoiceAgent(dial_info={"phone_number": "+15551234567"})
+    agent.current_field = DataField.TRACTOR_NUMBER
+    slots = asyncio.run(agent._extract_slots("tractor 1555, and I am arriving right after lunch", [DataField.ETA]))
+    assert requested == [[DataField.ETA]]
+    assert slots[DataField.ETA].value == "13:30"
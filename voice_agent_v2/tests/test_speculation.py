@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from agents import metrics
+from agents.speculation import SpeculativePrompt
+from benchmarks.fake_session import FakeTTS
+
+KEY = ("Ask for {field_name}", (("field_name", "ETA"),), 0.3, "asi1-fast")
+OTHER = ("Ask for {field_name}", (("field_name", "correo"),), 0.3, "asi1-fast")
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _generate(text: str | None, delay: float = 0.0):
+    async def generate():
+        await asyncio.sleep(delay)
+        return text
+
+    return generate
+
+
+def test_prompt_is_taken_with_its_audio():
+    async def run():
+        speculation = SpeculativePrompt()
+        speculation.start(KEY, _generate("What's your ETA?"), FakeTTS(ttfb=0))
+        return await speculation.take(KEY)
+
+    result = asyncio.run(run())
+    assert result.text == "What's your ETA?"
+    assert len(result.frames) == 1
+    assert metrics.counter("speculation_used") == 1
+
+
+def test_unfinished_prompt_is_awaited():
+    async def run():
+        speculation = SpeculativePrompt(synthesize_audio=False)
+        speculation.start(KEY, _generate("What's your ETA?", delay=0.05))
+        return await speculation.take(KEY)
+
+    result = asyncio.run(run())
+    assert result.text == "What's your ETA?"
+    assert result.frames == []
+
+
+def test_other_key_gets_nothing():
+    async def run():
+        speculation = SpeculativePrompt(synthesize_audio=False)
+        speculation.start(KEY, _generate("What's your ETA?"))
+        return await speculation.take(OTHER), await speculation.take(KEY)
+
+    other, same = asyncio.run(run())
+    assert other is None
+    assert same is not None
+
+
+def test_prompt_is_taken_once():
+    async def run():
+        speculation = SpeculativePrompt(synthesize_audio=False)
+        speculation.start(KEY, _generate("What's your ETA?"))
+        await speculation.take(KEY)
+        return await speculation.take(KEY)
+
+    assert asyncio.run(run()) is None
+
+
+def test_discard_cancels_the_work():
+    async def run():
+        speculation = SpeculativePrompt(synthesize_audio=False)
+        speculation.start(KEY, _generate("What's your ETA?", delay=1.0))
+        task = speculation._task
+        speculation.discard()
+        await asyncio.sleep(0)
+        return task, await speculation.take(KEY)
+
+    task, taken = asyncio.run(run())
+    assert task.cancelled()
+    assert taken is None
+    assert metrics.counter("speculation_discarded") == 1
+
+
+def test_same_key_is_not_started_twice():
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return "What's your ETA?"
+
+    async def run():
+        speculation = SpeculativePrompt(synthesize_audio=False)
+        speculation.start(KEY, generate)
+        speculation.start(KEY, generate)
+        return await speculation.take(KEY)
+
+    assert asyncio.run(run()).text == "What's your ETA?"
+    assert len(calls) == 1
+    assert metrics.counter("speculation_started") == 1
+
+
+def test_failed_generation_is_none():
+    async def run():
+        speculation = SpeculativePrompt(synthesize_audio=False)
+        speculation.start(KEY, _generate(None))
+        return await speculation.take(KEY)
+
+    assert asyncio.run(run()) is None
+    assert metrics.counter("speculation_failed") == 1
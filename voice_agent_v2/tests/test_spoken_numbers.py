@@ -0,0 +1,29 @@
+import pytest
+from agents.spoken_numbers import DANGLING_PENALTY, SpokenNumber, parse_spoken_number
+
+
+@pytest.mark.parametrize("text, digits", [
+    ("a hundred and twenty", "120"),
+    ("one hundred and twenty", "120"),
+    ("un hundred", "100"),
+    ("cien hundred", "100"),
+    ("a thousand five hundred", "1500"),
+    ("two hundred thousand", "200000"),
+    ("fifteen hundred", "1500"),
+    ("mil quinientos cincuenta y cinco", "1555"),
+])
+def test_multipliers_with_a_unit(text, digits):
+    assert parse_spoken_number(text) == SpokenNumber(digits, 1.0)
+
+
+@pytest.mark.parametrize("text, digits", [("hundred", "100"), ("thousand", "1000")])
+def test_bare_multiplier_is_doubtful(text, digits):
+    number = parse_spoken_number(text)
+    assert number.digits == digits
+    assert number.confidence == DANGLING_PENALTY
+
+
+def test_multiplier_after_multiplier_is_not_dropped():
+    number = parse_spoken_number("two thousand hundred")
+    assert number.digits == "2000100"
+    assert number.confidence < 1.0
@@ -0,0 +1,37 @@
+import asyncio
+from agents.streaming import MIN_CLAUSE_CHARS, clause_chunks
+
+
+async def _deltas(*parts):
+    for part in parts:
+        yield part
+
+
+def _chunks(*parts) -> list[str]:
+    async def run():
+        return [chunk async for chunk in clause_chunks(_deltas(*parts))]
+
+    return asyncio.run(run())
+
+
+def test_sentences_are_cut_as_they_end():
+    assert _chunks("Hola. ", "¿Cual es tu ", "nombre? Gracias") == ["Hola. ", "¿Cual es tu nombre? ", "Gracias"]
+
+
+def test_short_clause_waits_for_more_text():
+    assert _chunks("Okay, ", "what is your tractor number?") == ["Okay, what is your tractor number?"]
+
+
+def test_long_clause_is_cut_at_the_comma():
+    clause = "Thanks for confirming the plates"
+    assert len(clause) >= MIN_CLAUSE_CHARS
+    assert _chunks(clause + ", ", "now the trailer") == [clause + ", ", "now the trailer"]
+
+
+def test_boundary_split_across_deltas():
+    assert _chunks("Listo", ".", " Sigue", " la ETA.") == ["Listo. ", "Sigue la ETA."]
+
+
+def test_empty_stream_yields_nothing():
+    assert _chunks() == []
+    assert _chunks("  ") == []